@@ -1,11 +1,13 @@
 import os
-import json
+import uuid
 import streamlit as st
-from PIL import Image
-import pandas as pd
 from datetime import datetime
 
-from llm import llm_therapeutic_reply
+# Τα pandas / PIL γίνονται import μέσα στις σελίδες που τα χρειάζονται
+import resources
+from llm import build_messages, count_tokens, latency_plan, llm_metrics, session_usage, stream_timings
+from conversation_context import ConversationContext
+from hedging import outcome_summary, pop_late_replies, start_hedged_reply, turn_outcomes
 from rules import (
     personal_reply,
     fallback_therapeutic_reply,
@@ -14,19 +16,18 @@ from rules import (
     emergency_message,
 )
 from emotional_map import render_emotional_map
+from keyword_matcher import match_concepts
 from components import (
     render_message,
+    render_message_stream,
     render_exercise_card,
     render_emergency_block,
     render_action_plan_card,
 )
 from data_logger import log_user_data
+from storage import DOC_WELLNESS_HISTORY, get_storage
 
-# Paths για αρχεία
 BASE_DIR = os.path.dirname(__file__)
-SUPPORT_PHRASES_CSV = os.path.join(BASE_DIR, "..", "support_phrases.csv")
-EXERCISES_CSV = os.path.join(BASE_DIR, "..", "exercises_log.csv")
-USER_HISTORY_JSON = os.path.join(BASE_DIR, "..", "user_history.json")
 
 
 # ============================================================
@@ -43,19 +44,15 @@ def load_css():
 #          ΜΙΚΡΕΣ HELPER ΣΥΝΑΡΤΗΣΕΙΣ ΓΙΑ ACTION PLAN
 # ============================================================
 
-def detect_study_anxiety(text: str) -> bool:
+def detect_study_anxiety(text: str, concepts: frozenset[str] | None = None) -> bool:
     """
     Επιστρέφει True αν στο κείμενο συνυπάρχουν
     (α) άγχος και (β) σπουδές/εξετάσεις.
     """
-    t = text.lower()
-    anxiety_words = ["άγχ", "αγχος", "στρες", "στρες"]
-    study_words = [
-        "σπουδ", "σχολή", "σχολη", "πανεπιστ", "πανεπηστ", "εξετάσ", "εξετασ",
-        "εργασία", "εργασια", "εργασι", "μάθημα", "μαθημα", "διάβασμα", "διαβασμα"
-    ]
-    has_anxiety = any(w in t for w in anxiety_words)
-    has_study = any(w in t for w in study_words)
+    if concepts is None:
+        concepts = match_concepts(text)
+    has_anxiety = "anxiety" in concepts or "stress" in concepts
+    has_study = "study" in concepts
     return has_anxiety and has_study
 
 
@@ -81,22 +78,20 @@ def build_study_action_plan() -> str:
     )
 
 
-def detect_sleep_difficulty(sleep: str, text: str) -> bool:
+def detect_sleep_difficulty(
+    sleep: str, text: str, concepts: frozenset[str] | None = None
+) -> bool:
     """
     Επιστρέφει True αν:
     - ο χρήστης δηλώνει πολύ λίγο ύπνο (0–2 ή 3–5)
     ΚΑΙ/Ή
     - στο κείμενο αναφέρονται ξεκάθαρα δυσκολίες με τον ύπνο.
     """
-    t = text.lower()
+    if concepts is None:
+        concepts = match_concepts(text)
     bad_sleep_categories = ["0–2", "3–5"]
-    sleep_words = [
-        "ύπν", "υπν", "ξενύχτ", "ξενυχτ", "αϋπν", "αυπν",
-        "δεν κοιμήθηκα", "δεν κοιμηθηκα",
-        "δυσκολεύομαι να κοιμηθώ", "δυσκολευομαι να κοιμηθω",
-    ]
     bad_category = sleep in bad_sleep_categories
-    mentions_sleep = any(w in t for w in sleep_words)
+    mentions_sleep = "sleep" in concepts
     return bad_category or mentions_sleep
 
 
@@ -127,61 +122,30 @@ def build_sleep_action_plan() -> str:
 
 def save_support_phrase(text: str, source: str = "bot") -> None:
     """
-    Αποθηκεύει μία φράση στήριξης σε CSV (support_phrases.csv).
+    Αποθηκεύει μία φράση στήριξης (πίνακας support_phrases).
     """
-    row = {
-        "timestamp": datetime.now().isoformat(timespec="seconds"),
-        "source": source,
-        "text": str(text).replace("\n", " ").strip(),
-    }
-
-    if os.path.exists(SUPPORT_PHRASES_CSV):
-        df = pd.read_csv(SUPPORT_PHRASES_CSV)
-        df = pd.concat([df, pd.DataFrame([row])], ignore_index=True)
-    else:
-        df = pd.DataFrame([row])
-
-    df.to_csv(SUPPORT_PHRASES_CSV, index=False)
+    get_storage().add_support_phrase(str(text).replace("\n", " ").strip(), source=source)
 
 
 def save_exercise_completion(ex_id: str, label: str) -> None:
     """
-    Καταγράφει μια ολοκληρωμένη άσκηση σε exercises_log.csv.
+    Καταγράφει μια ολοκληρωμένη άσκηση (πίνακας exercises).
     """
-    row = {
-        "timestamp": datetime.now().isoformat(timespec="seconds"),
-        "exercise_id": ex_id,
-        "label": label,
-    }
-
-    if os.path.exists(EXERCISES_CSV):
-        df = pd.read_csv(EXERCISES_CSV)
-        df = pd.concat([df, pd.DataFrame([row])], ignore_index=True)
-    else:
-        df = pd.DataFrame([row])
-
-    df.to_csv(EXERCISES_CSV, index=False)
+    get_storage().add_exercise(ex_id, label)
 
 
 def load_wellness_history() -> dict:
     """
-    Φορτώνει το ιστορικό ευεξίας από JSON, αν υπάρχει.
+    Φορτώνει το ιστορικό ευεξίας, αν υπάρχει.
     """
-    if os.path.exists(USER_HISTORY_JSON):
-        try:
-            with open(USER_HISTORY_JSON, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            return {}
-    return {}
+    return get_storage().get_document(DOC_WELLNESS_HISTORY) or {}
 
 
 def save_wellness_history(data: dict) -> None:
     """
-    Αποθηκεύει το ιστορικό ευεξίας σε JSON.
+    Αποθηκεύει το ιστορικό ευεξίας.
     """
-    with open(USER_HISTORY_JSON, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    get_storage().put_document(DOC_WELLNESS_HISTORY, data)
 
 
 # ============================================================
@@ -196,7 +160,17 @@ st.set_page_config(
 
 load_css()
 
+# Προθέρμανση των πόρων του Chat στο παρασκήνιο (μία φορά ανά διεργασία)
+resources.warm_up("lexicon", "openai_client", "llm_cache", "semantic_cache", "llm_rate_limiter", "storage")
+
 # Session state
+if "session_id" not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+
+if "conversation" not in st.session_state:
+    # Φραγμένο context για το LLM: πρόσφατοι γύροι + σύνοψη των παλαιότερων
+    st.session_state.conversation = ConversationContext()
+
 if "messages" not in st.session_state:
     # κάθε στοιχείο: (sender, content) όπου sender ∈ {"user","bot","exercise","map","emergency","plan"}
     st.session_state.messages = []
@@ -224,14 +198,17 @@ if "sleep_plan_given" not in st.session_state:
 # ============================================================
 
 def load_avatar(name: str):
+    from PIL import Image
+
     path = os.path.join(BASE_DIR, "static", "avatars", f"{name}.png")
     if os.path.exists(path):
         return Image.open(path)
     return None
 
 
-avatar_user = load_avatar("user")
-avatar_bot = load_avatar("bot")
+# Φορτώνονται μόνο όταν ζητηθούν: resources.get("avatar_bot")
+resources.register("avatar_user", lambda: load_avatar("user"))
+resources.register("avatar_bot", lambda: load_avatar("bot"))
 
 
 # ============================================================
@@ -256,6 +233,7 @@ with st.sidebar:
             "👤 Προφίλ",
             "ℹ️ Σχετικά & Ασφάλεια",
         ],
+        key="page",
     )
 
 
@@ -323,6 +301,9 @@ if page == "💬 Chat":
         if not text:
             st.warning("Γράψε κάτι μικρό πριν πατήσεις αποστολή 🙂")
         else:
+            # Μία σάρωση του μηνύματος για όλους τους κανόνες
+            concepts = match_concepts(text)
+
             # 1. Έλεγχος για επείγουσα κατάσταση
             if is_emergency(text):
                 emergency_html = emergency_message()
@@ -330,6 +311,22 @@ if page == "💬 Chat":
                 log_user_data("EMERGENCY", "-", "-", text)
                 st.rerun()
 
+            # Το αίτημα στο LLM ξεκινά αμέσως στο παρασκήνιο, με latency budget
+            conversation = st.session_state.conversation
+            history = conversation.messages()
+            conversation.record_sent(
+                count_tokens(build_messages(mood_value, sleep, water, text, profile, history))
+            )
+            hedge = start_hedged_reply(
+                st.session_state.session_id,
+                mood_value,
+                sleep,
+                water,
+                text,
+                profile,   # <-- περνάμε και το προφίλ εδώ
+                context=history,
+            )
+
             # 2. Μήνυμα χρήστη
             st.session_state.messages.append(("user", text))
 
@@ -338,31 +335,38 @@ if page == "💬 Chat":
             st.session_state.messages.append(("bot", summary))
 
             # 4. Θεραπευτικού τύπου απάντηση (LLM + fallback)
-            llm_output = llm_therapeutic_reply(
-                mood_value,
-                sleep,
-                water,
-                text,
-                profile,   # <-- περνάμε και το προφίλ εδώ
-            )
-
-            if llm_output is not None:
-                st.session_state.messages.append(("bot", llm_output))
-            else:
-                rb = fallback_therapeutic_reply(mood_value, sleep, water, text)
-                st.session_state.messages.append(("bot", rb))
+            #    Αν το LLM προλάβει το deadline, η απάντηση εμφανίζεται σταδιακά.
+            #    Αλλιώς δείχνουμε αμέσως την απάντηση κανόνων και το LLM
+            #    (αν τελικά απαντήσει) προστίθεται στο επόμενο rerun.
+            #    Αν το stream κολλήσει ή κοπεί με σφάλμα στη μέση, κρατάμε ό,τι
+            #    ήρθε και προσθέτουμε και την απάντηση κανόνων.
+            llm_output = ""
+            if hedge.arrived_in_time():
+                llm_output = render_message_stream(hedge.chunks())
+
+            shown = []
+            if llm_output:
+                shown.append(llm_output + " …" if hedge.interrupted else llm_output)
+            if not llm_output or hedge.interrupted:
+                shown.append(fallback_therapeutic_reply(mood_value, sleep, water, text, concepts))
+            for reply in shown:
+                st.session_state.messages.append(("bot", reply))
+
+            # Στο context μπαίνει ό,τι είδε ο χρήστης
+            conversation.add("user", text)
+            conversation.add("assistant", "\n\n".join(shown))
 
             # 5. Άσκηση
-            ex = exercise_suggestion(mood_value, sleep, water, text)
+            ex = exercise_suggestion(mood_value, sleep, water, text, concepts)
             st.session_state.messages.append(("exercise", ex))
 
             # 6. Συναισθηματικός χάρτης ημέρας
-            map_html = render_emotional_map(mood_value, sleep, water, text)
+            map_html = render_emotional_map(mood_value, sleep, water, text, concepts)
             st.session_state.messages.append(("map", map_html))
 
             # 7. Ανίχνευση «άγχους σπουδών» για πλάνο δράσης
             if (
-                detect_study_anxiety(text)
+                detect_study_anxiety(text, concepts)
                 and not st.session_state.study_anxiety_plan_given
             ):
                 st.session_state.study_anxiety_count += 1
@@ -374,7 +378,7 @@ if page == "💬 Chat":
 
             # 7β. Ανίχνευση δυσκολιών ύπνου για δεύτερο πλάνο δράσης
             if (
-                detect_sleep_difficulty(sleep, text)
+                detect_sleep_difficulty(sleep, text, concepts)
                 and not st.session_state.sleep_plan_given
             ):
                 st.session_state.sleep_plan_count += 1
@@ -384,13 +388,18 @@ if page == "💬 Chat":
                     st.session_state.messages.append(("plan", sleep_plan))
                     st.session_state.sleep_plan_given = True
 
-            # 8. Log σε CSV (ο data_logger σου γράφει σε user_data.csv)
+            # 8. Log του check-in (ο data_logger γράφει στη βάση, πίνακας checkins)
             log_user_data(mood_value, sleep, water, text)
 
             st.rerun()
 
     st.markdown("---")
 
+    # Καθυστερημένες απαντήσεις LLM (ήρθαν μετά το deadline)
+    for late_reply in pop_late_replies(st.session_state.session_id):
+        st.session_state.messages.append(("bot", f"🕒 Λίγο αργότερα: {late_reply}"))
+        st.session_state.conversation.add("assistant", late_reply)
+
     # Render ιστορικού συζήτησης + κουμπιά αποθήκευσης φράσεων
     for idx, (sender, content) in enumerate(st.session_state.messages):
         if sender == "user":
@@ -433,30 +442,27 @@ elif page == "⭐ Φράσεις Στήριξης":
         unsafe_allow_html=True,
     )
 
-    if os.path.exists(SUPPORT_PHRASES_CSV):
-        df = pd.read_csv(SUPPORT_PHRASES_CSV)
+    df = get_storage().support_phrases()
 
-        if not df.empty:
-            st.markdown("### Πρόσφατες φράσεις (τελευταίες 10)")
+    if not df.empty:
+        st.markdown("### Πρόσφατες φράσεις (τελευταίες 10)")
 
-            for _, row in df.tail(10).iterrows():
-                ts = row.get("timestamp", "-")
-                src_raw = row.get("source", "bot")
-                if src_raw == "plan":
-                    src = "πλάνο δράσης"
-                else:
-                    src = "μήνυμα bot"
-                text = str(row.get("text", "")).strip()
-                st.markdown(
-                    f"- *{ts}* – **({src})**  \n"
-                    f"  “{text}”"
-                )
+        for _, row in df.tail(10).iterrows():
+            ts = row.get("timestamp", "-")
+            src_raw = row.get("source", "bot")
+            if src_raw == "plan":
+                src = "πλάνο δράσης"
+            else:
+                src = "μήνυμα bot"
+            text = str(row.get("text", "")).strip()
+            st.markdown(
+                f"- *{ts}* – **({src})**  \n"
+                f"  “{text}”"
+            )
 
-            st.markdown("---")
-            st.markdown("### Πλήρης λίστα")
-            st.dataframe(df, use_container_width=True)
-        else:
-            st.info("Δεν έχεις αποθηκεύσει ακόμη κάποια φράση στήριξης.")
+        st.markdown("---")
+        st.markdown("### Πλήρης λίστα")
+        st.dataframe(df, use_container_width=True)
     else:
         st.info("Δεν έχεις αποθηκεύσει ακόμη κάποια φράση στήριξης.")
 
@@ -470,21 +476,20 @@ elif page == "📁 Ιστορικό":
         """
         <div class="page-header">
             <h1>📁 Ιστορικό Καταγραφών</h1>
-            <p>Γενική λίστα με τις καταγραφές σου, όπως αποθηκεύονται στο CSV.</p>
+            <p>Γενική λίστα με τις καταγραφές σου, όπως αποθηκεύονται σε κάθε check-in.</p>
         </div>
         """,
         unsafe_allow_html=True,
     )
 
-    csv_path = os.path.join(BASE_DIR, "..", "user_data.csv")
+    df = get_storage().checkins()
 
-    if os.path.exists(csv_path):
-        df = pd.read_csv(csv_path)
+    if not df.empty:
         st.dataframe(df, use_container_width=True)
     else:
         st.info(
-            "Δεν βρέθηκε αρχείο user_data.csv. "
-            "Μίλησε λίγο με το bot στην καρτέλα Chat για να δημιουργηθεί."
+            "Δεν υπάρχουν ακόμη καταγραφές. "
+            "Μίλησε λίγο με το bot στην καρτέλα Chat για να δημιουργηθούν."
         )
 
 
@@ -493,6 +498,8 @@ elif page == "📁 Ιστορικό":
 # ============================================================
 
 elif page == "📊 Στατιστικά":
+    import pandas as pd
+
     st.markdown(
         """
         <div class="page-header">
@@ -503,11 +510,9 @@ elif page == "📊 Στατιστικά":
         unsafe_allow_html=True,
     )
 
-    csv_path = os.path.join(BASE_DIR, "..", "user_data.csv")
-
-    if os.path.exists(csv_path):
-        df = pd.read_csv(csv_path)
+    df = get_storage().checkins()
 
+    if not df.empty:
         if "timestamp" in df.columns:
             df["timestamp"] = pd.to_datetime(df["timestamp"], errors="ignore")
 
@@ -548,6 +553,8 @@ elif page == "📊 Στατιστικά":
 # ============================================================
 
 elif page == "🧘 Ασκήσεις":
+    import pandas as pd
+
     st.markdown(
         """
         <div class="page-header">
@@ -618,28 +625,26 @@ elif page == "🧘 Ασκήσεις":
         st.success("Ένα ποτήρι νερό είναι μικρή αλλά πραγματική πράξη αυτοφροντίδας 💧")
 
     # Μικρό ταμπλό προόδου ασκήσεων (dominant pastel κάρτα)
-    if os.path.exists(EXERCISES_CSV):
-        df = pd.read_csv(EXERCISES_CSV)
-        if not df.empty:
-            st.markdown('<div class="exercise-progress-card">', unsafe_allow_html=True)
-
-            st.markdown("### Μικρή εικόνα προόδου με τις ασκήσεις")
-
-            counts = df["label"].value_counts()
-
-            st.markdown('<div class="chart-holder">', unsafe_allow_html=True)
-            st.bar_chart(counts)
-            st.markdown('</div>', unsafe_allow_html=True)
-
-            st.markdown("#### Τελευταίες 5 ολοκληρώσεις")
-            st.markdown('<div class="exercise-table-holder">', unsafe_allow_html=True)
-            for _, row in df.tail(5).iterrows():
-                ts = row.get("timestamp", "-")
-                label = row.get("label", "")
-                st.write(f"- **{ts}** – {label}")
-            st.markdown('</div>', unsafe_allow_html=True)
-
-            st.markdown('</div>', unsafe_allow_html=True)
+    # Πλήθη ανά άσκηση με GROUP BY και μόνο οι 5 τελευταίες γραμμές από τη βάση
+    counts = pd.Series(get_storage().exercise_counts(), name="count")
+    if not counts.empty:
+        st.markdown('<div class="exercise-progress-card">', unsafe_allow_html=True)
+
+        st.markdown("### Μικρή εικόνα προόδου με τις ασκήσεις")
+
+        st.markdown('<div class="chart-holder">', unsafe_allow_html=True)
+        st.bar_chart(counts)
+        st.markdown('</div>', unsafe_allow_html=True)
+
+        st.markdown("#### Τελευταίες 5 ολοκληρώσεις")
+        st.markdown('<div class="exercise-table-holder">', unsafe_allow_html=True)
+        for _, row in get_storage().exercises(limit=5).iterrows():
+            ts = row.get("timestamp", "-")
+            label = row.get("label", "")
+            st.write(f"- **{ts}** – {label}")
+        st.markdown('</div>', unsafe_allow_html=True)
+
+        st.markdown('</div>', unsafe_allow_html=True)
     else:
         st.info(
             "Δεν υπάρχουν ακόμη καταγραφές ολοκληρωμένων ασκήσεων. "
@@ -832,7 +837,7 @@ elif page == "ℹ️ Σχετικά & Ασφάλεια":
           χωρίς να δίνει διαγνώσεις ή ιατρικές οδηγίες.  
         - Προτείνει **μικρές ασκήσεις αυτοφροντίδας** (αναπνοές, journaling κτλ.).  
         - Δημιουργεί έναν **mini “Συναισθηματικό Χάρτη Ημέρας”** με 3–4 λέξεις-κλειδιά.  
-        - Καταγράφει ανώνυμα τα δεδομένα σε CSV, ώστε να φαίνονται **στατιστικά ευεξίας**.
+        - Καταγράφει ανώνυμα τα δεδομένα σε τοπική βάση (SQLite), ώστε να φαίνονται **στατιστικά ευεξίας**.
         """
     )
 
@@ -848,7 +853,8 @@ elif page == "ℹ️ Σχετικά & Ασφάλεια":
           - `llm.py` → κλήσεις στο μοντέλο (LLM) + fallback  
           - `emotional_map.py` → εξαγωγή tags για τον «Συναισθηματικό Χάρτη Ημέρας»  
           - `components.py` → UI components (μηνύματα, κάρτες, action plans)  
-          - `data_logger.py` → καταγραφή σε CSV  
+          - `data_logger.py` → καταγραφή check-ins  
+          - `storage.py` → αποθήκευση όλων των δεδομένων σε SQLite (WAL)  
         - Το API key περνάει **μέσω `st.secrets`** (`.streamlit/secrets.toml`) 
           και δεν εμφανίζεται στον κώδικα.
         """
@@ -876,6 +882,34 @@ elif page == "ℹ️ Σχετικά & Ασφάλεια":
         """
     )
 
+    with st.expander("⏱️ Χρόνοι φόρτωσης πόρων"):
+        st.table(resources.load_report())
+        if resources.is_loaded("llm_cache"):
+            st.caption("Cache απαντήσεων LLM")
+            st.json(resources.get("llm_cache").stats())
+        if resources.is_loaded("semantic_cache"):
+            st.caption("Σημασιολογική cache απαντήσεων LLM")
+            st.json(resources.get("semantic_cache").stats())
+        if llm_metrics():
+            st.caption("LLM client: circuit breaker, καθυστέρηση, single-flight και όριο ανά session")
+            st.json(llm_metrics())
+        if resources.is_loaded("latency_controller"):
+            st.caption("Προσαρμογή max_tokens / προτύπου στο SLO καθυστέρησης")
+            st.json(latency_plan())
+        if resources.is_loaded("usage_ledger"):
+            st.caption("Tokens και κόστος LLM αυτού του session")
+            st.json(session_usage(st.session_state.session_id))
+        if stream_timings():
+            st.caption("Streaming LLM: time-to-first-token (τελευταίες απαντήσεις)")
+            st.table(stream_timings()[-10:])
+        if st.session_state.conversation.sent:
+            st.caption("Tokens prompt ανά γύρο (σύνοψη + πρόσφατοι γύροι)")
+            st.table(list(st.session_state.conversation.sent)[-10:])
+        if turn_outcomes():
+            st.caption("Hedging LLM / fallback: αποτελέσματα γύρων")
+            st.json(outcome_summary())
+            st.table(turn_outcomes()[-10:])
+
     st.markdown("### Disclaimer")
     st.markdown(
         """
@@ -28,6 +28,27 @@ def render_message(sender: str, text: str):
         )
 
 
+def render_message_stream(chunks) -> str:
+    """
+    Εμφανίζει μήνυμα bot που «γράφεται» σταδιακά: κάθε νέο κομμάτι
+    ξαναζωγραφίζει το ίδιο bubble (st.empty), με έναν κέρσορα στο τέλος.
+    Επιστρέφει το τελικό κείμενο ("" αν δεν ήρθε τίποτα).
+    """
+    placeholder = st.empty()
+    text = ""
+    for chunk in chunks:
+        text += chunk
+        with placeholder.container():
+            render_message("bot", text + "▌")
+
+    if text:
+        with placeholder.container():
+            render_message("bot", text)
+    else:
+        placeholder.empty()
+    return text
+
+
 def render_exercise_card(text: str):
     """
     Κάρτα άσκησης (χρησιμοποιεί τα CSS:
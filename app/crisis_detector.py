@@ -0,0 +1,442 @@
+# app/crisis_detector.py
+"""
+Ανιχνευτής φράσεων κρίσης (αυτοκτονικός ιδεασμός, αυτοβλάβη) για το is_emergency.
+
+- Οι φράσεις κανονικοποιούνται (text_normalization) και σπάνε σε tokens.
+- Κάθε token συγκρίνεται «φωνητικά» (ω/ο, η/ι/υ/ει/οι, διπλά σύμφωνα) και
+  με φραγμένη απόσταση επεξεργασίας, μέσω index διγραμμάτων.
+- Οι φράσεις ταιριάζουν σε συνεχόμενα tokens, επιτρέποντας και κολλημένες
+  ή σπασμένες λέξεις («δενθέλω», «αυτο κτονία»).
+- Πρώτα, σε ολόκληρο το μήνυμα, ελέγχεται η λίστα υποσυμβολοσειρών του
+  παλιού is_emergency (EXACT_RED_FLAGS), ώστε η κάλυψη να μην πέφτει ποτέ
+  κάτω από αυτήν, σε οποιοδήποτε μήκος.
+- Υπάρχει χρονικό budget για το fuzzy στάδιο: αν εξαντληθεί σε μεγάλο
+  μήνυμα, το κείμενο ελέγχεται με ακριβές regex (C, γραμμικό).
+- Το fuzzy στάδιο και το regex βλέπουν μόνο τους πρώτους και τελευταίους
+  MAX_INPUT_CHARS / 2 χαρακτήρες (truncated=True), ώστε να είναι φραγμένα.
+- Κάθε θετικός έλεγχος γράφεται συγχρονισμένα σε δικό του audit log,
+  ανεξάρτητο από το log_user_data· αν η εγγραφή αποτύχει, το αποτέλεσμα
+  επιστρέφεται κανονικά.
+"""
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+from typing import NamedTuple
+
+from text_normalization import TOKEN_CACHE_SIZE, normalize_phrase, normalize_token
+
+BASE_DIR = os.path.dirname(__file__)
+CRISIS_AUDIT_LOG = os.path.join(BASE_DIR, "..", "crisis_audit.jsonl")
+
+# Φράσεις-«red flags». Το «*» στο τέλος σημαίνει πρόθεμα (αυτοκτονία, αυτοκτονήσω…).
+CRISIS_PHRASES = [
+    "αυτοκτον*",
+    "να τελειώσω",
+    "δεν θέλω να ζω",
+    "να βλάψω τον εαυτό μου",
+    "να χτυπήσω τον εαυτό μου",
+    "δεν αντέχω άλλο",
+    "να πεθάνω",
+]
+
+# Η λίστα του παλιού is_emergency, ως υποσυμβολοσειρές του text.lower().
+# Ελέγχεται πάντα, σε όλο το μήνυμα (γραμμικό, ~13 µs ανά 1.000 χαρακτήρες).
+EXACT_RED_FLAGS = [
+    "αυτοκτον", "να αυτοκτον", "να τελειώσω", "να τελειωσω",
+    "δεν θέλω να ζω", "δεν θελω να ζω", "να βλάψω τον εαυτό μου",
+    "να βλαψω τον εαυτο μου", "να χτυπήσω τον εαυτό μου",
+    "να χτυπησω τον εαυτο μου", "δεν αντέχω άλλο", "δεν αντεχω αλλο",
+    "να πεθάνω", "να πεθανω",
+]
+
+# Χρονικό budget του fuzzy σταδίου ανά μήνυμα, και μέγιστο κομμάτι κειμένου
+# που περνά από αυτό. Πέρα από αυτά, το μήνυμα ελέγχεται με το ακριβές
+# regex (~0.03 µs/χαρακτήρα), μέσα στο όριο MAX_INPUT_CHARS (μισό από την
+# αρχή, μισό από το τέλος). Το budget είναι στόχος για το fuzzy στάδιο, όχι
+# εγγύηση για το σύνολο: το ρολόι ελέγχεται ανά _CLOCK_EVERY tokens και
+# δεν καλύπτει ούτε το EXACT_RED_FLAGS (γραμμικό σε όλο το μήνυμα) ούτε
+# τις άδειες caches. Στο benchmark (bench_crisis_detector.py) το p99 είναι
+# ≈ 0.8 ms ως ~8.500 χαρακτήρες, ≈ 1.6 ms στους ~28.000 και ≈ 2.8 ms στους
+# ~113.000, όπου κυριαρχεί το γραμμικό πέρασμα των EXACT_RED_FLAGS.
+BUDGET_MS = 0.4
+FUZZY_WINDOW_CHARS = 2000
+MAX_INPUT_CHARS = 6000
+# Κάθε πόσα tokens ελέγχεται το ρολόι
+_CLOCK_EVERY = 32
+
+_TOKEN_RE = re.compile(r"[^\W\d_]+")
+_REPEATS_RE = re.compile(r"(.)\1+")
+# Για το ακριβές regex: κάθε φωνήεν ταιριάζει με ή χωρίς τόνο/διαλυτικά,
+# ώστε αρκεί ένα casefold (C) αντί για πλήρη κανονικοποίηση του κειμένου.
+_ACCENT_CLASSES = {
+    "α": "[αά]", "ε": "[εέ]", "η": "[ηή]", "ι": "[ιίϊΐ]",
+    "ο": "[οό]", "υ": "[υύϋΰ]", "ω": "[ωώ]",
+}
+
+
+def max_distance(length: int, in_phrase: bool = False, prefix: bool = False) -> int:
+    """
+    Επιτρεπόμενη απόσταση επεξεργασίας ανάλογα με το μήκος του token:
+    μικρές λέξεις («να», «ζω») πρέπει να ταιριάζουν ακριβώς. Τα 3γράμματα
+    μέσα σε φράση πολλών λέξεων («άλλον» για «άλλο», «δε» για «δεν»)
+    επιτρέπουν μία, αφού τα γειτονικά tokens περιορίζουν το ταίριασμα.
+    Τα προθέματα («αυτοκτον*») δέχονται οποιαδήποτε κατάληξη, οπότε το
+    πολύ μία: με δύο, το «αυτοκίνητο» ή το «αυτοκόλλητο» θα ταίριαζαν.
+    """
+    if prefix:
+        return min(1, max_distance(length, in_phrase))
+    if length <= 3:
+        return 1 if in_phrase and length == 3 else 0
+    if length <= 6:
+        return 1
+    return 2
+
+
+def phonetic_key(token: str) -> str:
+    """
+    «Φωνητικό» κλειδί ενός κανονικοποιημένου token, ώστε συνηθισμένα
+    ορθογραφικά λάθη και Greeklish (θελο/θελω, ζι/ζη) να συμπίπτουν.
+    """
+    key = token.replace("ου", "U")
+    for src, dst in (("ει", "ι"), ("οι", "ι"), ("υι", "ι"), ("αι", "ε"),
+                     ("ω", "ο"), ("η", "ι"), ("υ", "ι")):
+        key = key.replace(src, dst)
+    key = _REPEATS_RE.sub(r"\1", key)
+    return key.replace("U", "ου")
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def token_key(token: str) -> str:
+    """
+    Κανονικοποίηση + φωνητικό κλειδί ενός token του μηνύματος (με cache).
+    """
+    return phonetic_key(normalize_token(token))
+
+
+def bounded_levenshtein(a: str, b: str, limit: int) -> int:
+    """
+    Απόσταση Levenshtein με πρόωρο τερματισμό: επιστρέφει limit + 1
+    μόλις φανεί ότι η απόσταση ξεπερνά το limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        if min(cur) > limit:
+            return limit + 1
+        prev = cur
+    return prev[-1]
+
+
+def ending_ok(key: str, target: str) -> bool:
+    """
+    Η κατάληξη κουβαλά πρόσωπο και αριθμό («να πεθάνω» ≠ «να πεθάνει»):
+    το τελευταίο γράμμα πρέπει να συμπίπτει, εκτός αν το ένα token απλώς
+    συνεχίζει το άλλο («άλλο» → «άλλον», «δεν» → «δε»).
+    """
+    return key[-1:] == target[-1:] or key.startswith(target) or target.startswith(key)
+
+
+def _bigrams(word: str) -> list[str]:
+    return [word[i:i + 2] for i in range(len(word) - 1)]
+
+
+def _accent_insensitive(token: str) -> str:
+    return "".join(_ACCENT_CLASSES.get(ch, re.escape(ch)) for ch in token)
+
+
+class CrisisMatch(NamedTuple):
+    is_crisis: bool
+    phrase: str | None = None
+    matched_text: str | None = None
+    elapsed_ms: float = 0.0
+    budget_exhausted: bool = False
+    truncated: bool = False
+
+
+class CrisisDetector:
+    def __init__(self, phrases: list[str] = CRISIS_PHRASES, budget_ms: float = BUDGET_MS,
+                 audit_path: str | None = CRISIS_AUDIT_LOG):
+        self.phrases = list(phrases)
+        self.budget_ms = budget_ms
+        self.audit_path = audit_path
+        self._audit_lock = threading.Lock()
+
+        # Μονάδες σύγκρισης: κάθε token φράσης και κάθε ζεύγος διαδοχικών
+        # tokens ενωμένο (για κολλημένες λέξεις). unit = (κλειδί, πρόθεμα;)
+        self._units: list[tuple[str, bool]] = []
+        unit_ids: dict[tuple[str, bool], int] = {}
+        in_phrase: set[int] = set()
+
+        def unit(key: str, prefix: bool) -> int:
+            return unit_ids.setdefault((key, prefix), len(unit_ids))
+
+        # Κάθε φράση: λίστα (uid μονού token, uid ένωσης με το επόμενο ή None)
+        self._compiled: list[list[tuple[int, int | None]]] = []
+        exact_patterns = []
+        for phrase in self.phrases:
+            is_prefix = phrase.endswith("*")
+            tokens = normalize_phrase(phrase.rstrip("*")).split()
+            keys = [phonetic_key(t) for t in tokens]
+            steps = []
+            for i, key in enumerate(keys):
+                last = i == len(keys) - 1
+                merged = None
+                if not last:
+                    merged = unit(key + keys[i + 1], is_prefix and i + 1 == len(keys) - 1)
+                steps.append((unit(key, is_prefix and last), merged))
+            if len(keys) > 1:
+                in_phrase.update(uid for step in steps for uid in step if uid is not None)
+            self._compiled.append(steps)
+            exact = r"\W+".join(_accent_insensitive(t) for t in tokens)
+            exact_patterns.append(exact if is_prefix else exact + r"(?!\w)")
+
+        self._units = [None] * len(unit_ids)
+        for (key, prefix), uid in unit_ids.items():
+            self._units[uid] = (key, prefix)
+        self._limits = [max_distance(len(key), uid in in_phrase, prefix)
+                        for uid, (key, prefix) in enumerate(self._units)]
+        self._exact_flags = [flag.lower() for flag in EXACT_RED_FLAGS]
+
+        # Μονάδες με απόσταση 0 (μικρές λέξεις): απλό dict lookup.
+        # Οι υπόλοιπες μπαίνουν σε index διγραμμάτων (q-gram lemma): με k
+        # επεξεργασίες χάνονται το πολύ 2k από τα διγράμματα της μονάδας, άρα
+        # όποια μονάδα δεν μοιράζεται αρκετά διγράμματα με το token απορρίπτεται
+        # χωρίς να υπολογιστεί Levenshtein.
+        self._exact_units: dict[str, int] = {}
+        self._bigram_index: dict[str, list[int]] = {}
+        self._min_shared: dict[int, int] = {}
+        for uid, (key, prefix) in enumerate(self._units):
+            limit = self._limits[uid]
+            if limit == 0 and not prefix:
+                self._exact_units[key] = uid
+                continue
+            for bigram in _bigrams(key):
+                self._bigram_index.setdefault(bigram, []).append(uid)
+            self._min_shared[uid] = len(key) - 1 - 2 * limit
+
+        # Ποιες φράσεις μπορεί να ξεκινούν από ένα token (για να μη δοκιμάζονται όλες)
+        self._starts: dict[int, list[int]] = {}
+        self._split_starts: dict[str, list[int]] = {}
+        for idx, steps in enumerate(self._compiled):
+            single, merged = steps[0]
+            for uid in (single, merged):
+                if uid is not None:
+                    self._starts.setdefault(uid, []).append(idx)
+            self._split_starts.setdefault(self._units[single][0][:2], []).append(idx)
+        self._lookahead = 2 * max(len(steps) for steps in self._compiled)
+
+        # Το lookahead στο πρώτο γράμμα επιτρέπει στο regex να προσπερνά
+        # γρήγορα τις θέσεις που δεν μπορούν να ξεκινούν φράση.
+        first_letters = "".join(sorted({
+            _ACCENT_CLASSES.get(p[0], p[0]).strip("[]")
+            for p in (normalize_phrase(ph.rstrip("*")) for ph in self.phrases)
+        }))
+        self._exact_re = re.compile(
+            f"(?=[{first_letters}])\\b(?:" + "|".join(exact_patterns) + ")"
+        )
+        self._unit_matches = lru_cache(maxsize=TOKEN_CACHE_SIZE)(self._compute_unit_matches)
+        self._start_candidates = lru_cache(maxsize=TOKEN_CACHE_SIZE)(self._compute_start_candidates)
+
+    # ------------------------------------------------------------
+    #   Σύγκριση tokens
+    # ------------------------------------------------------------
+
+    def _compute_unit_matches(self, key: str) -> frozenset[int]:
+        """
+        Οι μονάδες με τις οποίες ταιριάζει ένα φωνητικό κλειδί (με cache).
+        """
+        found: set[int] = set()
+        uid = self._exact_units.get(key)
+        if uid is not None:
+            found.add(uid)
+
+        shared: dict[int, int] = {}
+        for bigram in set(_bigrams(key)):
+            for uid in self._bigram_index.get(bigram, ()):
+                shared[uid] = shared.get(uid, 0) + 1
+
+        for uid, count in shared.items():
+            if count < self._min_shared[uid]:
+                continue
+            target, prefix = self._units[uid]
+            limit = self._limits[uid]
+            # Στα 3γράμματα η επεξεργασία δεν αγγίζει το πρώτο γράμμα («σου» ≠ «μου»)
+            if len(target) <= 3 and key[:1] != target[:1]:
+                continue
+            if not prefix:
+                if ending_ok(key, target) and bounded_levenshtein(key, target, limit) <= limit:
+                    found.add(uid)
+                continue
+            for cut in range(max(1, len(target) - limit), len(target) + limit + 1):
+                if cut <= len(key) and bounded_levenshtein(key[:cut], target, limit) <= limit:
+                    found.add(uid)
+                    break
+        return frozenset(found)
+
+    def _match_phrase(self, steps, pos: int, keys: list[str], i: int) -> int:
+        """
+        Ταιριάζει τα steps[pos:] ξεκινώντας από το token i.
+        Επιστρέφει το index μετά το τελευταίο token ή -1.
+        """
+        if pos == len(steps):
+            return i
+        if i >= len(keys):
+            return -1
+        single, merged = steps[pos]
+        matches = self._unit_matches(keys[i])
+
+        if single in matches:
+            end = self._match_phrase(steps, pos + 1, keys, i + 1)
+            if end >= 0:
+                return end
+        if merged is not None and merged in matches:
+            end = self._match_phrase(steps, pos + 2, keys, i + 1)
+            if end >= 0:
+                return end
+        # Σπασμένη λέξη: δύο tokens του μηνύματος = ένα token της φράσης
+        target = self._units[single][0]
+        if i + 1 < len(keys) and len(keys[i]) < len(target) and target.startswith(keys[i][:2]):
+            if single in self._unit_matches(keys[i] + keys[i + 1]):
+                return self._match_phrase(steps, pos + 1, keys, i + 2)
+        return -1
+
+    def _compute_start_candidates(self, key: str) -> tuple[int, ...]:
+        """
+        Οι φράσεις που μπορεί να ξεκινούν από ένα token (με cache).
+        """
+        candidates = set(self._split_starts.get(key[:2], ()))
+        for uid in self._unit_matches(key):
+            candidates.update(self._starts.get(uid, ()))
+        return tuple(sorted(candidates))
+
+    def _match_at(self, keys: list[str], i: int) -> tuple[int, int] | None:
+        """
+        Δοκιμάζει μόνο τις φράσεις που μπορούν να ξεκινούν στο token i.
+        Επιστρέφει (φράση, index μετά το τελευταίο token) ή None.
+        """
+        for idx in self._start_candidates(keys[i]):
+            end = self._match_phrase(self._compiled[idx], 0, keys, i)
+            if end >= 0:
+                return idx, end
+        return None
+
+    # ------------------------------------------------------------
+    #   API
+    # ------------------------------------------------------------
+
+    def can_start(self, token: str) -> bool:
+        """
+        Αν ένα (ακατέργαστο) token μπορεί να ξεκινά φράση κρίσης.
+        Χρήσιμο για batch προφιλτράρισμα: μηνύματα χωρίς τέτοιο token
+        δεν χρειάζεται να περάσουν από το detect.
+        """
+        return bool(self._start_candidates(token_key(token)))
+
+    def exact_flag(self, text: str) -> str | None:
+        """
+        Η πρώτη φράση του EXACT_RED_FLAGS που περιέχεται στο κείμενο, ή None.
+        """
+        lowered = text.lower()
+        return next((flag for flag in self._exact_flags if flag in lowered), None)
+
+    def detect(self, text: str) -> CrisisMatch:
+        start = time.perf_counter()
+        deadline = start + self.budget_ms / 1000
+        message = text
+
+        # Δάπεδο: ό,τι έπιανε το παλιό is_emergency πιάνεται πάντα, σε όλο το μήνυμα
+        flag = self.exact_flag(message)
+        result = (flag, flag) if flag else None
+
+        # Το fuzzy στάδιο (και το regex του) βλέπει μόνο αρχή και τέλος
+        truncated = result is None and len(text) > MAX_INPUT_CHARS
+        if truncated:
+            half = MAX_INPUT_CHARS // 2
+            text = text[:half] + "\n" + text[-half:]
+
+        raw = [] if result else _TOKEN_RE.findall(text, 0, FUZZY_WINDOW_CHARS)
+        keys: list[str] = []
+        exhausted = result is None and len(text) > FUZZY_WINDOW_CHARS
+
+        # Τα tokens κανονικοποιούνται σε κομμάτια των _CLOCK_EVERY (συν όσα
+        # χρειάζεται η μεγαλύτερη φράση), με έλεγχο του ρολογιού ανά κομμάτι.
+        for base in range(0, len(raw), _CLOCK_EVERY):
+            if base and time.perf_counter() > deadline:
+                exhausted = True
+                break
+            stop = min(len(raw), base + _CLOCK_EVERY + self._lookahead)
+            keys.extend(map(token_key, raw[len(keys):stop]))
+            for i in range(base, min(base + _CLOCK_EVERY, len(raw))):
+                found = self._match_at(keys, i)
+                if found:
+                    idx, end = found
+                    spans = [m.span() for m in islice(_TOKEN_RE.finditer(text), i, end)]
+                    result = (self.phrases[idx], text[spans[0][0]:spans[-1][1]])
+                    break
+            if result:
+                break
+
+        if result is None and exhausted:
+            # Ό,τι δεν πρόλαβε το fuzzy στάδιο καλύπτεται από το ακριβές regex
+            m = self._exact_re.search(text.casefold())
+            if m:
+                result = ("(exact)", m.group(0))
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        match = CrisisMatch(
+            is_crisis=result is not None,
+            phrase=result[0] if result else None,
+            matched_text=result[1] if result else None,
+            elapsed_ms=elapsed_ms,
+            budget_exhausted=exhausted,
+            truncated=truncated,
+        )
+        if match.is_crisis:
+            self._audit(message, match)
+        return match
+
+    def _audit(self, text: str, match: CrisisMatch) -> None:
+        """
+        Συγχρονισμένη εγγραφή (flush + fsync) πριν επιστρέψει ο έλεγχος.
+        Δεν κρατάμε όλο το μήνυμα, μόνο το hash του και το κομμάτι που ταίριαξε.
+        """
+        if not self.audit_path:
+            return
+        record = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "phrase": match.phrase,
+            "matched_text": match.matched_text,
+            "message_sha256": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+            "message_length": len(text),
+            "elapsed_ms": round(match.elapsed_ms, 3),
+            "budget_exhausted": match.budget_exhausted,
+            "truncated": match.truncated,
+        }
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        # Αποτυχία του log δεν πρέπει να κόψει την απάντηση έκτακτης ανάγκης
+        try:
+            with self._audit_lock:
+                with open(self.audit_path, "a", encoding="utf-8") as f:
+                    f.write(line)
+                    f.flush()
+                    os.fsync(f.fileno())
+        except OSError as exc:
+            print(f"[crisis_detector] audit log {self.audit_path}: {exc!r}", file=sys.stderr)
+
+
+DETECTOR = CrisisDetector()
+
+
+def detect_crisis(text: str) -> CrisisMatch:
+    return DETECTOR.detect(text)
@@ -1,13 +1,6 @@
-import csv
-import os
-from datetime import datetime
+from storage import DEFAULT_USER_ID, get_storage
 
-def log_user_data(mood, sleep, water, message, path="user_data.csv"):
-    file_exists = os.path.isfile(path)
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    with open(path, mode="a", newline='', encoding="utf-8") as f:
-        writer = csv.writer(f)
-        if not file_exists:
-            writer.writerow(["timestamp", "mood", "sleep", "water", "message"])
-        writer.writerow([now, mood, sleep, water, message])
+def log_user_data(mood, sleep, water, message, user_id=DEFAULT_USER_ID):
+    # Μία γραμμή στον πίνακα checkins (παλιά: user_data.csv)
+    get_storage().add_checkin(mood, sleep, water, message, user_id=user_id)
@@ -0,0 +1,136 @@
+# app/distill_sentiment.py
+"""
+Offline distillation του tiny_sentiment: ο teacher (λεξικό + transformer)
+βάζει ετικέτες σε ένα ελληνικό σώμα κειμένων και το γραμμικό μοντέλο
+μαθαίνει να τις αναπαράγει.
+
+Σώμα κειμένων:
+- τα μηνύματα των check-ins (ό,τι έχει καταγραφεί στη βάση),
+- συνθετικά μηνύματα: καθημερινές λέξεις + όροι του λεξικού με πολικότητα,
+  με ενισχυτικά, αρνήσεις και μερικά σε Greeklish.
+
+Teacher, δρομολογημένος ανά γλώσσα (language_router): τα αγγλικά μηνύματα
+περνούν από το SentimentCascade (λεξικό όταν είναι βέβαιο, αλλιώς
+analyze_sentiment)· τα ελληνικά και τα Greeklish μόνο από το λεξικό, αφού
+το αγγλικό SST-2 δίνει θόρυβο στα ελληνικά. Όπου το λεξικό δεν είναι
+βέβαιο, το μήνυμα δεν παίρνει ετικέτα. Με --lexicon-only όλα τα μηνύματα
+περνούν μόνο από το λεξικό (δεν χρειάζεται transformer).
+
+Ένα 10% κρατιέται εκτός εκπαίδευσης για τη συμφωνία με τον teacher.
+
+Χρήση:
+    python app/distill_sentiment.py [πλήθος_συνθετικών] [--lexicon-only]
+"""
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+from language_router import greeklish_variants
+from lexicon_artifact import STEM_KEY_PREFIX
+from lexicon_sentiment import get_lexicon
+from text_normalization import NEGATION_WORDS
+from tiny_sentiment import TINY_MODEL_PATH, train
+
+DISTILL_CORPUS_SIZE = 50_000
+DISTILL_HOLDOUT = 0.1
+
+FILLER = [
+    "σήμερα", "νιώθω", "είμαι", "πολύ", "λίγο", "αλλά", "και", "η", "μέρα",
+    "σχολή", "εξετάσεις", "ύπνος", "φίλους", "δουλειά", "σπίτι", "χθες",
+    "το", "βράδυ", "με", "την", "οικογένεια", "μου", "όλη", "εβδομάδα",
+]
+INTENSIFIERS = ["πολύ", "πάρα πολύ", "τόσο", "λίγο", "αρκετά"]
+
+
+def synthetic_corpus(n: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    lexicon = get_lexicon()
+    polar: dict[int, list[str]] = {1: [], -1: []}
+    for i in range(len(lexicon)):
+        term, code = lexicon.term(i), lexicon.polarity_code(i)
+        if code in polar and not term.startswith(STEM_KEY_PREFIX):
+            polar[code].append(term)
+
+    messages = []
+    for _ in range(n):
+        main = rng.choice((1, -1))
+        words = rng.choices(FILLER, k=rng.randint(3, 10))
+        for _ in range(rng.randint(1, 3)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(polar[main]))
+        if rng.random() < 0.3:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(polar[-main]))
+        if rng.random() < 0.3:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(INTENSIFIERS))
+        if rng.random() < 0.15:
+            words.insert(0, rng.choice(NEGATION_WORDS))
+        if rng.random() < 0.15:
+            words = [rng.choice(greeklish_variants(w)) for w in words]
+        messages.append(" ".join(words))
+    return messages
+
+
+def logged_messages() -> list[str]:
+    from storage import get_storage
+
+    return get_storage().checkins()["message"].dropna().astype(str).tolist()
+
+
+def teacher_targets(texts: list[str], lexicon_only: bool) -> tuple[list[str], np.ndarray]:
+    """
+    (κείμενα, P(POSITIVE) του teacher). Πετιούνται τα κείμενα όπου το
+    λεξικό δεν είναι βέβαιο και δεν επιτρέπεται transformer (όλα με
+    lexicon_only, αλλιώς τα μη αγγλικά).
+    """
+    from sentiment_cascade import lexicon_decision
+
+    cascade = None
+    if not lexicon_only:
+        from language_router import ANALYZER_TRANSFORMER, ROUTES, detect_language
+        from sentiment_cascade import SentimentCascade
+
+        cascade = SentimentCascade()
+
+    kept, targets = [], []
+    for text in texts:
+        if cascade is not None and ROUTES[detect_language(text)] == ANALYZER_TRANSFORMER:
+            result = cascade.classify(text)
+        else:
+            result, _ = lexicon_decision(text)
+        if result is not None:
+            kept.append(text)
+            targets.append(result["score"] if result["label"] == "POSITIVE" else 1 - result["score"])
+    if cascade is not None:
+        print(f"Teacher (αγγλικά μέσω cascade): {cascade.stats()}")
+    return kept, np.asarray(targets)
+
+
+def main() -> None:
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    n = int(args[0]) if args else DISTILL_CORPUS_SIZE
+    lexicon_only = "--lexicon-only" in sys.argv
+
+    texts = list(dict.fromkeys(logged_messages() + synthetic_corpus(n)))
+    start = time.perf_counter()
+    texts, targets = teacher_targets(texts, lexicon_only)
+    print(f"Ετικέτες για {len(texts)} μηνύματα σε {time.perf_counter() - start:.1f} s")
+
+    order = np.random.default_rng(0).permutation(len(texts))
+    n_holdout = int(len(texts) * DISTILL_HOLDOUT)
+    holdout, training = order[:n_holdout], order[n_holdout:]
+
+    start = time.perf_counter()
+    model = train([texts[i] for i in training], targets[training])
+    print(f"Εκπαίδευση σε {len(training)} μηνύματα: {time.perf_counter() - start:.1f} s")
+
+    predicted = model.predict_proba([texts[i] for i in holdout]) >= 0.5
+    agreement = float(np.mean(predicted == (targets[holdout] >= 0.5)))
+    path = model.save(TINY_MODEL_PATH)
+    print(f"Συμφωνία με τον teacher (holdout {n_holdout}): {agreement:.1%}")
+    print(f"Αποθηκεύτηκε: {os.path.normpath(path)} ({os.path.getsize(path) / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,44 @@
-def extract_emotional_tags(mood: int, sleep: str, water: str, text: str):
-    t = text.lower()
+from keyword_matcher import match_concepts
+from lexicon_sentiment import analyze_lexicon_emotions
+
+# Συναισθήματα του λεξικού → tags του χάρτη
+LEXICON_EMOTION_TAGS = {
+    "Fear": ("😟", "Άγχος"),
+    "Sadness": ("💙", "Θλίψη"),
+    "Anger": ("😠", "Θυμός"),
+    "Happiness": ("😊", "Χαρά"),
+}
+# Ελάχιστη μέση ένταση (0–1) για να εμφανιστεί tag από το λεξικό
+LEXICON_EMOTION_THRESHOLD = 0.5
+
+
+def lexicon_emotion_tags(text: str) -> list[tuple[str, str]]:
+    """
+    Tags από τις πραγματικές εντάσεις συναισθημάτων του λεξικού,
+    με σειρά από το πιο έντονο στο λιγότερο έντονο.
+    """
+    emotions = analyze_lexicon_emotions(text)["emotions"]
+    strong = sorted(
+        (
+            (intensity, emotion)
+            for emotion, intensity in emotions.items()
+            if emotion in LEXICON_EMOTION_TAGS and intensity >= LEXICON_EMOTION_THRESHOLD
+        ),
+        reverse=True,
+    )
+    return [LEXICON_EMOTION_TAGS[emotion] for _, emotion in strong]
+
+
+def extract_emotional_tags(
+    mood: int,
+    sleep: str,
+    water: str,
+    text: str,
+    concepts: frozenset[str] | None = None,
+    lexicon_tags: list[tuple[str, str]] | None = None,
+):
+    if concepts is None:
+        concepts = match_concepts(text)
     tags: list[tuple[str, str]] = []
 
     if mood <= 20:
@@ -13,15 +52,15 @@ def extract_emotional_tags(mood: int, sleep: str, water: str, text: str):
     else:
         tags.append(("😄", "Θετική διάθεση"))
 
-    if "άγχ" in t or "αγχος" in t:
+    if "anxiety" in concepts:
         tags.append(("😟", "Άγχος"))
-    if "πίεσ" in t or "πιεζ" in t or "πολλά" in t or "πολλα" in t:
+    if "pressure" in concepts or "many" in concepts:
         tags.append(("🟠", "Πίεση"))
-    if "κουρασ" in t or "κουράσ" in t or "εξαντ" in t:
+    if "tiredness" in concepts:
         tags.append(("💤", "Κούραση"))
-    if "ελπί" in t or "ελπι" in t:
+    if "hope" in concepts:
         tags.append(("💛", "Ελπίδα"))
-    if "μοναξ" in t:
+    if "loneliness" in concepts:
         tags.append(("🤍", "Μοναξιά"))
 
     if sleep in ["0–2", "3–5"]:
@@ -36,11 +75,23 @@ def extract_emotional_tags(mood: int, sleep: str, water: str, text: str):
             uniq.append((emoji, label))
             seen.add(label)
 
+    # Τα tags του λεξικού συμπληρώνουν τις κενές θέσεις, χωρίς να
+    # εκτοπίζουν τα βασικά· αν δεν υπάρχει θέση, το λεξικό δεν τρέχει
+    if len(uniq) < 4:
+        if lexicon_tags is None:
+            lexicon_tags = lexicon_emotion_tags(text)
+        for emoji, label in lexicon_tags:
+            if label not in seen:
+                uniq.append((emoji, label))
+                seen.add(label)
+
     return uniq[:4]
 
 
-def render_emotional_map(mood: int, sleep: str, water: str, text: str) -> str:
-    tags = extract_emotional_tags(mood, sleep, water, text)
+def render_emotional_map(
+    mood: int, sleep: str, water: str, text: str, concepts: frozenset[str] | None = None
+) -> str:
+    tags = extract_emotional_tags(mood, sleep, water, text, concepts)
     if not tags:
         return ""
 
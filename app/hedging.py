@@ -0,0 +1,257 @@
+# app/hedging.py
+"""
+Deadline-based hedging ανάμεσα στο LLM και στο rule-based fallback.
+
+Το αίτημα στο LLM ξεκινά σε background thread μόλις υποβληθεί το μήνυμα.
+Αν το πρώτο κομμάτι της απάντησης δεν έρθει μέσα στο latency budget
+(LLM_DEADLINE_SECONDS), το Chat δείχνει αμέσως την απάντηση κανόνων και
+το LLM συνεχίζει στο παρασκήνιο:
+
+- LATE_LLM_POLICY = "append": η καθυστερημένη απάντηση προστίθεται στη
+  συζήτηση στο επόμενο rerun (pop_late_replies).
+- LATE_LLM_POLICY = "drop": απορρίπτεται (καταγράφεται μόνο ο χρόνος της).
+
+Αφού ξεκινήσει, κάθε επόμενο κομμάτι περιμένεται το πολύ LLM_STALL_SECONDS:
+αν το stream «κολλήσει» ή κοπεί με σφάλμα, το chunks() τελειώνει με ό,τι
+έχει έρθει, hedge.interrupted γίνεται True και το Chat προσθέτει την
+απάντηση κανόνων.
+
+Κάθε γύρος καταγράφει το αποτέλεσμά του (llm / fallback / late-llm /
+llm-stalled / llm-error) στη μνήμη (turn_outcomes) και στο llm_turns.csv, για να
+ρυθμίζεται το deadline.
+
+Χρήση:
+    hedge = start_hedged_reply(session_id, mood, sleep, water, text, profile)
+    if hedge.arrived_in_time():
+        llm_output = render_message_stream(hedge.chunks())
+    if not llm_output or hedge.interrupted:
+        ...fallback...
+"""
+import csv
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from datetime import datetime
+from typing import Iterator
+
+from llm import llm_therapeutic_reply_stream
+
+BASE_DIR = os.path.dirname(__file__)
+TURN_LOG_PATH = os.path.join(BASE_DIR, "..", "llm_turns.csv")
+
+LLM_DEADLINE_SECONDS = float(os.environ.get("LLM_DEADLINE_SECONDS", "4.0"))
+LATE_LLM_POLICY = os.environ.get("LATE_LLM_POLICY", "append")  # "append" | "drop"
+# Μέγιστη αναμονή για κάθε επόμενο κομμάτι, αφού ξεκινήσει το stream
+LLM_STALL_SECONDS = float(os.environ.get("LLM_STALL_SECONDS", "8.0"))
+
+OUTCOME_LLM = "llm"
+OUTCOME_FALLBACK = "fallback"
+OUTCOME_LATE_LLM = "late-llm"
+OUTCOME_STALLED = "llm-stalled"
+OUTCOME_ERROR = "llm-error"
+
+_outcomes: deque[dict] = deque(maxlen=500)
+_outcomes_lock = threading.Lock()
+
+# Καθυστερημένες απαντήσεις που περιμένουν το επόμενο rerun, ανά session
+_late_replies: dict[str, list[str]] = {}
+_late_lock = threading.Lock()
+
+_DONE = object()
+
+
+def record_outcome(
+    turn_id: str, outcome: str, latency_ms: float, deadline_ms: float, path: str | None = TURN_LOG_PATH
+) -> None:
+    row = {
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "turn_id": turn_id,
+        "outcome": outcome,
+        "latency_ms": round(latency_ms, 1),
+        "deadline_ms": round(deadline_ms, 1),
+    }
+    with _outcomes_lock:
+        _outcomes.append(row)
+        if path:
+            file_exists = os.path.isfile(path)
+            with open(path, mode="a", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=list(row))
+                if not file_exists:
+                    writer.writeheader()
+                writer.writerow(row)
+
+
+def turn_outcomes() -> list[dict]:
+    """
+    Οι πιο πρόσφατοι γύροι (ο τελευταίος στο τέλος).
+    """
+    with _outcomes_lock:
+        return list(_outcomes)
+
+
+def outcome_summary() -> dict:
+    """
+    Πλήθος γύρων ανά αποτέλεσμα (llm / fallback / late-llm / llm-stalled / llm-error).
+    """
+    return dict(Counter(row["outcome"] for row in turn_outcomes()))
+
+
+def pop_late_replies(session_id: str) -> list[str]:
+    """
+    Οι καθυστερημένες απαντήσεις LLM που έφτασαν για το session
+    (και αφαιρούνται, ώστε να προστεθούν μία φορά).
+    """
+    with _late_lock:
+        return _late_replies.pop(session_id, [])
+
+
+class HedgedReply:
+    """
+    Ένας γύρος απάντησης: το stream του LLM τρέχει σε worker thread και
+    γεμίζει μια ουρά· ο caller περιμένει το πρώτο κομμάτι έως το deadline.
+    """
+
+    def __init__(self, session_id: str, stream: Iterator[str], deadline_s: float,
+                 late_policy: str, log_path: str | None, stall_s: float = LLM_STALL_SECONDS,
+                 status: dict | None = None):
+        self.turn_id = uuid.uuid4().hex[:12]
+        self.session_id = session_id
+        self.deadline_s = deadline_s
+        self.late_policy = late_policy
+        self.log_path = log_path
+        self.stall_s = stall_s
+        self.started = time.perf_counter()
+        # True αν το chunks() σταμάτησε πριν το τέλος της απάντησης
+        self.interrupted = False
+        # {"error": ...} αν το stream κόπηκε (το γεμίζει το stream ή το _run)
+        self.status = {} if status is None else status
+
+        self._queue: queue.Queue = queue.Queue()
+        self._first: str | None = None
+        self._parts: list[str] = []
+        self._lock = threading.Lock()
+        self._done = False
+        self._abandoned = False
+        # Ένα daemon thread ανά γύρο (όχι κοινό pool): ένα κολλημένο stream
+        # δεν καθυστερεί τους γύρους άλλων sessions, και το πλήθος τους το
+        # φράζουν ήδη το όριο αιτημάτων και το connection pool του client
+        threading.Thread(target=self._run, args=(stream,), daemon=True,
+                         name=f"llm-hedge-{self.turn_id}").start()
+
+    def _elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def _run(self, stream: Iterator[str]) -> None:
+        try:
+            for chunk in stream:
+                self._parts.append(chunk)
+                self._queue.put(chunk)
+        except Exception as exc:
+            self.status["error"] = repr(exc)
+        finally:
+            self._queue.put(_DONE)
+        with self._lock:
+            self._done = True
+            abandoned = self._abandoned
+        if abandoned:
+            self._deliver_late()
+
+    def _deliver_late(self) -> None:
+        text = "".join(self._parts)
+        if not text:
+            return
+        record_outcome(self.turn_id, OUTCOME_LATE_LLM, self._elapsed_ms(),
+                       self.deadline_s * 1000, self.log_path)
+        if self.late_policy == "append":
+            with _late_lock:
+                _late_replies.setdefault(self.session_id, []).append(text)
+
+    def arrived_in_time(self) -> bool:
+        """
+        Περιμένει το πρώτο κομμάτι έως το deadline.
+        True → το LLM προλαβαίνει (outcome "llm"), συνέχεια με chunks().
+        False → fallback· αν το LLM απλώς αργεί, συνεχίζει στο παρασκήνιο.
+        """
+        remaining = self.deadline_s - (time.perf_counter() - self.started)
+        try:
+            item = self._queue.get(timeout=max(0.0, remaining))
+        except queue.Empty:
+            item = None
+
+        if item is not None and item is not _DONE:
+            self._first = item
+            record_outcome(self.turn_id, OUTCOME_LLM, self._elapsed_ms(),
+                           self.deadline_s * 1000, self.log_path)
+            return True
+
+        record_outcome(self.turn_id, OUTCOME_FALLBACK, self._elapsed_ms(),
+                       self.deadline_s * 1000, self.log_path)
+        if item is None:
+            with self._lock:
+                self._abandoned = True
+                done = self._done
+            if done:
+                self._deliver_late()
+        return False
+
+    def chunks(self) -> Iterator[str]:
+        """
+        Το πρώτο κομμάτι και όσα ακολουθούν, καθώς φτάνουν.
+        """
+        if self._first is None:
+            return
+        yield self._first
+        while True:
+            try:
+                item = self._queue.get(timeout=self.stall_s)
+            except queue.Empty:
+                # Το υπόλοιπο (αν έρθει ποτέ) δεν εμφανίζεται ούτε ως καθυστερημένο
+                self.interrupted = True
+                record_outcome(self.turn_id, OUTCOME_STALLED, self._elapsed_ms(),
+                               self.deadline_s * 1000, self.log_path)
+                return
+            if item is _DONE:
+                # Κομμένο stream: ό,τι ήρθε μένει, αλλά δεν είναι ολόκληρη απάντηση
+                if self.status.get("error"):
+                    self.interrupted = True
+                    record_outcome(self.turn_id, OUTCOME_ERROR, self._elapsed_ms(),
+                                   self.deadline_s * 1000, self.log_path)
+                return
+            yield item
+
+
+def start_hedged_reply(
+    session_id: str,
+    mood: int,
+    sleep: str,
+    water: str,
+    user_text: str,
+    profile: dict | None,
+    deadline_s: float | None = None,
+    late_policy: str | None = None,
+    log_path: str | None = TURN_LOG_PATH,
+    context: list[dict] | None = None,
+    stall_s: float | None = None,
+) -> HedgedReply:
+    """
+    Ξεκινά το αίτημα στο LLM στο παρασκήνιο και επιστρέφει αμέσως.
+    Αν το session έχει ξεπεράσει το όριο αιτημάτων, ο γύρος πέφτει
+    αμέσως στο fallback (δεν περιμένει το deadline).
+    """
+    status: dict = {}
+    stream = llm_therapeutic_reply_stream(
+        mood, sleep, water, user_text, profile, session_id=session_id, context=context,
+        status=status,
+    )
+    return HedgedReply(
+        session_id,
+        stream,
+        LLM_DEADLINE_SECONDS if deadline_s is None else deadline_s,
+        LATE_LLM_POLICY if late_policy is None else late_policy,
+        log_path,
+        LLM_STALL_SECONDS if stall_s is None else stall_s,
+        status,
+    )
@@ -0,0 +1,163 @@
+# app/keyword_matcher.py
+"""
+Ένας κοινός matcher λέξεων-κλειδιών για όλους τους κανόνες.
+Κάθε μήνυμα κανονικοποιείται μία φορά και ελέγχεται για όλες τις έννοιες.
+
+Δύο τρόποι σάρωσης, με ίδιο αποτέλεσμα:
+- substring: ένα `pattern in text` ανά stem. Κάθε έλεγχος τρέχει σε C,
+  οπότε με λίγα patterns είναι ο γρηγορότερος σε κάθε μήκος μηνύματος.
+- αυτόματο Aho–Corasick: ένα πέρασμα σε Python, με κόστος ανεξάρτητο
+  από το πλήθος των patterns.
+Και τα δύο κοστίζουν γραμμικά στο μήκος του κειμένου, άρα το ποιος
+κερδίζει εξαρτάται από το πλήθος των patterns, όχι από το μήκος:
+το αυτόματο χρησιμοποιείται από KEYWORD_AUTOMATON_MIN_PATTERNS και πάνω
+(βλ. benchmarks/bench_keyword_matcher.py).
+
+Το κείμενο και τα stems περνούν από το text_normalization (χωρίς τόνους,
+τελικό ς → σ, Greeklish → ελληνικά), άρα κάθε stem γράφεται μία φορά.
+
+Χρήση:
+    concepts = match_concepts(text)
+    if "anxiety" in concepts: ...
+"""
+from collections import deque
+
+from text_normalization import normalize_phrase, normalize_text
+
+# Από τόσα patterns και πάνω η σάρωση γίνεται με το αυτόματο (σημείο
+# ισορροπίας με τα `in` checks ~140 patterns σε CPython 3.11)
+KEYWORD_AUTOMATON_MIN_PATTERNS = 150
+
+# Έννοια → stems. Ταιριάζουν ως substrings του κανονικοποιημένου κειμένου.
+CONCEPT_KEYWORDS: dict[str, list[str]] = {
+    # rules.py / emotional_map.py
+    "anxiety": ["άγχ"],
+    "fear": ["φοβ"],
+    "pressure": ["πίεσ", "πιεζ"],
+    "many": ["πολλά"],
+    "sadness": ["θλίψ", "στεναχ", "λύπη"],
+    "loneliness": ["μοναξ"],
+    "tiredness": ["κουράσ", "εξαντ"],
+    "hope": ["ελπί"],
+    # (οι φράσεις κρίσης ζουν στο crisis_detector, με fuzzy ταίριασμα)
+    # app.py (πλάνα δράσης)
+    "stress": ["στρες"],
+    "study": [
+        "σπουδ", "σχολή", "πανεπιστ", "πανεπηστ", "εξετάσ",
+        "εργασί", "μάθημα", "διάβασμα",
+    ],
+    "sleep": [
+        "ύπν", "ξενύχτ", "αϋπν",
+        "δεν κοιμήθηκα",
+        "δυσκολεύομαι να κοιμηθώ",
+    ],
+}
+
+
+class KeywordMatcher:
+    """
+    Τα κανονικοποιημένα patterns ανά έννοια, και το αυτόματο Aho–Corasick
+    τους: trie + failure links. Κάθε κατάσταση κρατά το σύνολο των εννοιών
+    που τελειώνουν εκεί (μαζί με όσες κληρονομεί από τα failure links).
+    Με use_automaton=None ο τρόπος σάρωσης διαλέγεται από το πλήθος των
+    patterns (KEYWORD_AUTOMATON_MIN_PATTERNS).
+    """
+
+    def __init__(self, concept_keywords: dict[str, list[str]], use_automaton: bool | None = None):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+
+        # (pattern, έννοια) για τη σάρωση με substrings
+        self._patterns = [
+            (pattern, concept)
+            for concept, patterns in concept_keywords.items()
+            for pattern in dict.fromkeys(map(normalize_phrase, patterns))
+        ]
+        if use_automaton is None:
+            use_automaton = len(self._patterns) >= KEYWORD_AUTOMATON_MIN_PATTERNS
+        self.use_automaton = use_automaton
+
+        outputs: list[set[str]] = [set()]
+        for pattern, concept in self._patterns:
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outputs.append(set())
+                state = nxt
+            outputs[state].add(concept)
+
+        # BFS για failure links
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                outputs[nxt] |= outputs[self._fail[nxt]]
+
+        # Πλήρης πίνακας μεταβάσεων (DFA): στη σάρωση δεν ακολουθούμε
+        # failure links, κάθε χαρακτήρας είναι ένα dict lookup.
+        # Χαρακτήρες που λείπουν από το dict οδηγούν στη ρίζα.
+        self._delta: list[dict[str, int]] = [dict(self._goto[0])]
+        order = list(deque(self._goto[0].values()))
+        self._delta.extend({} for _ in range(len(self._goto) - 1))
+        for state in order:
+            order.extend(self._goto[state].values())
+            delta = dict(self._delta[self._fail[state]])
+            delta.update(self._goto[state])
+            self._delta[state] = {ch: nxt for ch, nxt in delta.items() if nxt}
+
+        self._out = [frozenset(o) for o in outputs]
+        self.concepts = frozenset(concept_keywords)
+
+    def scan(self, text: str) -> frozenset[str]:
+        """
+        Οι έννοιες του (ήδη κανονικοποιημένου) κειμένου, με τον τρόπο
+        σάρωσης που ταιριάζει στο πλήθος των patterns.
+        """
+        if self.use_automaton:
+            return self.scan_automaton(text)
+        return self.scan_substrings(text)
+
+    def scan_substrings(self, text: str) -> frozenset[str]:
+        """
+        Ένα `in` ανά pattern· παραλείπονται τα patterns εννοιών που ήδη βρέθηκαν.
+        """
+        found: set[str] = set()
+        for pattern, concept in self._patterns:
+            if concept not in found and pattern in text:
+                found.add(concept)
+        return frozenset(found)
+
+    def scan_automaton(self, text: str) -> frozenset[str]:
+        """
+        Ένα πέρασμα του αυτομάτου πάνω στο κείμενο.
+        """
+        delta, out = self._delta, self._out
+        found: set[str] = set()
+        state = 0
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if out[state]:
+                found |= out[state]
+        return frozenset(found)
+
+
+MATCHER = KeywordMatcher(CONCEPT_KEYWORDS)
+
+
+def match_concepts(text: str) -> frozenset[str]:
+    """
+    Επιστρέφει τα ids των εννοιών που εμφανίζονται στο μήνυμα.
+    Το αποτέλεσμα περνιέται σε όλους τους κανόνες, ώστε το κείμενο
+    να κανονικοποιείται και να σαρώνεται μία μόνο φορά.
+    """
+    return MATCHER.scan(normalize_text(text).text)
@@ -0,0 +1,270 @@
+# app/language_router.py
+"""
+Γρήγορη αναγνώριση γλώσσας (ελληνικά / αγγλικά / Greeklish) και δρομολόγηση
+κάθε μηνύματος στον σωστό αναλυτή συναισθήματος.
+
+Το DistilBERT SST-2 είναι μόνο αγγλικό: σε ελληνικό κείμενο ξοδεύει CPU και
+δίνει θόρυβο. Εδώ:
+
+- "el"        : ελληνική γραφή → λεξικό (analyze_lexicon_sentiment)
+- "greeklish" : λατινικοί χαρακτήρες, ελληνική γλώσσα → μεταγραφή σε
+                ελληνικά (normalize_text) → λεξικό
+- "en"        : αγγλικά → transformer (analyze_sentiment)
+
+Η γραφή κρίνεται από τα bytes του UTF-8 (τα ελληνικά γράμματα ξεκινούν με
+0xCE/0xCF). Για λατινικό κείμενο, αγγλικά vs Greeklish κρίνονται με naive
+Bayes πάνω σε τριγράμματα χαρακτήρων: κάθε τρίγραμμα a–z/κενό είναι ένας
+δείκτης 0..27³−1, οπότε τα προφίλ είναι δύο πίνακες log-πιθανοτήτων
+(float16, ~77 KB συνολικά) και η βαθμολόγηση ένα gather + sum στο NumPy
+(μικροδευτερόλεπτα). Τα προφίλ χτίζονται μία φορά στη φόρτωση του πόρου:
+το Greeklish από τους όρους του λεξικού και συχνές ελληνικές λέξεις,
+μεταγραμμένα με τους συνηθισμένους τρόπους γραφής· τα αγγλικά από ένα
+μικρό ενσωματωμένο σώμα κειμένων.
+
+Κάθε απόφαση καταγράφεται (πλήθος ανά διαδρομή, χρόνος αναγνώρισης και
+ανάλυσης ανά διαδρομή).
+
+Χρήση:
+    router = resources.get("language_router")
+    router.detect("eimai poly kourasmenh")   # "greeklish"
+    route_sentiment("I feel great today")
+    # {"label": "POSITIVE", "score": 1.0, "language": "en", "analyzer": "transformer"}
+"""
+import threading
+import time
+from collections import Counter, deque
+from typing import Callable
+
+import numpy as np
+
+import resources
+from lexicon_artifact import STEM_KEY_PREFIX
+from lexicon_sentiment import analyze_lexicon_sentiment, get_lexicon, polarity_margin
+from sentiment import analyze_sentiment
+
+LANG_GREEK = "el"
+LANG_ENGLISH = "en"
+LANG_GREEKLISH = "greeklish"
+
+ANALYZER_LEXICON = "lexicon"
+ANALYZER_TRANSFORMER = "transformer"
+
+ROUTES = {
+    LANG_GREEK: ANALYZER_LEXICON,
+    LANG_GREEKLISH: ANALYZER_LEXICON,
+    LANG_ENGLISH: ANALYZER_TRANSFORMER,
+}
+
+ALPHABET = 27                  # κενό (ό,τι δεν είναι a–z) + 26 γράμματα
+N_TRIGRAMS = ALPHABET ** 3
+SMOOTHING = 0.5                # add-k smoothing των μετρήσεων
+LATENCY_WINDOW = 1_000         # πόσοι πρόσφατοι χρόνοι κρατιούνται ανά διαδρομή
+
+# Byte → κωδικός 0..26 (μόνο a–z· κεφαλαία, ψηφία, στίξη και bytes μη-ASCII → 0)
+_CODES = np.zeros(256, dtype=np.int32)
+_CODES[np.frombuffer(b"abcdefghijklmnopqrstuvwxyz", dtype=np.uint8)] = np.arange(1, ALPHABET)
+
+# Lead bytes του UTF-8 για τα ελληνικά γράμματα (U+0380–U+03FF): 0xCE και 0xCF
+_GREEK_LEAD_BYTE = 0xCF
+
+# Ελληνικά → Greeklish. Κάθε γράμμα με τις συνηθισμένες γραφές του· το προφίλ
+# μαθαίνει από όλες τις παραλλαγές (η πρώτη είναι η πιο συχνή).
+GREEKLISH_SPELLINGS = {
+    "α": ("a",), "β": ("v", "b"), "γ": ("g",), "δ": ("d",), "ε": ("e",),
+    "ζ": ("z",), "η": ("i", "h"), "θ": ("th",), "ι": ("i",), "κ": ("k",),
+    "λ": ("l",), "μ": ("m",), "ν": ("n",), "ξ": ("ks", "x"), "ο": ("o",),
+    "π": ("p",), "ρ": ("r",), "σ": ("s",), "τ": ("t",), "υ": ("y", "u"),
+    "φ": ("f",), "χ": ("x", "ch"), "ψ": ("ps",), "ω": ("o", "w"),
+}
+
+# Συχνές λέξεις καθημερινών μηνυμάτων (το λεξικό έχει κυρίως όρους συναισθήματος)
+GREEK_SEED = """
+είμαι είσαι είναι είμαστε είστε ήμουν ήταν έχω έχεις έχει έχουμε είχα
+και αλλά ή όμως γιατί επειδή που πως ότι αν να θα δεν μην μη ούτε ναι όχι
+εγώ εσύ αυτός αυτή αυτό εμείς μου σου του της μας σας τους με σε από για
+το τα τον την τη τις οι ο η ένα μια ένας στο στη στην στον στα στις
+πολύ λίγο πάρα τόσο καθόλου λες σαν κάπως κάτι τίποτα όλα όλοι κανείς
+σήμερα χθες αύριο τώρα μετά πριν πάντα ποτέ συνέχεια ακόμα ήδη πάλι
+νιώθω νομίζω θέλω μπορώ ξέρω πάω πήγα κάνω έκανα βλέπω λέω μιλάω δουλεύω
+κοιμήθηκα κοιμάμαι ξύπνησα τρώω έφαγα διαβάζω γράφω περπάτησα γυμναστική
+καλά καλή καλός κακά χάλια έτσι εντάξει τέλεια ωραία άσχημα χειρότερα
+μέρα νύχτα βράδυ πρωί εβδομάδα δουλειά σχολή σχολείο σπίτι οικογένεια
+φίλοι φίλους φίλη μαμά μπαμπάς αδερφός αδερφή σύντροφος εξετάσεις μάθημα
+ύπνος νερό φαγητό καφές χρόνος ώρα ώρες ζωή πράγματα σκέψεις μυαλό καρδιά
+κουρασμένος κουρασμένη άγχος αγχωμένος αγχωμένη στενοχωρημένος λυπημένη
+χαρούμενος χαρούμενη μόνος μόνη θυμωμένος θυμωμένη ήρεμος ήρεμη
+ευχαριστώ γεια σου καλημέρα καληνύχτα τι κάνεις πώς είσαι
+"""
+
+# Μικρό σώμα αγγλικών μηνυμάτων για το αγγλικό προφίλ
+ENGLISH_SEED = """
+I am feeling really tired today and I do not know why.
+I had a great day with my friends and we laughed a lot.
+My exams are coming and I feel anxious and stressed all the time.
+I could not sleep last night, my mind would not stop thinking.
+Work has been overwhelming this week but I am trying to cope.
+I feel lonely in the evenings since I moved to a new city.
+Thank you for listening, it helps to talk about it.
+I went for a walk by the sea and it calmed me down.
+Everything feels pointless lately and I have no energy.
+I am proud of myself because I finished my project on time.
+My family is worried about me and I do not want to upset them.
+I drank enough water and ate well, so I feel much better.
+Sometimes I get angry for no reason and then I feel guilty.
+I miss my friends, we have not seen each other for months.
+Today was okay, not great, not terrible, just an ordinary day.
+I want to feel happy again and enjoy the little things.
+The weather is nice and I finally have some time for myself.
+I think I need help but I am afraid to ask for it.
+what should I do, how can I feel better, why is this happening to me
+the and to of a in is it you that he was for on are with as his they
+be at one have this from or had by hot word but what some we can out
+other were all there when up use your how said an each she which do
+their time if will way about many then them write would like so these
+her long make thing see him two has look more day could go come did
+my sound no most number who over know water than call first people may
+down side been now find any new work part take get place made live
+where after back little only round man year came show every good me give
+our under name very through just form sentence great think say help low
+line differ turn cause much mean before move right boy old too same tell
+does set three want air well also play small end put home read hand
+happy sad angry scared worried excited stressed anxious lonely bored
+love hate feel feeling felt tired sleepy hungry calm relaxed upset hurt
+"""
+
+
+def trigram_ids(text: str) -> tuple[np.ndarray, int]:
+    """
+    (δείκτες τριγραμμάτων a–z/κενό, πλήθος ελληνικών γραμμάτων).
+    Αγνοούνται τα τρίγραμμα με κενό στη μέση (όρια λέξεων χωρίς πληροφορία).
+    """
+    raw = np.frombuffer((" " + text.lower() + " ").encode("utf-8"), dtype=np.uint8)
+    greek = np.count_nonzero((raw | 1) == _GREEK_LEAD_BYTE)
+    codes = _CODES[raw]
+    ids = (codes[:-2] * ALPHABET + codes[1:-1]) * ALPHABET + codes[2:]
+    return ids[codes[1:-1] > 0], greek
+
+
+def greeklish_variants(word: str) -> list[str]:
+    """
+    Οι δύο πιο χαρακτηριστικές μεταγραφές μιας (folded) ελληνικής λέξης:
+    με την πιο συχνή γραφή κάθε γράμματος και με την εναλλακτική.
+    """
+    word = word.replace("ου", "ou")
+    common = "".join(GREEKLISH_SPELLINGS.get(ch, (ch,))[0] for ch in word)
+    alternative = "".join(GREEKLISH_SPELLINGS.get(ch, (ch,))[-1] for ch in word)
+    return [common] if alternative == common else [common, alternative]
+
+
+def _log_profile(texts: list[str]) -> np.ndarray:
+    counts = np.zeros(N_TRIGRAMS, dtype=np.float64)
+    for text in texts:
+        counts += np.bincount(trigram_ids(text)[0], minlength=N_TRIGRAMS)
+    probs = (counts + SMOOTHING) / (counts.sum() + SMOOTHING * N_TRIGRAMS)
+    return np.log(probs).astype(np.float16)
+
+
+def build_profiles() -> np.ndarray:
+    """
+    Πίνακας (2, 27³) float16 με log-πιθανότητες τριγραμμάτων:
+    γραμμή 0 = αγγλικά, γραμμή 1 = Greeklish.
+    """
+    from text_normalization import fold
+
+    lexicon = get_lexicon()
+    greek_words = [fold(w) for w in GREEK_SEED.split()]
+    greek_words += [
+        term for term in (lexicon.term(i) for i in range(len(lexicon)))
+        if not term.startswith(STEM_KEY_PREFIX)
+    ]
+    greeklish = [" ".join(v for w in greek_words for v in greeklish_variants(w))]
+    return np.stack([_log_profile(ENGLISH_SEED.splitlines()), _log_profile(greeklish)])
+
+
+class LanguageRouter:
+    def __init__(
+        self,
+        profiles: np.ndarray | None = None,
+        lexicon_analyzer: Callable[[str], dict] = analyze_lexicon_sentiment,
+        transformer: Callable[[str], dict] = analyze_sentiment,
+    ):
+        self.profiles = build_profiles() if profiles is None else profiles
+        # log P(Greeklish) − log P(αγγλικά) ανά τρίγραμμα: ένα gather + sum ανά μήνυμα
+        self._log_odds = self.profiles[1].astype(np.float32) - self.profiles[0].astype(np.float32)
+        self.lexicon_analyzer = lexicon_analyzer
+        self.transformer = transformer
+
+        self._routes: Counter[str] = Counter()
+        self._detect_us: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._analyze_ms: dict[str, deque[float]] = {
+            lang: deque(maxlen=LATENCY_WINDOW) for lang in ROUTES
+        }
+        self._lock = threading.Lock()
+
+    def detect(self, text: str) -> str:
+        ids, greek = trigram_ids(text)
+        # ids.size = πλήθος λατινικών γραμμάτων (ένα τρίγραμμο με κέντρο το καθένα)
+        if greek >= ids.size or ids.size == 0:
+            return LANG_GREEK
+        return LANG_GREEKLISH if self._log_odds[ids].sum() > 0 else LANG_ENGLISH
+
+    def _lexicon(self, text: str) -> dict:
+        result = self.lexicon_analyzer(text)
+        return {"label": result["label"].upper(), "score": round(0.5 + polarity_margin(result) / 2, 2)}
+
+    def route(self, text: str) -> dict:
+        """
+        Συναίσθημα του μηνύματος από τον αναλυτή της γλώσσας του.
+        Επιστρέφει {"label", "score", "language", "analyzer"}· με το λεξικό
+        το label μπορεί να είναι και "NEUTRAL".
+        """
+        start = time.perf_counter()
+        language = self.detect(text)
+        detected = time.perf_counter()
+
+        analyzer = ROUTES[language]
+        if analyzer == ANALYZER_TRANSFORMER:
+            result = self.transformer(text)
+        else:
+            # Το normalize_text του λεξικού μεταγράφει ήδη το Greeklish σε ελληνικά
+            result = self._lexicon(text)
+        done = time.perf_counter()
+
+        with self._lock:
+            self._routes[language] += 1
+            self._detect_us.append((detected - start) * 1e6)
+            self._analyze_ms[language].append((done - detected) * 1000)
+        return {**result, "language": language, "analyzer": analyzer}
+
+    def stats(self) -> dict:
+        with self._lock:
+            detect_us = list(self._detect_us)
+            analyze_ms = {lang: list(times) for lang, times in self._analyze_ms.items()}
+            routes = dict(self._routes)
+
+        def _p(values, q):
+            return round(float(np.percentile(values, q)), 3) if values else None
+
+        return {
+            "routes": routes,
+            "detect_p50_us": _p(detect_us, 50),
+            "detect_p95_us": _p(detect_us, 95),
+            "analyze_ms": {
+                lang: {"p50": _p(times, 50), "p95": _p(times, 95)}
+                for lang, times in analyze_ms.items() if times
+            },
+        }
+
+
+resources.register("language_router", LanguageRouter)
+
+
+def detect_language(text: str) -> str:
+    return resources.get("language_router").detect(text)
+
+
+def route_sentiment(text: str) -> dict:
+    """
+    Συναίσθημα μηνύματος με δρομολόγηση ανά γλώσσα (βλ. LanguageRouter.route).
+    """
+    return resources.get("language_router").route(text)
@@ -0,0 +1,365 @@
+# app/lexicon_artifact.py
+"""
+Μεταγλώττιση του greek_sentiment_lexicon.tsv σε δυαδικό artifact (.glex)
+που φορτώνεται με mmap. Όλες οι διεργασίες του Streamlit μοιράζονται
+το ίδιο read-only αντίγραφο από το page cache του λειτουργικού.
+
+Build χειροκίνητα:
+    python app/lexicon_artifact.py
+"""
+import csv
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+
+import numpy as np
+
+from text_normalization import normalize_token, stem
+
+BASE_DIR = os.path.dirname(__file__)
+LEXICON_TSV = os.path.join(BASE_DIR, "greek_sentiment_lexicon.tsv")
+LEXICON_ARTIFACT = os.path.join(BASE_DIR, "greek_sentiment_lexicon.glex")
+
+MAGIC = b"GLEX"
+# Αλλάζει και όταν αλλάζουν οι κανόνες του text_normalization,
+# ώστε τα παλιά artifacts να ξαναχτιστούν.
+FORMAT_VERSION = 4
+
+EMOTIONS = ["Anger", "Disgust", "Fear", "Happiness", "Sadness", "Surprise"]
+ANNOTATORS = 4
+# Κλίμακα έντασης των annotators (1 = καθόλου, 5 = πολύ έντονα)
+INTENSITY_MIN, INTENSITY_MAX = 1.0, 5.0
+
+# Τα κλειδιά των stems έχουν πρόθεμα, ώστε ένα token να μη βρίσκει
+# ποτέ stem άλλης λέξης με ακριβή αναζήτηση (π.χ. «και» ≠ stem του «καίω»).
+STEM_KEY_PREFIX = "~"
+
+# Κωδικοί πολικότητας (στήλες Polarity1..4 του TSV)
+POLARITY_CODES = {"POS": 1, "NEG": -1, "BOTH": 0}
+# Τιμή υποκειμενικότητας (στήλες Subjectivity1..4) για «αντικειμενικός όρος»
+OBJECTIVE = "OBJ"
+
+# magic, version, n_emotions, sha256(TSV), n_terms, n_slots, strings_len
+_HEADER = struct.Struct("<4sHH32sIII")
+_ALIGN = 8
+_MISSING = {"", "N/A", "NA"}
+
+
+# ============================================================
+#                 ΟΡΟΙ ΛΕΞΙΚΟΥ
+# ============================================================
+
+def _expand_term(term: str) -> list[str]:
+    """
+    Τα επίθετα του λεξικού έχουν τη μορφή «όμορφος -η -ο».
+    Επιστρέφει όλους τους τύπους (όμορφος, όμορφη, όμορφο).
+    Όροι πολλών λέξεων χωρίς καταλήξεις (φράσεις) και πρόθεμα όπως «παρα-»
+    αγνοούνται, αφού η αναζήτηση γίνεται ανά ολόκληρη λέξη.
+    """
+    parts = [p for p in term.replace("/", " ").split() if p]
+    if not parts or parts[0].endswith("-"):
+        return []
+    base, endings = parts[0], parts[1:]
+    if any(not e.startswith("-") for e in endings):
+        return []
+
+    forms = [base]
+    for ending in endings:
+        ending = ending.lstrip("-")
+        if ending:
+            forms.append(base[:-2] + ending)
+    return forms
+
+
+# ============================================================
+#                 BUILD
+# ============================================================
+
+def tsv_hash(tsv_path: str = LEXICON_TSV) -> bytes:
+    with open(tsv_path, "rb") as f:
+        return hashlib.sha256(f.read()).digest()
+
+
+def _answers(row: dict, column: str) -> list[str]:
+    """
+    Οι απαντήσεις των annotators σε μια στήλη (Column1..ColumnN), χωρίς τα N/A.
+    """
+    values = ((row.get(f"{column}{i}") or "").strip() for i in range(1, ANNOTATORS + 1))
+    return [v for v in values if v.upper() not in _MISSING]
+
+
+def _is_subjective(row: dict) -> bool:
+    """
+    Συναίνεση στο Subjectivity: υποκειμενικός όρος όταν οι περισσότεροι από
+    όσους απάντησαν δεν τον έκριναν αντικειμενικό (OBJ). Σε ισοπαλία
+    αποφασίζει ο πρώτος annotator, όπως πριν από τη συναίνεση.
+    """
+    answers = [v.upper() for v in _answers(row, "Subjectivity")]
+    objective = answers.count(OBJECTIVE)
+    if 2 * objective != len(answers):
+        return 2 * objective < len(answers)
+    return (row.get("Subjectivity1") or "").strip().upper() != OBJECTIVE
+
+
+def _consensus_polarity(row: dict) -> int | None:
+    """
+    Κωδικός πολικότητας από τη συναίνεση των annotators: το πρόσημο του
+    μέσου όρου των κωδικών όσων απάντησαν (ισοπαλία → BOTH, 0).
+    None για αντικειμενικούς όρους (_is_subjective) και όταν κανείς δεν
+    έδωσε πολικότητα.
+    """
+    votes = [POLARITY_CODES.get(v.upper(), 0) for v in _answers(row, "Polarity")]
+    if not votes or not _is_subjective(row):
+        return None
+    total = sum(votes)
+    return (total > 0) - (total < 0)
+
+
+def _read_rows(tsv_path: str):
+    """
+    Διαβάζει το TSV με το csv module (χωρίς pandas).
+    Επιστρέφει (όρος, κωδικός πολικότητας, εντάσεις συναισθημάτων).
+    Όλες οι τιμές βγαίνουν από τη συναίνεση των annotators: η πολικότητα
+    από τις Polarity/Subjectivity (_consensus_polarity) και η ένταση κάθε
+    συναισθήματος ως μέσος όρος όσων απάντησαν, κανονικοποιημένη στο [0, 1]·
+    NaN όταν κανείς δεν έδωσε τιμή (N/A).
+    Οι αντικειμενικοί όροι και όσοι δεν έχουν πολικότητα παραλείπονται.
+    """
+    with open(tsv_path, encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f, delimiter="\t")
+        for row in reader:
+            term = (row.get("Term") or "").strip()
+            polarity = _consensus_polarity(row)
+            if not term or polarity is None:
+                continue
+
+            intensities = []
+            for emotion in EMOTIONS:
+                values = [float(v) for v in _answers(row, emotion)]
+                if values:
+                    consensus = sum(values) / len(values)
+                    intensities.append(
+                        (consensus - INTENSITY_MIN) / (INTENSITY_MAX - INTENSITY_MIN)
+                    )
+                else:
+                    intensities.append(np.nan)
+
+            yield term, polarity, intensities
+
+
+def _pad(buf: bytearray) -> None:
+    buf.extend(b"\0" * (-len(buf) % _ALIGN))
+
+
+def compile_lexicon(tsv_path: str = LEXICON_TSV) -> bytes:
+    """
+    Μεταγλωττίζει το TSV σε bytes του artifact:
+    header | hash table (int32) | offsets όρων (uint32) |
+    πολικότητα (int8) | εντάσεις (float32, 0 όπου N/A) |
+    μάσκα N/A (uint8) | όροι (utf-8)
+
+    Κλειδιά είναι οι κανονικοποιημένοι τύποι (normalize_token) και τα
+    stems τους (με STEM_KEY_PREFIX), ώστε π.χ. το «φόβο» να βρίσκει το «φόβος».
+    """
+    terms: list[bytes] = []
+    polarity: list[int] = []
+    emotions: list[list[float]] = []
+    seen: set[str] = set()
+    entries = [
+        (normalize_token(form), code, intensities)
+        for term, code, intensities in _read_rows(tsv_path)
+        for form in _expand_term(term)
+    ]
+
+    stems = [(STEM_KEY_PREFIX + stem(k), c, i) for k, c, i in entries]
+
+    for key, code, intensities in entries + stems:
+        if key in seen:
+            continue
+        seen.add(key)
+        terms.append(key.encode("utf-8"))
+        polarity.append(code)
+        emotions.append(intensities)
+
+    n_terms = len(terms)
+    n_slots = 1
+    while n_slots < 2 * n_terms:
+        n_slots *= 2
+
+    # Open addressing με crc32 (ντετερμινιστικό σε όλες τις διεργασίες)
+    slots = np.full(n_slots, -1, dtype="<i4")
+    for term_id, key in enumerate(terms):
+        i = zlib.crc32(key) & (n_slots - 1)
+        while slots[i] >= 0:
+            i = (i + 1) & (n_slots - 1)
+        slots[i] = term_id
+
+    offsets = np.zeros(n_terms + 1, dtype="<u4")
+    offsets[1:] = np.cumsum([len(t) for t in terms])
+    strings = b"".join(terms)
+
+    matrix = np.asarray(emotions, dtype="<f4").reshape(n_terms, len(EMOTIONS))
+    missing = np.isnan(matrix)
+
+    buf = bytearray(_HEADER.pack(
+        MAGIC, FORMAT_VERSION, len(EMOTIONS), tsv_hash(tsv_path),
+        n_terms, n_slots, len(strings),
+    ))
+    for section in (
+        slots.tobytes(),
+        offsets.tobytes(),
+        np.asarray(polarity, dtype="i1").tobytes(),
+        np.where(missing, 0, matrix).astype("<f4").tobytes(),
+        missing.astype("u1").tobytes(),
+        strings,
+    ):
+        _pad(buf)
+        buf.extend(section)
+    return bytes(buf)
+
+
+def build_artifact(tsv_path: str = LEXICON_TSV, artifact_path: str = LEXICON_ARTIFACT) -> str:
+    """
+    Γράφει το artifact ατομικά (temp αρχείο + os.replace), ώστε όσες
+    διεργασίες έχουν ήδη ανοιχτό το παλιό να μη δουν μισογραμμένο αρχείο.
+    """
+    data = compile_lexicon(tsv_path)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(artifact_path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, artifact_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return artifact_path
+
+
+# ============================================================
+#                 LOAD
+# ============================================================
+
+class LexiconArtifact:
+    """
+    Read-only προβολή πάνω στα bytes του artifact (mmap ή bytes).
+    Οι πίνακες είναι zero-copy views, δεν αντιγράφεται τίποτα ανά διεργασία.
+    """
+
+    def __init__(self, data):
+        view = memoryview(data)
+        magic, version, n_emotions, digest, n_terms, n_slots, strings_len = (
+            _HEADER.unpack_from(view)
+        )
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("Μη συμβατό lexicon artifact")
+
+        self.data = data
+        self.tsv_sha256 = digest
+        self.n_terms = n_terms
+        self.emotions = EMOTIONS[:n_emotions]
+
+        pos = _HEADER.size
+
+        def section(nbytes: int) -> memoryview:
+            nonlocal pos
+            pos += -pos % _ALIGN
+            chunk = view[pos:pos + nbytes]
+            pos += nbytes
+            return chunk
+
+        self._slots = section(4 * n_slots).cast("i")
+        self._offsets = section(4 * (n_terms + 1)).cast("I")
+        polarity = section(n_terms)
+        self._polarity = polarity.cast("b")
+        self.polarity = np.frombuffer(polarity, dtype="i1")
+        # Πίνακας όρων × συναισθημάτων: οι τιμές N/A είναι 0 στο
+        # emotion_values και True στο emotion_missing, ώστε ένα
+        # gather-and-sum να μη χρειάζεται έλεγχο για NaN.
+        self.emotion_values = np.frombuffer(
+            section(4 * n_terms * n_emotions), dtype="<f4"
+        ).reshape(n_terms, n_emotions)
+        self.emotion_missing = np.frombuffer(
+            section(n_terms * n_emotions), dtype="?"
+        ).reshape(n_terms, n_emotions)
+        self._strings = section(strings_len)
+        self._mask = n_slots - 1
+
+    @property
+    def emotion_matrix(self) -> np.ma.MaskedArray:
+        """
+        Masked view (χωρίς αντιγραφή δεδομένων) του πίνακα συναισθημάτων.
+        """
+        return np.ma.MaskedArray(self.emotion_values, mask=self.emotion_missing, copy=False)
+
+    def __len__(self) -> int:
+        return self.n_terms
+
+    def term(self, term_id: int) -> str:
+        return bytes(self._strings[self._offsets[term_id]:self._offsets[term_id + 1]]).decode("utf-8")
+
+    def polarity_code(self, term_id: int) -> int:
+        return self._polarity[term_id]
+
+    def lookup(self, key: str) -> int:
+        """
+        Επιστρέφει το id ενός ήδη κανονικοποιημένου όρου (normalize_token) ή -1.
+        """
+        raw = key.encode("utf-8")
+        slots, offsets, strings = self._slots, self._offsets, self._strings
+        i = zlib.crc32(raw) & self._mask
+        while True:
+            term_id = slots[i]
+            if term_id < 0:
+                return -1
+            if strings[offsets[term_id]:offsets[term_id + 1]] == raw:
+                return term_id
+            i = (i + 1) & self._mask
+
+    def find(self, key: str) -> int:
+        """
+        Όπως το lookup, αλλά αν ο ακριβής τύπος λείπει δοκιμάζει το stem του
+        (μόνο αν το token είχε όντως κατάληξη που αφαιρέθηκε).
+        """
+        term_id = self.lookup(key)
+        if term_id < 0:
+            key_stem = stem(key)
+            if key_stem != key:
+                term_id = self.lookup(STEM_KEY_PREFIX + key_stem)
+        return term_id
+
+
+def _map_file(path: str) -> mmap.mmap:
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def load_artifact(tsv_path: str = LEXICON_TSV, artifact_path: str = LEXICON_ARTIFACT) -> LexiconArtifact:
+    """
+    Φορτώνει το artifact με mmap. Αν λείπει, είναι παλιάς έκδοσης ή το hash
+    του TSV έχει αλλάξει, ξαναχτίζεται αυτόματα. Αν ο φάκελος δεν είναι
+    εγγράψιμος, χρησιμοποιείται ένα αντίγραφο στη μνήμη.
+    """
+    digest = tsv_hash(tsv_path)
+
+    if os.path.exists(artifact_path):
+        try:
+            artifact = LexiconArtifact(_map_file(artifact_path))
+            if artifact.tsv_sha256 == digest:
+                return artifact
+        except (ValueError, TypeError, struct.error):
+            pass
+
+    try:
+        build_artifact(tsv_path, artifact_path)
+    except OSError:
+        return LexiconArtifact(compile_lexicon(tsv_path))
+    return LexiconArtifact(_map_file(artifact_path))
+
+
+if __name__ == "__main__":
+    path = build_artifact()
+    artifact = load_artifact()
+    print(f"{path}: {len(artifact)} όροι, {os.path.getsize(path)} bytes, v{FORMAT_VERSION}")
@@ -1,22 +1,135 @@
-import pandas as pd
+from functools import lru_cache
+from itertools import chain
+
+import numpy as np
+
+import resources
+from lexicon_artifact import (
+    EMOTIONS,
+    LEXICON_TSV,
+    LEXICON_ARTIFACT,
+    load_artifact,
+    tsv_hash,
+)
+from text_normalization import MESSAGE_CACHE_SIZE, normalize_text, normalize_token, tokenize
+
+# Κωδικοί πολικότητας του artifact → ετικέτες που επιστρέφουμε
+POLARITY_LABELS = {
+    1: "positive",
+    -1: "negative",
+    0: "neutral",
+}
+
+# Το λεξικό (mmap του μεταγλωττισμένου artifact) φορτώνεται στην πρώτη χρήση
+resources.register("lexicon", load_artifact)
+
+
+def get_lexicon():
+    """
+    Το τρέχον LexiconArtifact (αλλάζει μετά από reload_lexicon).
+    """
+    return resources.get("lexicon")
+
+
+def reload_lexicon(tsv_path: str = LEXICON_TSV, artifact_path: str = LEXICON_ARTIFACT) -> bool:
+    """
+    Hot-reload hook: αν το TSV άλλαξε, ξαναχτίζει το artifact και
+    αντικαθιστά το λεξικό χωρίς restart. Η αντικατάσταση είναι μία
+    ανάθεση αναφοράς, οπότε κλήσεις σε εξέλιξη τελειώνουν με το παλιό.
+    Επιστρέφει True αν φορτώθηκε νέο λεξικό.
+    """
+    if get_lexicon().tsv_sha256 == tsv_hash(tsv_path):
+        return False
+
+    resources.replace("lexicon", load_artifact(tsv_path, artifact_path))
+    return True
+
+
+def _term_id(lexicon, token: str) -> int:
+    """
+    Id όρου για ένα token: πρώτα ο κανονικοποιημένος τύπος, μετά το stem του.
+    """
+    return lexicon.find(normalize_token(token))
+
+
+def lookup_tokens(tokens) -> list[str | None]:
+    """
+    Επιστρέφει την ετικέτα κάθε token (ή None αν δεν υπάρχει στο λεξικό).
+    """
+    lexicon = get_lexicon()
+    labels: list[str | None] = []
+    for tok in tokens:
+        term_id = _term_id(lexicon, tok)
+        labels.append(POLARITY_LABELS[lexicon.polarity_code(term_id)] if term_id >= 0 else None)
+    return labels
+
+
+def term_ids(tokens) -> np.ndarray:
+    """
+    Αντιστοιχίζει tokens σε ids όρων του λεξικού (-1 αν δεν υπάρχουν).
+    """
+    lexicon = get_lexicon()
+    return np.fromiter(
+        (_term_id(lexicon, tok) for tok in tokens),
+        dtype=np.int64,
+        count=len(tokens),
+    )
+
+
+@lru_cache(maxsize=MESSAGE_CACHE_SIZE)
+def _message_term_ids(tsv_sha256: str, text: str) -> np.ndarray:
+    ids = term_ids(normalize_text(text).tokens)
+    ids.setflags(write=False)
+    return ids
+
+
+def message_term_ids(text: str) -> np.ndarray:
+    """
+    Ids όρων των tokens ενός μηνύματος (-1 αν δεν υπάρχουν), σε cache ανά
+    μήνυμα και έκδοση λεξικού: πολικότητα, συναισθήματα και tags του
+    χάρτη ψάχνουν τους όρους του ίδιου μηνύματος μία μόνο φορά.
+    """
+    return _message_term_ids(get_lexicon().tsv_sha256, text)
+
+
+def emotion_vector(text: str) -> np.ndarray:
+    """
+    Διάνυσμα συναισθημάτων του μηνύματος (σειρά όπως το EMOTIONS):
+    ένα gather-and-sum των εντάσεων [0, 1] των όρων που βρέθηκαν.
+    Οι τιμές N/A μετράνε ως 0.
+    """
+    lexicon = get_lexicon()
+    ids = message_term_ids(text)
+    return lexicon.emotion_values[ids[ids >= 0]].sum(axis=0)
+
+
+def analyze_lexicon_emotions(text: str) -> dict:
+    """
+    Μέση ένταση κάθε συναισθήματος στους όρους του μηνύματος που
+    βρέθηκαν στο λεξικό. Ο μέσος όρος υπολογίζεται μόνο πάνω στους
+    όρους που έχουν τιμή (οι N/A είναι masked).
+    Επιστρέφει {"emotions": {συναίσθημα: ένταση}, "matched": πλήθος όρων}.
+    """
+    lexicon = get_lexicon()
+    ids = message_term_ids(text)
+    matched = ids[ids >= 0]
+
+    # Άθροισμα σε float64, ώστε να συμφωνεί ακριβώς με το batch (np.bincount)
+    totals = lexicon.emotion_values[matched].sum(axis=0, dtype=np.float64)
+    counts = (~lexicon.emotion_missing[matched]).sum(axis=0)
+    means = np.divide(totals, counts, out=np.zeros_like(totals), where=counts > 0)
+
+    return {
+        "emotions": {emotion: float(v) for emotion, v in zip(EMOTIONS, means)},
+        "matched": int(matched.size),
+    }
 
-# Φόρτωση λεξικού
-df = pd.read_csv("app/greek_sentiment_lexicon.tsv", sep="\t")
-df = df[["Term", "Polarity1"]].dropna()
-df.columns = ["word", "polarity"]
 
 def analyze_lexicon_sentiment(text: str) -> dict:
-    words = text.lower().split()
-    pos, neg = 0, 0
-
-    for word in words:
-        match = df[df["word"] == word]
-        if not match.empty:
-            polarity = match["polarity"].values[0]
-            if polarity.lower() == "positive":
-                pos += 1
-            elif polarity.lower() == "negative":
-                neg += 1
+    ids = message_term_ids(text)
+    polarity = get_lexicon().polarity[ids[ids >= 0]]
+    pos = int(np.count_nonzero(polarity == 1))
+    neg = int(np.count_nonzero(polarity == -1))
 
     if pos > neg:
         label = "positive"
@@ -30,4 +143,95 @@ def analyze_lexicon_sentiment(text: str) -> dict:
         "negative": neg,
         "score": pos - neg,
         "label": label
-    }
\ No newline at end of file
+    }
+
+
+def polarity_margin(result: dict) -> float:
+    """
+    Πόσο καθαρή είναι η πολικότητα ενός αποτελέσματος του
+    analyze_lexicon_sentiment: |θετικοί − αρνητικοί| / (θετικοί + αρνητικοί),
+    0 αν δεν βρέθηκε κανένας όρος.
+    """
+    matched = result["positive"] + result["negative"]
+    return abs(result["score"]) / matched if matched else 0.0
+
+
+def analyze_lexicon_sentiment_batch(texts):
+    """
+    Batch εκδοχή του analyze_lexicon_sentiment για list ή pd.Series.
+    Κάθε διαφορετικό token αναζητείται μία μόνο φορά και οι μετρήσεις
+    γίνονται με διανυσματικές πράξεις NumPy.
+    Επιστρέφει DataFrame με στήλες positive/negative/score/label,
+    ευθυγραμμισμένο με την είσοδο (ίδιο index αν δοθεί Series).
+    """
+    import pandas as pd  # μόνο εδώ, για να μη βαραίνει το import του module
+
+    index = texts.index if isinstance(texts, pd.Series) else None
+    token_lists = [tokenize(t) if isinstance(t, str) else [] for t in texts]
+    n = len(token_lists)
+
+    lengths = np.fromiter(map(len, token_lists), dtype=np.int64, count=n)
+    flat = list(chain.from_iterable(token_lists))
+
+    # Ένα πέρασμα: μοναδικά tokens → ids όρων → κωδικοί πολικότητας
+    lexicon = get_lexicon()
+    vocab = {tok: i for i, tok in enumerate(dict.fromkeys(flat))}
+    vocab_ids = term_ids(list(vocab))
+    vocab_polarity = np.where(
+        vocab_ids >= 0, lexicon.polarity[np.maximum(vocab_ids, 0)], 0
+    )
+    polarity = vocab_polarity[
+        np.fromiter((vocab[tok] for tok in flat), dtype=np.int64, count=len(flat))
+    ]
+
+    owner = np.repeat(np.arange(n), lengths)
+    pos = np.bincount(owner, weights=polarity == 1, minlength=n).astype(np.int64)
+    neg = np.bincount(owner, weights=polarity == -1, minlength=n).astype(np.int64)
+
+    return pd.DataFrame(
+        {
+            "positive": pos,
+            "negative": neg,
+            "score": pos - neg,
+            "label": np.where(pos > neg, "positive", np.where(neg > pos, "negative", "neutral")),
+        },
+        index=index,
+    )
+
+
+def analyze_lexicon_emotions_batch(texts):
+    """
+    Batch εκδοχή του analyze_lexicon_emotions για list ή pd.Series.
+    Επιστρέφει DataFrame με μία στήλη ανά συναίσθημα (μέση ένταση)
+    και τη στήλη "matched", ευθυγραμμισμένο με την είσοδο.
+    """
+    import pandas as pd  # μόνο εδώ, για να μη βαραίνει το import του module
+
+    index = texts.index if isinstance(texts, pd.Series) else None
+    token_lists = [tokenize(t) if isinstance(t, str) else [] for t in texts]
+    n = len(token_lists)
+
+    lengths = np.fromiter(map(len, token_lists), dtype=np.int64, count=n)
+    flat = list(chain.from_iterable(token_lists))
+
+    lexicon = get_lexicon()
+    vocab = {tok: i for i, tok in enumerate(dict.fromkeys(flat))}
+    vocab_ids = term_ids(list(vocab))
+    ids = vocab_ids[
+        np.fromiter((vocab[tok] for tok in flat), dtype=np.int64, count=len(flat))
+    ]
+
+    owner = np.repeat(np.arange(n), lengths)
+    hit = ids >= 0
+    owner, ids = owner[hit], ids[hit]
+
+    values = lexicon.emotion_values[ids]
+    present = ~lexicon.emotion_missing[ids]
+    columns = {}
+    for e, emotion in enumerate(EMOTIONS):
+        totals = np.bincount(owner, weights=values[:, e], minlength=n)
+        counts = np.bincount(owner, weights=present[:, e], minlength=n)
+        columns[emotion] = np.divide(totals, counts, out=np.zeros(n), where=counts > 0)
+    columns["matched"] = np.bincount(owner, minlength=n)
+
+    return pd.DataFrame(columns, index=index)
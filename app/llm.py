@@ -1,54 +1,411 @@
+import time
+from collections import deque
+from typing import Iterator
+
 import streamlit as st
-from openai import OpenAI
 
-client = OpenAI(api_key=st.secrets["general"]["openai_api_key"])
+import resources
+from conversation_context import estimate_tokens
+from llm_budget import TEMPLATE_FULL, TEMPLATE_SHORT, GenerationPlan, LatencyController, UsageLedger
+from llm_cache import ResponseCache, cache_key
+from llm_client import ManagedLLMClient, create_openai_client
+from llm_gate import FlightRejected, SessionRateLimiter, SingleFlight
+from semantic_cache import SemanticCache
+
+LLM_MODEL = "gpt-4o-mini"
+LLM_TEMPERATURE = 0.7
+
+# Κλήσεις χωρίς session_id χρεώνονται εδώ
+ANONYMOUS_SESSION = "-"
+
+SYSTEM_PROMPT = (
+    "Είσαι ένας ζεστός, υποστηρικτικός ψηφιακός συνοδοιπόρος "
+    "για φοιτητές/νέους ενήλικες. Δεν κάνεις διαγνώσεις, "
+    "δεν υπόσχεσαι θεραπεία, δεν αντικαθιστάς ψυχολόγο. "
+    "Βοηθάς τον χρήστη να ονομάσει τα συναισθήματά του, "
+    "να τα κανονικοποιήσει και να σκεφτεί πολύ μικρά, ρεαλιστικά βήματα."
+)
+
+
+def _create_client():
+    return ManagedLLMClient(create_openai_client(st.secrets["general"]["openai_api_key"]))
+
+
+resources.register("openai_client", _create_client)
+resources.register("llm_cache", ResponseCache)
+resources.register("llm_rate_limiter", SessionRateLimiter)
+resources.register("semantic_cache", SemanticCache)
+resources.register("latency_controller", LatencyController)
+resources.register("usage_ledger", UsageLedger)
+
+# Ίδια prompts σε εξέλιξη μοιράζονται ένα αίτημα (ξεχωριστά για blocking / stream)
+_reply_flights = SingleFlight()
+_stream_flights = SingleFlight()
+
+
+# Οδηγία μήκους ανά πρότυπο (βλ. llm_budget.LatencyController)
+PROMPT_INSTRUCTIONS = {
+    TEMPLATE_FULL: (
+        "Γράψε μία σύντομη, ζεστή, υποστηρικτική απάντηση 4–7 προτάσεων, "
+        "σε απλά ελληνικά, χωρίς να δίνεις διαγνώσεις ή ιατρικές οδηγίες. "
+        "Χρησιμοποίησε ψυχοεκπαιδευτικό ύφος (CBT/mindfulness), με έμφαση στην αποδοχή, "
+        "στην οριοθέτηση και στα μικρά πρακτικά βήματα."
+    ),
+    TEMPLATE_SHORT: (
+        "Γράψε μία πολύ σύντομη, ζεστή απάντηση 2–3 προτάσεων, σε απλά ελληνικά, "
+        "χωρίς διαγνώσεις ή ιατρικές οδηγίες, με ένα μικρό πρακτικό βήμα."
+    ),
+}
+
+
+def build_user_prompt(
+    mood: int,
+    sleep: str,
+    water: str,
+    user_text: str,
+    profile: dict | None,
+    template: str = TEMPLATE_FULL,
+) -> str:
+    profile_snippet = ""
+    if profile:
+        profile_snippet = (
+            f"\n\n[Πληροφορίες προφίλ]\n"
+            f"Ρόλος: {profile.get('role','-')}\n"
+            f"Βασικό θέμα: {profile.get('main_issue','-')}\n"
+            f"Εστίαση: {profile.get('focus','-')}\n"
+        )
+
+    return (
+        f"[Στοιχεία ημέρας]\n"
+        f"- Διάθεση (0–100): {mood}\n"
+        f"- Ύπνος (ώρες κατηγορία): {sleep}\n"
+        f"- Νερό (ποτήρια κατηγορία): {water}\n"
+        f"- Κείμενο χρήστη: {user_text}\n"
+        f"{profile_snippet}\n"
+        f"{PROMPT_INSTRUCTIONS[template]}"
+    )
+
+
+def build_messages(
+    mood: int,
+    sleep: str,
+    water: str,
+    user_text: str,
+    profile: dict | None,
+    context: list[dict] | None = None,
+    template: str = TEMPLATE_FULL,
+) -> list[dict]:
+    """
+    Όλα τα μηνύματα που στέλνονται: system prompt, το φραγμένο context
+    της συζήτησης (σύνοψη + πρόσφατοι γύροι, βλ. conversation_context)
+    και το τρέχον check-in.
+    """
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        *(context or []),
+        {"role": "user", "content": build_user_prompt(mood, sleep, water, user_text, profile, template)},
+    ]
+
+
+def count_tokens(messages: list[dict]) -> int:
+    """
+    Εκτίμηση των tokens του prompt (χωρίς tokenizer).
+    """
+    return sum(estimate_tokens(m["content"]) for m in messages)
+
+
+def _messages_key(messages: list[dict]) -> str:
+    # Όλο το prompt: κλειδί για τη συνένωση ίδιων αιτημάτων σε εξέλιξη
+    return cache_key(LLM_MODEL, *(m["content"] for m in messages))
+
+
+def _reply_cache_keys(messages: list[dict], session_id: str | None) -> list[str]:
+    """
+    Κλειδιά της cache απαντήσεων, με τη σειρά αναζήτησης: system prompt και
+    τρέχον check-in, χωρίς το context της συζήτησης — οι πρόσφατοι γύροι,
+    τα αποσπάσματα και η σύνοψη (μετράει τα μηνύματα) αλλάζουν σε κάθε
+    γύρο, οπότε με αυτά το ίδιο check-in δεν θα ξανάβρισκε ποτέ την
+    απάντησή του μετά τον πρώτο γύρο.
+    Το πρώτο κλειδί δένεται με το session (ίδιο check-in στο ίδιο session,
+    σε οποιονδήποτε γύρο)· το δεύτερο, κοινό για όλους, μόνο χωρίς context:
+    μια απάντηση που γράφτηκε βλέποντας τα μηνύματα μιας συζήτησης δεν
+    δίνεται σε άλλη.
+    """
+    system, checkin = messages[0]["content"], messages[-1]["content"]
+    keys = []
+    if session_id or len(messages) > 2:
+        keys.append(cache_key(LLM_MODEL, system, f"session:{session_id or ANONYMOUS_SESSION}", checkin))
+    if len(messages) == 2:
+        keys.append(cache_key(LLM_MODEL, system, checkin))
+    return keys
+
+
+def _cached_reply(keys: list[str], mood: int, sleep: str, water: str, user_text: str,
+                  profile: dict | None, context: list[dict] | None) -> str | None:
+    """
+    Πρώτα η cache ακριβούς ταιριάσματος (_reply_cache_keys), μετά η
+    σημασιολογική (σχεδόν ίδιο μήνυμα με ίδια διάθεση/ύπνο/νερό/προφίλ).
+    Η σημασιολογική μοιράζεται ανάμεσα σε συζητήσεις, γι' αυτό
+    χρησιμοποιείται μόνο χωρίς context, δηλαδή στον πρώτο γύρο.
+    """
+    cache = resources.get("llm_cache")
+    for key in keys:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+    if not context:
+        return resources.get("semantic_cache").get(user_text, mood, sleep, water, profile)
+    return None
+
+
+def _store_reply(keys: list[str], mood: int, sleep: str, water: str, user_text: str,
+                 profile: dict | None, context: list[dict] | None, reply: str) -> None:
+    cache = resources.get("llm_cache")
+    for key in keys:
+        cache.put(key, LLM_MODEL, reply)
+    if not context:
+        resources.get("semantic_cache").put(user_text, mood, sleep, water, profile, reply)
+
+
+def _account(session_id: str | None, messages: list[dict], text: str, usage, outcome: dict,
+             ttft_s: float | None, total_s: float) -> None:
+    """
+    Tokens/κόστος του session και μέτρηση για τον LatencyController.
+    Αν το API δεν δώσει usage, τα tokens εκτιμώνται από το κείμενο.
+    """
+    prompt_tokens = getattr(usage, "prompt_tokens", None) or count_tokens(messages)
+    completion_tokens = getattr(usage, "completion_tokens", None) or estimate_tokens(text)
+    outcome.update(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+    resources.get("latency_controller").observe(ttft_s, total_s, completion_tokens)
+    resources.get("usage_ledger").record(session_id or ANONYMOUS_SESSION, prompt_tokens, completion_tokens)
+
+
+def _complete(messages: list[dict], plan: GenerationPlan, session_id: str | None,
+              outcome: dict) -> str | None:
+    start = time.perf_counter()
+    resp = resources.get("openai_client").chat_completion(
+        model=LLM_MODEL,
+        messages=messages,
+        max_tokens=plan.max_tokens,
+        temperature=LLM_TEMPERATURE,
+    )
+    reply = resp.choices[0].message.content
+    outcome["finish_reason"] = resp.choices[0].finish_reason
+    _account(session_id, messages, reply or "", getattr(resp, "usage", None), outcome,
+             None, time.perf_counter() - start)
+    return reply
+
+
+def _complete_stream(messages: list[dict], plan: GenerationPlan, session_id: str | None,
+                     outcome: dict) -> Iterator[str]:
+    start = time.perf_counter()
+    ttft_s = None
+    usage = None
+    parts: list[str] = []
+    stream = resources.get("openai_client").chat_completion(
+        model=LLM_MODEL,
+        messages=messages,
+        max_tokens=plan.max_tokens,
+        temperature=LLM_TEMPERATURE,
+        stream=True,
+        stream_options={"include_usage": True},
+    )
+    for chunk in stream:
+        # Με include_usage το τελευταίο chunk έχει μόνο usage (χωρίς choices)
+        usage = getattr(chunk, "usage", None) or usage
+        if not chunk.choices:
+            continue
+        if chunk.choices[0].finish_reason:
+            outcome["finish_reason"] = chunk.choices[0].finish_reason
+        delta = chunk.choices[0].delta.content
+        if delta:
+            if ttft_s is None:
+                ttft_s = time.perf_counter() - start
+            parts.append(delta)
+            yield delta
+    _account(session_id, messages, "".join(parts), usage, outcome, ttft_s, time.perf_counter() - start)
 
 
-def llm_therapeutic_reply(mood: int, sleep: str, water: str, user_text: str, profile: dict | None):
+def _admit(session_id: str | None):
+    """
+    Το όριο αιτημάτων του session, ως admit του SingleFlight: χρεώνεται
+    μόνο όταν το αίτημα θα φτάσει πράγματι στο API (όχι στους followers).
+    """
+    if session_id is None:
+        return None
+    return lambda: resources.get("llm_rate_limiter").allow(session_id)
+
+
+def _cacheable(outcome: dict) -> bool:
+    """
+    Στην cache μπαίνει μόνο ό,τι έφερε ο ίδιος caller από το API (όχι όσοι
+    συγχωνεύτηκαν στο ίδιο αίτημα) και μόνο αν δεν κόπηκε από το max_tokens.
+    """
+    return bool(outcome) and outcome.get("finish_reason") != "length"
+
+
+def llm_therapeutic_reply(
+    mood: int,
+    sleep: str,
+    water: str,
+    user_text: str,
+    profile: dict | None,
+    use_cache: bool = True,
+    session_id: str | None = None,
+    context: list[dict] | None = None,
+):
     """
     Γεννάει ένα πιο ελεύθερο, ανθρώπινο κείμενο απάντησης.
+    Ίδιο check-in (ίδιο prompt + προφίλ + μοντέλο, στο ίδιο session αν
+    υπάρχει context, βλ. _reply_cache_keys) απαντάται από την cache,
+    και σχεδόν ίδια μηνύματα με την ίδια διάθεση/ύπνο/νερό από τη
+    σημασιολογική cache, εκτός αν use_cache=False· ίδια αιτήματα σε εξέλιξη μοιράζονται μία κλήση.
+    Με session_id εφαρμόζεται το όριο αιτημάτων του session· το context
+    (ConversationContext.messages()) δίνει στο μοντέλο μνήμη της συζήτησης.
+    Τα max_tokens και το πρότυπο του prompt τα διαλέγει ο LatencyController
+    ώστε η κλήση να χωρά στο SLO· tokens και κόστος χρεώνονται στο session.
     Αν κάτι πάει στραβά (API, όριο, κ.λπ.), επιστρέφει None.
     """
     try:
-        profile_snippet = ""
-        if profile:
-            profile_snippet = (
-                f"\n\n[Πληροφορίες προφίλ]\n"
-                f"Ρόλος: {profile.get('role','-')}\n"
-                f"Βασικό θέμα: {profile.get('main_issue','-')}\n"
-                f"Εστίαση: {profile.get('focus','-')}\n"
-            )
-
-        user_prompt = (
-            f"[Στοιχεία ημέρας]\n"
-            f"- Διάθεση (0–100): {mood}\n"
-            f"- Ύπνος (ώρες κατηγορία): {sleep}\n"
-            f"- Νερό (ποτήρια κατηγορία): {water}\n"
-            f"- Κείμενο χρήστη: {user_text}\n"
-            f"{profile_snippet}\n"
-            "Γράψε μία σύντομη, ζεστή, υποστηρικτική απάντηση 4–7 προτάσεων, "
-            "σε απλά ελληνικά, χωρίς να δίνεις διαγνώσεις ή ιατρικές οδηγίες. "
-            "Χρησιμοποίησε ψυχοεκπαιδευτικό ύφος (CBT/mindfulness), με έμφαση στην αποδοχή, "
-            "στην οριοθέτηση και στα μικρά πρακτικά βήματα."
-        )
+        plan = resources.get("latency_controller").plan()
+        messages = build_messages(mood, sleep, water, user_text, profile, context, plan.template)
 
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "Είσαι ένας ζεστός, υποστηρικτικός ψηφιακός συνοδοιπόρος "
-                        "για φοιτητές/νέους ενήλικες. Δεν κάνεις διαγνώσεις, "
-                        "δεν υπόσχεσαι θεραπεία, δεν αντικαθιστάς ψυχολόγο. "
-                        "Βοηθάς τον χρήστη να ονομάσει τα συναισθήματά του, "
-                        "να τα κανονικοποιήσει και να σκεφτεί πολύ μικρά, ρεαλιστικά βήματα."
-                    ),
-                },
-                {"role": "user", "content": user_prompt},
-            ],
-        )
+        keys = _reply_cache_keys(messages, session_id)
+        if use_cache:
+            cached = _cached_reply(keys, mood, sleep, water, user_text, profile, context)
+            if cached is not None:
+                return cached
 
-        return resp.choices[0].message["content"]
+        outcome: dict = {}
+        try:
+            reply = _reply_flights.do(_messages_key(messages),
+                                      lambda: _complete(messages, plan, session_id, outcome),
+                                      admit=_admit(session_id))
+        except FlightRejected:
+            return None
+        if use_cache and reply and _cacheable(outcome):
+            _store_reply(keys, mood, sleep, water, user_text, profile, context, reply)
+        return reply
     except Exception:
         return None
+
+
+# ============================================================
+#              STREAMING
+# ============================================================
+
+# Τελευταίες μετρήσεις streaming (time-to-first-token κ.λπ.)
+_stream_timings: deque[dict] = deque(maxlen=200)
+
+
+def llm_therapeutic_reply_stream(
+    mood: int,
+    sleep: str,
+    water: str,
+    user_text: str,
+    profile: dict | None,
+    use_cache: bool = True,
+    session_id: str | None = None,
+    context: list[dict] | None = None,
+    status: dict | None = None,
+) -> Iterator[str]:
+    """
+    Streaming εκδοχή του llm_therapeutic_reply: δίνει (yield) κομμάτια
+    κειμένου καθώς φτάνουν από το API.
+    Αν κάτι πάει στραβά πριν το πρώτο κομμάτι, δεν δίνει τίποτα (ο caller
+    πέφτει στο rule-based fallback) — το ίδιο κι όταν το session έχει
+    ξεπεράσει το όριο αιτημάτων. Αν κοπεί στη μέση, σταματά και η
+    μερική απάντηση δεν μπαίνει στην cache· αν δοθεί status (dict), το
+    σφάλμα γράφεται στο status["error"], ώστε ο caller να ξέρει ότι η
+    απάντηση έμεινε μισή.
+    Κάθε κλήση καταγράφει time-to-first-token, συνολικό χρόνο, tokens
+    του prompt και το πλάνο του LatencyController (stream_timings()).
+    """
+    start = time.perf_counter()
+    timing = {"ttft_ms": None, "total_ms": None, "chunks": 0, "prompt_tokens": None,
+              "max_tokens": None, "template": None,
+              "cached": False, "rate_limited": False, "error": None}
+    parts: list[str] = []
+    try:
+        plan = resources.get("latency_controller").plan()
+        messages = build_messages(mood, sleep, water, user_text, profile, context, plan.template)
+
+        timing["prompt_tokens"] = count_tokens(messages)
+        timing["max_tokens"] = plan.max_tokens
+        timing["template"] = plan.template
+
+        keys = _reply_cache_keys(messages, session_id)
+        if use_cache:
+            cached = _cached_reply(keys, mood, sleep, water, user_text, profile, context)
+            if cached is not None:
+                timing["cached"] = True
+                timing["ttft_ms"] = (time.perf_counter() - start) * 1000
+                timing["chunks"] = 1
+                yield cached
+                return
+
+        outcome: dict = {}
+        for delta in _stream_flights.stream(
+            _messages_key(messages), lambda: _complete_stream(messages, plan, session_id, outcome),
+            admit=_admit(session_id),
+        ):
+            if timing["ttft_ms"] is None:
+                timing["ttft_ms"] = (time.perf_counter() - start) * 1000
+            timing["chunks"] += 1
+            parts.append(delta)
+            yield delta
+
+        if use_cache and parts and _cacheable(outcome):
+            _store_reply(keys, mood, sleep, water, user_text, profile, context, "".join(parts))
+    except FlightRejected:
+        timing["rate_limited"] = True
+    except Exception as exc:
+        timing["error"] = repr(exc)
+        if status is not None:
+            status["error"] = timing["error"]
+    finally:
+        timing["total_ms"] = (time.perf_counter() - start) * 1000
+        _stream_timings.append(timing)
+
+
+def stream_timings() -> list[dict]:
+    """
+    Οι μετρήσεις των πιο πρόσφατων streaming κλήσεων (η τελευταία στο τέλος).
+    """
+    return list(_stream_timings)
+
+
+def flow_stats() -> dict:
+    """
+    Single-flight (αιτήματα στο API / συγχωνευμένα) και όριο ανά session.
+    """
+    replies, streams = _reply_flights.stats(), _stream_flights.stats()
+    stats = {name: replies[name] + streams[name] for name in replies}
+    if resources.is_loaded("llm_rate_limiter"):
+        stats.update(resources.get("llm_rate_limiter").stats())
+    return stats
+
+
+def llm_metrics() -> dict:
+    """
+    Κατάσταση circuit breaker, μετρητές και percentiles καθυστέρησης
+    του client, μαζί με τα flow_stats() (κενό dict αν ο client δεν έχει
+    φορτωθεί ακόμη).
+    """
+    if not resources.is_loaded("openai_client"):
+        return {}
+    return {**resources.get("openai_client").metrics(), **flow_stats()}
+
+
+def latency_plan() -> dict:
+    """
+    p95 καθυστέρησης, tokens/sec και τρέχον πλάνο (max_tokens, πρότυπο).
+    """
+    return resources.get("latency_controller").snapshot()
+
+
+def session_usage(session_id: str) -> dict:
+    """
+    Tokens και κόστος (USD) του session.
+    """
+    return resources.get("usage_ledger").session(session_id)
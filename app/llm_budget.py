@@ -0,0 +1,171 @@
+# app/llm_budget.py
+"""
+Προσαρμοστικός έλεγχος παραμέτρων παραγωγής και λογιστική tokens/κόστους.
+
+LatencyController: κρατά κινούμενο παράθυρο από τις πρόσφατες κλήσεις
+(time-to-first-token, συνολικός χρόνος, tokens εξόδου) και υπολογίζει
+p95 του TTFT και tokens/sec. Πριν από κάθε κλήση διαλέγει max_tokens και
+πρότυπο prompt ώστε ο εκτιμώμενος χρόνος να χωρά στο SLO του γύρου:
+
+    εκτιμώμενος χρόνος ≈ p95(TTFT) + max_tokens / tokens_per_sec (αργό άκρο)
+
+- Αν χωρά μια πλήρης απάντηση: πρότυπο "full" (4–7 προτάσεις).
+- Αλλιώς: πρότυπο "short" (2–3 προτάσεις) με όσα tokens προλαβαίνουν
+  (όχι λιγότερα από SHORT_MIN_TOKENS, ώστε να μην κόβεται στη μέση).
+
+UsageLedger: tokens εισόδου/εξόδου και κόστος (USD) ανά session.
+
+Χρήση:
+    plan = resources.get("latency_controller").plan()
+    ... chat_completion(max_tokens=plan.max_tokens, ...)
+    controller.observe(ttft_s, total_s, completion_tokens)
+    resources.get("usage_ledger").record(session_id, prompt_tokens, completion_tokens)
+"""
+import os
+import threading
+from collections import OrderedDict, deque
+from typing import NamedTuple
+
+import numpy as np
+
+# SLO: συνολικός χρόνος απάντησης LLM ανά γύρο
+LLM_TURN_SLO_SECONDS = float(os.environ.get("LLM_TURN_SLO_SECONDS", "8.0"))
+
+LLM_MAX_TOKENS = 450          # πλήρης απάντηση 4–7 προτάσεων
+FULL_MIN_TOKENS = 300         # κάτω από αυτό → σύντομο πρότυπο
+SHORT_MIN_TOKENS = 120        # 2–3 προτάσεις χωρίς να κοπούν
+
+CONTROLLER_WINDOW = 50        # πόσες πρόσφατες κλήσεις μετράνε
+CONTROLLER_MIN_SAMPLES = 5    # πριν από αυτές: προεπιλογές
+
+# Τιμές gpt-4o-mini (USD ανά 1M tokens)
+LLM_PRICE_INPUT_PER_1M = float(os.environ.get("LLM_PRICE_INPUT_PER_1M", "0.15"))
+LLM_PRICE_OUTPUT_PER_1M = float(os.environ.get("LLM_PRICE_OUTPUT_PER_1M", "0.60"))
+USAGE_MAX_SESSIONS = 10_000
+
+TEMPLATE_FULL = "full"
+TEMPLATE_SHORT = "short"
+
+
+class GenerationPlan(NamedTuple):
+    max_tokens: int
+    template: str
+    predicted_s: float | None     # εκτιμώμενος χρόνος (None χωρίς αρκετά δείγματα)
+
+
+class LatencyController:
+    def __init__(
+        self,
+        slo_seconds: float = LLM_TURN_SLO_SECONDS,
+        window: int = CONTROLLER_WINDOW,
+        min_samples: int = CONTROLLER_MIN_SAMPLES,
+        max_tokens: int = LLM_MAX_TOKENS,
+    ):
+        self.slo_seconds = slo_seconds
+        self.min_samples = min_samples
+        self.max_tokens = max_tokens
+        self._ttft: deque[float] = deque(maxlen=window)
+        self._total: deque[float] = deque(maxlen=window)
+        self._tps: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, ttft_s: float | None, total_s: float, completion_tokens: int) -> None:
+        """
+        Μία ολοκληρωμένη κλήση στο API. Χωρίς TTFT (blocking κλήση) μετράει
+        μόνο ο συνολικός χρόνος.
+        """
+        with self._lock:
+            self._total.append(total_s)
+            if ttft_s is None:
+                return
+            self._ttft.append(ttft_s)
+            generation_s = total_s - ttft_s
+            if completion_tokens > 1 and generation_s > 0:
+                self._tps.append((completion_tokens - 1) / generation_s)
+
+    def _stats(self) -> tuple[float, float] | None:
+        if len(self._ttft) < self.min_samples or len(self._tps) < self.min_samples:
+            return None
+        ttft_p95 = float(np.percentile(self._ttft, 95))
+        # Το αργό άκρο του ρυθμού (5ο percentile) = p95 του χρόνου ανά token
+        tps_slow = float(np.percentile(self._tps, 5))
+        return ttft_p95, tps_slow
+
+    def plan(self) -> GenerationPlan:
+        with self._lock:
+            stats = self._stats()
+        if stats is None:
+            return GenerationPlan(self.max_tokens, TEMPLATE_FULL, None)
+
+        ttft_p95, tps_slow = stats
+        affordable = int(max(0.0, self.slo_seconds - ttft_p95) * tps_slow)
+        if affordable >= FULL_MIN_TOKENS:
+            max_tokens, template = min(affordable, self.max_tokens), TEMPLATE_FULL
+        else:
+            max_tokens, template = max(SHORT_MIN_TOKENS, affordable), TEMPLATE_SHORT
+        return GenerationPlan(max_tokens, template, round(ttft_p95 + max_tokens / tps_slow, 2))
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stats = self._stats()
+            total_p95 = float(np.percentile(self._total, 95)) if self._total else None
+            samples = len(self._total)
+        plan = self.plan()
+        return {
+            "slo_s": self.slo_seconds,
+            "samples": samples,
+            "latency_p95_s": None if total_p95 is None else round(total_p95, 2),
+            "ttft_p95_s": None if stats is None else round(stats[0], 2),
+            "tokens_per_s_slow": None if stats is None else round(stats[1], 1),
+            "max_tokens": plan.max_tokens,
+            "template": plan.template,
+            "predicted_s": plan.predicted_s,
+        }
+
+
+def cost_usd(prompt_tokens: int, completion_tokens: int) -> float:
+    return (prompt_tokens * LLM_PRICE_INPUT_PER_1M + completion_tokens * LLM_PRICE_OUTPUT_PER_1M) / 1e6
+
+
+class UsageLedger:
+    """
+    Tokens και κόστος ανά session (έως max_sessions, LRU).
+    """
+
+    def __init__(self, max_sessions: int = USAGE_MAX_SESSIONS):
+        self.max_sessions = max_sessions
+        self._sessions: OrderedDict[str, dict] = OrderedDict()
+        self._totals = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0}
+        self._lock = threading.Lock()
+
+    def record(self, session_id: str, prompt_tokens: int, completion_tokens: int) -> None:
+        cost = cost_usd(prompt_tokens, completion_tokens)
+        with self._lock:
+            usage = self._sessions.get(session_id)
+            if usage is None:
+                usage = self._sessions[session_id] = {
+                    "calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0,
+                }
+                if len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            else:
+                self._sessions.move_to_end(session_id)
+            for totals in (usage, self._totals):
+                totals["calls"] += 1
+                totals["prompt_tokens"] += prompt_tokens
+                totals["completion_tokens"] += completion_tokens
+                totals["cost_usd"] += cost
+
+    def session(self, session_id: str) -> dict:
+        with self._lock:
+            usage = dict(self._sessions.get(session_id) or
+                         {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0})
+        usage["cost_usd"] = round(usage["cost_usd"], 6)
+        return usage
+
+    def totals(self) -> dict:
+        with self._lock:
+            totals = dict(self._totals)
+        totals["cost_usd"] = round(totals["cost_usd"], 6)
+        totals["sessions"] = len(self._sessions)
+        return totals
@@ -0,0 +1,139 @@
+# app/llm_cache.py
+"""
+Μόνιμη (SQLite) cache απαντήσεων του LLM.
+
+Κλειδί: sha256 του κανονικοποιημένου prompt (system + user, που περιέχει
+και το απόσπασμα του προφίλ) και του ονόματος του μοντέλου. Έτσι ένα
+διπλό κλικ στο «Αποστολή» ή το ίδιο check-in δεν ξαναχτυπά το API.
+
+- TTL: εγγραφές παλαιότερες από ttl_seconds θεωρούνται miss και σβήνονται.
+- LRU: πάνω από max_entries, σβήνονται όσες χρησιμοποιήθηκαν λιγότερο πρόσφατα.
+- Μετρητές hits / misses / expired / evictions ανά διεργασία (stats()).
+
+Χρήση:
+    cache = resources.get("llm_cache")
+    key = cache_key(model, system_prompt, user_prompt)
+    reply = cache.get(key)
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+BASE_DIR = os.path.dirname(__file__)
+LLM_CACHE_PATH = os.path.join(BASE_DIR, "..", "llm_cache.sqlite3")
+LLM_CACHE_TTL_SECONDS = 24 * 3600
+LLM_CACHE_MAX_ENTRIES = 5_000
+
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    Συντηρητική κανονικοποίηση: κενά και πεζά. Τόνοι και αριθμοί μένουν,
+    γιατί αλλάζουν το νόημα (π.χ. «Διάθεση: 30» vs «Διάθεση: 90»).
+    """
+    return " ".join(prompt.split()).casefold()
+
+
+def cache_key(model: str, *prompts: str) -> str:
+    h = hashlib.sha256(model.encode("utf-8"))
+    for prompt in prompts:
+        h.update(b"\x00")
+        h.update(normalize_prompt(prompt).encode("utf-8"))
+    return h.hexdigest()
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        path: str = LLM_CACHE_PATH,
+        ttl_seconds: float = LLM_CACHE_TTL_SECONDS,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+        # Μία σύνδεση για όλη τη διεργασία (τα reruns του Streamlit τρέχουν
+        # σε διαφορετικά threads), με lock γύρω από κάθε πράξη.
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_last_access ON responses(last_access)"
+        )
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            response, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self.hits += 1
+            return response
+
+    def put(self, key: str, model: str, response: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, model, response, now, now),
+            )
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+            if count > self.max_entries:
+                cur = self._conn.execute(
+                    """
+                    DELETE FROM responses WHERE key IN (
+                        SELECT key FROM responses ORDER BY last_access LIMIT ?
+                    )
+                    """,
+                    (count - self.max_entries,),
+                )
+                self.evictions += cur.rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "expired": self.expired,
+            "evictions": self.evictions,
+        }
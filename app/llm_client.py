@@ -0,0 +1,252 @@
+# app/llm_client.py
+"""
+Διαχειριζόμενος client για το OpenAI API:
+
+- ρητό connection pool με keep-alive (httpx), ώστε τα αιτήματα να μην
+  ανοίγουν νέα TLS σύνδεση κάθε φορά,
+- timeout ανά κλήση,
+- περιορισμένα retries με exponential backoff και jitter, μόνο για
+  σφάλματα που αξίζει να ξαναδοκιμαστούν (σύνδεση, timeout, 429, 5xx),
+- circuit breaker: όταν το ποσοστό σφαλμάτων είναι υψηλό, το LLM
+  παρακάμπτεται εντελώς (άμεσο fallback) και μετά από cooldown
+  στέλνεται ένα δοκιμαστικό αίτημα (με δικό του timeout, ώστε ένα χαμένο
+  δοκιμαστικό να μην κρατά τον breaker σε half-open για πάντα).
+
+Η κατάσταση του breaker και τα percentiles καθυστέρησης φαίνονται με metrics().
+
+Χρήση:
+    client = ManagedLLMClient(create_openai_client(api_key))
+    resp = client.chat_completion(model=..., messages=[...])
+"""
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Iterator
+
+# Connection pool / keep-alive
+LLM_MAX_CONNECTIONS = 10
+LLM_MAX_KEEPALIVE_CONNECTIONS = 5
+LLM_KEEPALIVE_EXPIRY_SECONDS = 30.0
+
+# Timeouts ανά κλήση
+LLM_CONNECT_TIMEOUT_SECONDS = 3.0
+LLM_TIMEOUT_SECONDS = 20.0
+
+# Retries
+LLM_MAX_RETRIES = 2
+LLM_BACKOFF_BASE_SECONDS = 0.25
+LLM_BACKOFF_MAX_SECONDS = 2.0
+
+# Circuit breaker
+BREAKER_WINDOW = 20            # πόσες πρόσφατες κλήσεις μετράνε
+BREAKER_MIN_CALLS = 5          # κάτω από αυτές δεν ανοίγει ποτέ
+BREAKER_ERROR_RATE = 0.5       # ποσοστό σφαλμάτων που τον ανοίγει
+BREAKER_COOLDOWN_SECONDS = 30.0
+# Δοκιμαστικό αίτημα σε half-open που δεν ανέφερε αποτέλεσμα (π.χ. stream
+# που δεν διαβάστηκε ποτέ ούτε έκλεισε): μετά από τόσο περνά νέο δοκιμαστικό
+BREAKER_PROBE_TIMEOUT_SECONDS = 60.0
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Ο breaker είναι ανοιχτός: το αίτημα δεν στάλθηκε καθόλου."""
+
+
+def create_openai_client(api_key: str, base_url: str | None = None):
+    """
+    OpenAI client πάνω σε httpx.Client με ρητά όρια pool και keep-alive.
+    Τα retries του SDK απενεργοποιούνται· τα κάνει ο ManagedLLMClient.
+    """
+    import httpx
+    from openai import OpenAI
+
+    http_client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=LLM_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        timeout=httpx.Timeout(LLM_TIMEOUT_SECONDS, connect=LLM_CONNECT_TIMEOUT_SECONDS),
+    )
+    return OpenAI(api_key=api_key, base_url=base_url, http_client=http_client, max_retries=0)
+
+
+def is_retryable(exc: Exception) -> bool:
+    import openai
+
+    return isinstance(
+        exc,
+        (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError),
+    )
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        window: int = BREAKER_WINDOW,
+        min_calls: int = BREAKER_MIN_CALLS,
+        error_rate: float = BREAKER_ERROR_RATE,
+        cooldown_seconds: float = BREAKER_COOLDOWN_SECONDS,
+        probe_timeout_seconds: float = BREAKER_PROBE_TIMEOUT_SECONDS,
+    ):
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.cooldown_seconds = cooldown_seconds
+        self.probe_timeout_seconds = probe_timeout_seconds
+        self.state = STATE_CLOSED
+        self.opened_at: float | None = None
+        self._results: deque[bool] = deque(maxlen=window)
+        self._probe_in_flight = False
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        Αν επιτρέπεται αίτημα τώρα. Σε half-open περνά ένα μόνο δοκιμαστικό·
+        αν δεν αναφέρει αποτέλεσμα μέσα σε probe_timeout_seconds, περνά νέο.
+        """
+        with self._lock:
+            if self.state == STATE_OPEN:
+                if time.monotonic() - self.opened_at < self.cooldown_seconds:
+                    return False
+                self.state = STATE_HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == STATE_HALF_OPEN:
+                now = time.monotonic()
+                if self._probe_in_flight and now - self._probe_started < self.probe_timeout_seconds:
+                    return False
+                self._probe_in_flight = True
+                self._probe_started = now
+            return True
+
+    def record(self, success: bool) -> None:
+        with self._lock:
+            if self.state == STATE_HALF_OPEN:
+                self._probe_in_flight = False
+                if success:
+                    self.state = STATE_CLOSED
+                    self._results.clear()
+                else:
+                    self._open()
+                return
+
+            self._results.append(success)
+            failures = self._results.count(False)
+            if (
+                len(self._results) >= self.min_calls
+                and failures / len(self._results) >= self.error_rate
+            ):
+                self._open()
+
+    def _open(self) -> None:
+        self.state = STATE_OPEN
+        self.opened_at = time.monotonic()
+        self._results.clear()
+
+    def error_rate_now(self) -> float | None:
+        with self._lock:
+            if not self._results:
+                return None
+            return self._results.count(False) / len(self._results)
+
+
+class ManagedLLMClient:
+    def __init__(
+        self,
+        client: Any,
+        timeout: float = LLM_TIMEOUT_SECONDS,
+        max_retries: int = LLM_MAX_RETRIES,
+        breaker: CircuitBreaker | None = None,
+    ):
+        self.client = client
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.breaker = breaker or CircuitBreaker()
+
+        self._latencies: deque[float] = deque(maxlen=500)
+        self._counts = {"calls": 0, "successes": 0, "failures": 0, "retries": 0, "short_circuited": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: τυχαία αναμονή στο [0, min(max, base · 2^attempt)]
+        return random.uniform(0, min(LLM_BACKOFF_MAX_SECONDS, LLM_BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+    def chat_completion(self, timeout: float | None = None, **kwargs):
+        """
+        client.chat.completions.create με timeout, retries και breaker.
+        Με stream=True επιστρέφει iterator· σφάλμα στη μέση του stream
+        μετράει κι αυτό ως αποτυχία στον breaker.
+        """
+        if not self.breaker.allow():
+            self._count("short_circuited")
+            raise CircuitOpenError("LLM circuit breaker is open")
+
+        self._count("calls")
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                resp = self.client.chat.completions.create(
+                    timeout=timeout or self.timeout, **kwargs
+                )
+                break
+            except Exception as exc:
+                if attempt >= self.max_retries or not is_retryable(exc):
+                    self._finish(start, success=False)
+                    raise
+                self._count("retries")
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+
+        if kwargs.get("stream"):
+            return self._watch_stream(resp, start)
+        self._finish(start, success=True)
+        return resp
+
+    def _watch_stream(self, stream, start: float) -> Iterator:
+        # Αν ο caller σταματήσει νωρίτερα (GeneratorExit), δεν είναι σφάλμα του API
+        success = True
+        try:
+            yield from stream
+        except Exception:
+            success = False
+            raise
+        finally:
+            self._finish(start, success=success)
+
+    def _finish(self, start: float, success: bool) -> None:
+        with self._lock:
+            self._latencies.append((time.perf_counter() - start) * 1000)
+            self._counts["successes" if success else "failures"] += 1
+        self.breaker.record(success)
+
+    def metrics(self) -> dict:
+        """
+        Κατάσταση breaker, μετρητές και percentiles καθυστέρησης (ms).
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+            counts = dict(self._counts)
+
+        def pct(p: float) -> float | None:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 1)
+
+        error_rate = self.breaker.error_rate_now()
+        return {
+            "breaker_state": self.breaker.state,
+            "breaker_error_rate": None if error_rate is None else round(error_rate, 3),
+            **counts,
+            "latency_p50_ms": pct(0.50),
+            "latency_p95_ms": pct(0.95),
+            "latency_p99_ms": pct(0.99),
+        }
@@ -0,0 +1,210 @@
+# app/llm_gate.py
+"""
+Έλεγχος ροής μπροστά από το LLM, για bursty φορτίο:
+
+- Single-flight: ίδια prompts (ίδιο κανονικοποιημένο hash, βλ. llm_cache.cache_key)
+  που είναι ήδη σε εξέλιξη μοιράζονται ένα αίτημα στο API· όσοι έρθουν
+  ενώ τρέχει παίρνουν το ίδιο αποτέλεσμα (ή τα ίδια κομμάτια του stream).
+- Token bucket ανά session: κάθε αίτημα που φτάνει στο API καταναλώνει
+  ένα token (όσοι συγχωνεύονται σε αίτημα σε εξέλιξη δεν χρεώνονται).
+  Όταν δεν υπάρχει token, το αίτημα δεν μπαίνει σε ουρά· ο caller πέφτει
+  αμέσως στην απάντηση κανόνων.
+
+Χρήση:
+    limiter = resources.get("llm_rate_limiter")
+    try:
+        reply = flight.do(key, lambda: call_api(...), admit=lambda: limiter.allow(session_id))
+    except FlightRejected:
+        return None
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Iterator
+
+# Token bucket: έως LLM_RATE_BURST αιτήματα αμέσως, μετά LLM_RATE_PER_MINUTE ανά λεπτό
+LLM_RATE_BURST = int(os.environ.get("LLM_RATE_BURST", "3"))
+LLM_RATE_PER_MINUTE = float(os.environ.get("LLM_RATE_PER_MINUTE", "6"))
+LLM_RATE_MAX_SESSIONS = 10_000
+
+
+class TokenBucket:
+    def __init__(self, capacity: float, refill_per_second: float, clock: Callable[[], float] = time.monotonic):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.clock = clock
+        self.tokens = float(capacity)
+        self.updated = clock()
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_second)
+        self.updated = now
+        if self.tokens < tokens:
+            return False
+        self.tokens -= tokens
+        return True
+
+
+class SessionRateLimiter:
+    """
+    Ένα token bucket ανά session. Κρατά έως max_sessions buckets·
+    τα λιγότερο πρόσφατα χρησιμοποιημένα σβήνονται (ξαναρχίζουν γεμάτα).
+    """
+
+    def __init__(
+        self,
+        burst: int = LLM_RATE_BURST,
+        per_minute: float = LLM_RATE_PER_MINUTE,
+        max_sessions: int = LLM_RATE_MAX_SESSIONS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.burst = burst
+        self.per_minute = per_minute
+        self.max_sessions = max_sessions
+        self.clock = clock
+        self.allowed = 0
+        self.limited = 0
+        self._buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def allow(self, session_id: str) -> bool:
+        with self._lock:
+            bucket = self._buckets.get(session_id)
+            if bucket is None:
+                bucket = TokenBucket(self.burst, self.per_minute / 60.0, self.clock)
+                self._buckets[session_id] = bucket
+                if len(self._buckets) > self.max_sessions:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(session_id)
+
+            ok = bucket.try_acquire()
+            if ok:
+                self.allowed += 1
+            else:
+                self.limited += 1
+            return ok
+
+    def stats(self) -> dict:
+        return {"rate_allowed": self.allowed, "rate_limited": self.limited}
+
+
+class FlightRejected(RuntimeError):
+    """Το admit() του leader αρνήθηκε (π.χ. όριο αιτημάτων): δεν έγινε κλήση."""
+
+
+class FlightInterrupted(RuntimeError):
+    """Ο leader σταμάτησε το stream πριν το τέλος: η απάντηση είναι μισή."""
+
+
+class _Flight:
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.done = False
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.chunks: list = []
+
+
+class SingleFlight:
+    """
+    Συγχώνευση ταυτόχρονων ίδιων κλήσεων. Ο πρώτος caller για ένα κλειδί
+    («leader») κάνει την κλήση· όσοι έρθουν πριν τελειώσει περιμένουν το
+    αποτέλεσμά του. Μόλις τελειώσει, το κλειδί ελευθερώνεται (η cache
+    απαντήσεων καλύπτει τα επόμενα αιτήματα).
+    """
+
+    def __init__(self):
+        self.leaders = 0
+        self.coalesced = 0
+        self._flights: dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def _join(self, key: str, admit: Callable[[], bool] | None) -> tuple[_Flight, bool]:
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                return flight, False
+            if admit is not None and not admit():
+                raise FlightRejected(key)
+            flight = self._flights[key] = _Flight()
+            self.leaders += 1
+            return flight, True
+
+    def _land(self, key: str, flight: _Flight) -> None:
+        with self._lock:
+            self._flights.pop(key, None)
+        with flight.cond:
+            flight.done = True
+            flight.cond.notify_all()
+
+    def do(self, key: str, fn: Callable[[], Any], admit: Callable[[], bool] | None = None) -> Any:
+        """
+        Επιστρέφει fn() — μία κλήση ανά κλειδί σε εξέλιξη.
+        Σφάλμα του leader ξαναπετιέται σε όλους. Το admit() ρωτιέται μόνο
+        όταν ο caller θα γίνει leader (δηλαδή θα γίνει πράγματι κλήση)·
+        αν επιστρέψει False, πετιέται FlightRejected.
+        """
+        flight, leader = self._join(key, admit)
+        if leader:
+            try:
+                flight.result = fn()
+            except BaseException as exc:
+                flight.error = exc
+                raise
+            finally:
+                self._land(key, flight)
+            return flight.result
+
+        with flight.cond:
+            flight.cond.wait_for(lambda: flight.done)
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    def stream(self, key: str, factory: Callable[[], Iterator],
+               admit: Callable[[], bool] | None = None) -> Iterator:
+        """
+        Όπως do(), για streams: ο leader διαβάζει το factory() και όσοι
+        συνδεθούν παίρνουν όλα τα κομμάτια από την αρχή, καθώς φτάνουν.
+        Αν ο leader σταματήσει νωρίς, οι υπόλοιποι παίρνουν ό,τι είχε φτάσει
+        και μετά FlightInterrupted, ώστε να μην το δείξουν ως ολόκληρη απάντηση.
+        """
+        flight, leader = self._join(key, admit)
+        if leader:
+            try:
+                for chunk in factory():
+                    with flight.cond:
+                        flight.chunks.append(chunk)
+                        flight.cond.notify_all()
+                    yield chunk
+            except BaseException as exc:
+                flight.error = exc
+                raise
+            finally:
+                self._land(key, flight)
+            return
+
+        i = 0
+        while True:
+            with flight.cond:
+                flight.cond.wait_for(lambda: flight.done or len(flight.chunks) > i)
+                ready = flight.chunks[i:]
+                done = flight.done
+            for chunk in ready:
+                yield chunk
+            i += len(ready)
+            if done and i == len(flight.chunks):
+                break
+        if isinstance(flight.error, GeneratorExit):
+            raise FlightInterrupted(key)
+        if flight.error is not None:
+            raise flight.error
+
+    def stats(self) -> dict:
+        with self._lock:
+            in_flight = len(self._flights)
+        return {"in_flight": in_flight, "upstream_calls": self.leaders, "coalesced": self.coalesced}
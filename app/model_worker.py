@@ -0,0 +1,430 @@
+# app/model_worker.py
+"""
+Κοινός τοπικός worker για το sentiment μοντέλο.
+
+Χωρίς αυτόν, κάθε διεργασία που κάνει import το sentiment.py φορτώνει το
+δικό της αντίγραφο του μοντέλου, και το torch χρησιμοποιεί όλους τους
+πυρήνες σε κάθε διεργασία (oversubscription). Εδώ μία διεργασία κατέχει
+το μοντέλο και όλα τα sessions/διεργασίες του Streamlit της μιλούν μέσω
+multiprocessing.connection (Unix socket, ή named pipe στα Windows):
+
+- ρητός αριθμός intra-op threads (MODEL_WORKER_THREADS) και 1 inter-op,
+- τα αιτήματα περνούν από τον SentimentBatcher, οπότε ταυτόχρονα κείμενα
+  από διαφορετικές διεργασίες γίνονται ένα batch,
+- endpoints: "analyze", "health" (κατάσταση χωρίς αναμονή), "warm_up"
+  (φορτώνει το μοντέλο και τρέχει ένα δοκιμαστικό κείμενο) και "shutdown".
+
+Το multiprocessing.connection στέλνει pickles, οπότε:
+- το socket, το authkey και το log ζουν σε ιδιωτικό φάκελο (0700) του
+  χρήστη (runtime_dir: $XDG_RUNTIME_DIR/emotion-chatbot),
+- το authkey είναι τυχαίο ανά εγκατάσταση (αρχείο 0600) ή δίνεται από το
+  MODEL_WORKER_AUTHKEY· η πιστοποίηση είναι αμφίδρομη, άρα ούτε ο client
+  δέχεται δεδομένα από ψεύτικο listener.
+
+Ο client ξεκινά μόνος του τον worker αν δεν τρέχει (stdout/stderr στο
+model-worker.log). Ο worker τερματίζει μόνος του μετά από
+MODEL_WORKER_IDLE_SECONDS χωρίς αιτήματα, ή με client.shutdown().
+
+Χρήση:
+    SENTIMENT_MODE=worker streamlit run app/app.py
+    python app/model_worker.py                 # ρητή εκκίνηση (προαιρετική)
+    client = ModelWorkerClient()
+    client.analyze(["I am happy"])             # [{"label": ..., "score": ...}]
+"""
+import os
+import secrets
+import socket
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+from typing import Any, Callable
+
+from sentiment_batcher import SentimentBatcher
+
+# Κενά = προεπιλογές μέσα στο runtime_dir() (υπολογίζονται όταν χρειαστούν)
+MODEL_WORKER_ADDRESS = os.environ.get("MODEL_WORKER_ADDRESS", "")
+MODEL_WORKER_THREADS = int(os.environ.get("MODEL_WORKER_THREADS", str(max(1, (os.cpu_count() or 2) // 2))))
+MODEL_WORKER_START_TIMEOUT_SECONDS = 30.0
+# Χωρίς αιτήματα για τόσα δευτερόλεπτα ο worker τερματίζει (0 = ποτέ)
+MODEL_WORKER_IDLE_SECONDS = float(os.environ.get("MODEL_WORKER_IDLE_SECONDS", "900"))
+AUTHKEY_FILE = "authkey"
+LOG_FILE = "model-worker.log"
+
+STATUS_IDLE = "idle"
+STATUS_LOADING = "loading"
+STATUS_READY = "ready"
+STATUS_ERROR = "error"
+
+WARM_UP_TEXT = "I am feeling okay today."
+
+
+class ModelWorkerError(RuntimeError):
+    """Ο worker απάντησε με σφάλμα ή δεν είναι διαθέσιμος."""
+
+
+def runtime_dir() -> str:
+    """
+    Ιδιωτικός φάκελος του χρήστη για socket, authkey και log:
+    $XDG_RUNTIME_DIR/emotion-chatbot, αλλιώς emotion-chatbot-<uid> στο temp.
+    Αν υπάρχει ήδη χωρίς να ανήκει στον χρήστη ή με πρόσβαση σε άλλους,
+    αρνείται να τον χρησιμοποιήσει.
+    """
+    if sys.platform == "win32":
+        path = os.path.join(os.environ.get("LOCALAPPDATA", tempfile.gettempdir()), "emotion-chatbot")
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    base = os.environ.get("XDG_RUNTIME_DIR")
+    if base:
+        path = os.path.join(base, "emotion-chatbot")
+    else:
+        path = os.path.join(tempfile.gettempdir(), f"emotion-chatbot-{os.getuid()}")
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise ModelWorkerError(f"{path}: πρέπει να είναι φάκελος του χρήστη με δικαιώματα 0700")
+    return path
+
+
+def default_address() -> str:
+    if MODEL_WORKER_ADDRESS:
+        return MODEL_WORKER_ADDRESS
+    if sys.platform == "win32":
+        return r"\\.\pipe\emotion-chatbot-model-worker"
+    return os.path.join(runtime_dir(), "model-worker.sock")
+
+
+def load_authkey() -> bytes:
+    """
+    Το MODEL_WORKER_AUTHKEY, αλλιώς το τυχαίο κλειδί της εγκατάστασης στο
+    runtime_dir() (0600, δημιουργείται ατομικά την πρώτη φορά).
+    """
+    if os.environ.get("MODEL_WORKER_AUTHKEY"):
+        return os.environ["MODEL_WORKER_AUTHKEY"].encode("utf-8")
+
+    path = os.path.join(runtime_dir(), AUTHKEY_FILE)
+    if not os.path.exists(path):
+        # Γράφεται σε προσωρινό αρχείο και «δένεται» με link: αν δύο διεργασίες
+        # το φτιάξουν ταυτόχρονα, κερδίζει μία και η άλλη διαβάζει το δικό της
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(secrets.token_hex(32))
+            os.chmod(tmp, 0o600)
+            try:
+                os.link(tmp, path)
+            except FileExistsError:
+                pass
+        finally:
+            os.unlink(tmp)
+    with open(path, encoding="ascii") as f:
+        key = f.read().strip()
+    if len(key) < 32:
+        raise ModelWorkerError(f"{path}: άκυρο authkey")
+    return key.encode("ascii")
+
+
+def configure_threads(threads: int) -> None:
+    """
+    Πριν φορτωθεί το μοντέλο: όριο threads για OpenMP/MKL και torch.
+    """
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[var] = str(threads)
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Επιτρέπεται μόνο πριν από την πρώτη παράλληλη εργασία
+        pass
+
+
+class ModelWorker:
+    def __init__(
+        self,
+        create_pipeline: Callable[[], Any],
+        address: str | None = None,
+        authkey: bytes | None = None,
+        threads: int = MODEL_WORKER_THREADS,
+        idle_seconds: float = MODEL_WORKER_IDLE_SECONDS,
+    ):
+        self.create_pipeline = create_pipeline
+        self.address = address or default_address()
+        self.authkey = authkey or load_authkey()
+        self.threads = threads
+        self.idle_seconds = idle_seconds
+        self.status = STATUS_IDLE
+        self.error: str | None = None
+        self.requests = 0
+        self.started = time.monotonic()
+        self.last_active = self.started
+
+        self._pipeline: Any = None
+        self._load_lock = threading.Lock()
+        self._load_seconds: float | None = None
+        self._listener: Listener | None = None
+        self._stopped = threading.Event()
+        self.batcher = SentimentBatcher(self._get_pipeline)
+
+    def _get_pipeline(self):
+        if self._pipeline is not None:
+            return self._pipeline
+        with self._load_lock:
+            if self._pipeline is None:
+                self.status = STATUS_LOADING
+                start = time.perf_counter()
+                try:
+                    self._pipeline = self.create_pipeline()
+                except Exception as exc:
+                    self.status = STATUS_ERROR
+                    self.error = repr(exc)
+                    raise
+                self._load_seconds = time.perf_counter() - start
+                self.status = STATUS_READY
+                self.error = None
+        return self._pipeline
+
+    def warm_up(self) -> dict:
+        self.batcher.submit(WARM_UP_TEXT).result()
+        return self.health()
+
+    def health(self) -> dict:
+        return {
+            "status": self.status,
+            "error": self.error,
+            "pid": os.getpid(),
+            "threads": self.threads,
+            "load_ms": None if self._load_seconds is None else round(self._load_seconds * 1000, 1),
+            "uptime_s": round(time.monotonic() - self.started, 1),
+            "requests": self.requests,
+            **self.batcher.stats(),
+        }
+
+    def handle(self, request: dict) -> dict:
+        op = request.get("op")
+        if op == "health":
+            return {"ok": True, "health": self.health()}
+        if op == "shutdown":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"ok": True}
+        # Τα health (και οι έλεγχοι «τρέχει;») δεν μετρούν ως δραστηριότητα
+        self.last_active = time.monotonic()
+        if op == "warm_up":
+            return {"ok": True, "health": self.warm_up()}
+        if op == "analyze":
+            self.requests += 1
+            futures = [self.batcher.submit(text) for text in request["texts"]]
+            return {"ok": True, "results": [f.result() for f in futures]}
+        return {"ok": False, "error": f"unknown op {op!r}"}
+
+    def _serve_connection(self, conn) -> None:
+        with conn:
+            while True:
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    response = self.handle(request)
+                except Exception as exc:
+                    response = {"ok": False, "error": repr(exc)}
+                conn.send(response)
+
+    def _bind(self) -> Listener:
+        if sys.platform != "win32" and os.path.lexists(self.address):
+            if _alive(self.address, self.authkey):
+                raise ModelWorkerError(f"model worker already running at {self.address}")
+            # Σβήνεται μόνο socket από worker που δεν τρέχει πια, ποτέ άλλο αρχείο
+            if not stat.S_ISSOCK(os.lstat(self.address).st_mode):
+                raise ModelWorkerError(f"{self.address}: υπάρχει και δεν είναι socket")
+            os.unlink(self.address)
+        return Listener(self.address, authkey=self.authkey)
+
+    def _watch_idle(self) -> None:
+        while not self._stopped.wait(min(self.idle_seconds / 4, 5.0)):
+            if time.monotonic() - self.last_active > self.idle_seconds:
+                _log(f"χωρίς αιτήματα για {self.idle_seconds:.0f} s, τερματισμός")
+                self.shutdown()
+                return
+
+    def serve_forever(self) -> None:
+        """
+        Εξυπηρετεί συνδέσεις μέχρι το shutdown() (ή το idle timeout).
+        """
+        listener = self._listener = self._bind()
+        self._stopped.clear()
+        self.last_active = time.monotonic()
+        if self.idle_seconds > 0:
+            threading.Thread(target=self._watch_idle, name="model-worker-idle", daemon=True).start()
+        try:
+            while not self._stopped.is_set():
+                try:
+                    conn = listener.accept()
+                except (OSError, EOFError, AuthenticationError):
+                    continue
+                if self._stopped.is_set():
+                    conn.close()
+                    break
+                threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+        finally:
+            self._listener = None
+            listener.close()   # σβήνει και το socket
+
+    def start(self) -> threading.Thread:
+        """
+        serve_forever σε daemon thread (για tests / ενσωμάτωση).
+        """
+        thread = threading.Thread(target=self.serve_forever, name="model-worker", daemon=True)
+        thread.start()
+        deadline = time.monotonic() + MODEL_WORKER_START_TIMEOUT_SECONDS
+        while not _alive(self.address, self.authkey):
+            if time.monotonic() > deadline:
+                raise ModelWorkerError("model worker did not start")
+            time.sleep(0.01)
+        return thread
+
+    def shutdown(self) -> None:
+        if self._listener is None or self._stopped.is_set():
+            return
+        self._stopped.set()
+        # Το accept() που περιμένει ξυπνά μόνο με μια σύνδεση
+        try:
+            if sys.platform == "win32":
+                Client(self.address, authkey=self.authkey).close()
+            else:
+                with socket.socket(socket.AF_UNIX) as sock:
+                    sock.settimeout(1.0)
+                    sock.connect(self.address)
+        except (OSError, EOFError, AuthenticationError):
+            pass
+
+
+def _log(message: str) -> None:
+    # Στον worker το stdout είναι το model-worker.log
+    print(f"{datetime.now().isoformat(timespec='seconds')} [pid {os.getpid()}] {message}", flush=True)
+
+
+def _alive(address: str, authkey: bytes) -> bool:
+    try:
+        with Client(address, authkey=authkey) as conn:
+            conn.send({"op": "health"})
+            return bool(conn.recv().get("ok"))
+    except (OSError, EOFError):
+        return False
+    except AuthenticationError as exc:
+        raise ModelWorkerError(f"{address}: άλλο authkey (ξένη διεργασία;)") from exc
+
+
+class ModelWorkerClient:
+    """
+    Thin client: ένα αίτημα ανά σύνδεση (η σύνδεση σε τοπικό socket κοστίζει
+    ελάχιστα). Με autostart=True ξεκινά τον worker αν δεν απαντά.
+    """
+
+    def __init__(
+        self,
+        address: str | None = None,
+        authkey: bytes | None = None,
+        autostart: bool = True,
+    ):
+        self.address = address or default_address()
+        self.authkey = authkey or load_authkey()
+        self.autostart = autostart
+        self._start_lock = threading.Lock()
+
+    def _send(self, request: dict) -> dict:
+        try:
+            with Client(self.address, authkey=self.authkey) as conn:
+                conn.send(request)
+                return conn.recv()
+        except AuthenticationError as exc:
+            raise ModelWorkerError(f"{self.address}: άλλο authkey (ξένη διεργασία;)") from exc
+
+    def _call(self, request: dict) -> dict:
+        try:
+            response = self._send(request)
+        except (OSError, EOFError):
+            if not self.autostart:
+                raise
+            self.ensure_running()
+            response = self._send(request)
+        if not response.get("ok"):
+            raise ModelWorkerError(response.get("error"))
+        return response
+
+    def ensure_running(self) -> None:
+        """
+        Ξεκινά τον worker ως ανεξάρτητη διεργασία και περιμένει να απαντήσει.
+        Αν δύο διεργασίες τον ξεκινήσουν ταυτόχρονα, ο δεύτερος βρίσκει τη
+        διεύθυνση πιασμένη και τερματίζει.
+        """
+        with self._start_lock:
+            if _alive(self.address, self.authkey):
+                return
+            env = {**os.environ, "MODEL_WORKER_ADDRESS": self.address}
+            kwargs: dict = {"start_new_session": True} if sys.platform != "win32" else {
+                "creationflags": subprocess.CREATE_NEW_PROCESS_GROUP,
+            }
+            with open(os.path.join(runtime_dir(), LOG_FILE), "ab") as log:
+                subprocess.Popen(
+                    [sys.executable, os.path.abspath(__file__)],
+                    env=env,
+                    stdin=subprocess.DEVNULL,
+                    stdout=log,
+                    stderr=subprocess.STDOUT,
+                    **kwargs,
+                )
+            deadline = time.monotonic() + MODEL_WORKER_START_TIMEOUT_SECONDS
+            while not _alive(self.address, self.authkey):
+                if time.monotonic() > deadline:
+                    raise ModelWorkerError("model worker did not start")
+                time.sleep(0.1)
+
+    def analyze(self, texts: list[str]) -> list[dict]:
+        return self._call({"op": "analyze", "texts": list(texts)})["results"]
+
+    def health(self) -> dict:
+        return self._call({"op": "health"})["health"]
+
+    def warm_up(self) -> dict:
+        return self._call({"op": "warm_up"})["health"]
+
+    def shutdown(self) -> bool:
+        """
+        Σταματά τον worker αν τρέχει (χωρίς autostart). True αν έτρεχε.
+        """
+        try:
+            return bool(self._send({"op": "shutdown"}).get("ok"))
+        except (OSError, EOFError):
+            return False
+
+
+def main() -> None:
+    configure_threads(MODEL_WORKER_THREADS)
+    from sentiment_backends import create_pipeline
+
+    worker = ModelWorker(lambda: create_pipeline(threads=MODEL_WORKER_THREADS))
+    _log(f"εκκίνηση στο {worker.address} ({worker.threads} threads, "
+         f"idle timeout {worker.idle_seconds:.0f} s)")
+    # Το μοντέλο φορτώνεται στο παρασκήνιο· το health απαντά αμέσως ("loading")
+    threading.Thread(target=worker.warm_up, daemon=True).start()
+    try:
+        worker.serve_forever()
+    except ModelWorkerError as exc:
+        # Άλλος worker τρέχει ήδη στην ίδια διεύθυνση
+        _log(str(exc))
+        sys.exit(0)
+    _log(f"τέλος ({worker.requests} αιτήματα)")
+
+
+if __name__ == "__main__":
+    main()
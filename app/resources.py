@@ -0,0 +1,123 @@
+# app/resources.py
+"""
+Μικρό registry για «βαριούς» πόρους (μοντέλα, clients, λεξικά).
+Κάθε πόρος δημιουργείται την πρώτη φορά που ζητηθεί (get), όχι στο import,
+και καταγράφεται πόσο χρόνο πήρε η φόρτωσή του.
+
+Χρήση:
+    resources.register("sentiment_pipeline", _create_pipeline)
+    pipe = resources.get("sentiment_pipeline")
+"""
+import threading
+import time
+from typing import Any, Callable
+
+
+class _Resource:
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        self.name = name
+        self.factory = factory
+        self.value: Any = None
+        self.loaded = False
+        self.load_seconds: float | None = None
+        self.error: Exception | None = None
+        self.lock = threading.Lock()
+
+
+_registry: dict[str, _Resource] = {}
+_registry_lock = threading.Lock()
+
+
+def register(name: str, factory: Callable[[], Any]) -> None:
+    """
+    Δηλώνει έναν πόρο. Αν υπάρχει ήδη (π.χ. σε rerun του Streamlit),
+    κρατάμε τον υπάρχοντα ώστε να μη χαθεί ό,τι έχει ήδη φορτωθεί.
+    """
+    with _registry_lock:
+        if name not in _registry:
+            _registry[name] = _Resource(name, factory)
+
+
+def get(name: str) -> Any:
+    """
+    Επιστρέφει τον πόρο, δημιουργώντας τον την πρώτη φορά.
+    Ταυτόχρονες κλήσεις περιμένουν την ίδια φόρτωση (μία φορά ανά διεργασία).
+    Αν η φόρτωση αποτύχει, το σφάλμα ξαναπετιέται και η επόμενη κλήση ξαναδοκιμάζει.
+    """
+    res = _registry[name]
+    if res.loaded:
+        return res.value
+
+    with res.lock:
+        if not res.loaded:
+            start = time.perf_counter()
+            try:
+                res.value = res.factory()
+            except Exception as exc:
+                res.error = exc
+                raise
+            res.load_seconds = time.perf_counter() - start
+            res.error = None
+            res.loaded = True
+    return res.value
+
+
+def replace(name: str, value: Any) -> None:
+    """
+    Αντικαθιστά την τιμή ενός πόρου (π.χ. hot-reload λεξικού).
+    """
+    res = _registry[name]
+    with res.lock:
+        res.value = value
+        res.loaded = True
+
+
+def is_loaded(name: str) -> bool:
+    res = _registry.get(name)
+    return bool(res and res.loaded)
+
+
+def warm_up(*names: str, background: bool = True) -> threading.Thread | None:
+    """
+    Φορτώνει εκ των προτέρων τους πόρους (όλους, αν δεν δοθούν ονόματα).
+    Με background=True τρέχει σε daemon thread και επιστρέφει αμέσως.
+    Σφάλματα φόρτωσης δεν σταματούν το warm-up· φαίνονται στο load_report().
+    """
+    targets = list(names) or list(_registry)
+
+    def _run():
+        for name in targets:
+            try:
+                get(name)
+            except Exception:
+                pass
+
+    if not background:
+        _run()
+        return None
+
+    thread = threading.Thread(target=_run, name="resources-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def load_times() -> dict[str, float | None]:
+    """
+    Χρόνος φόρτωσης (δευτερόλεπτα) ανά πόρο· None αν δεν έχει φορτωθεί ακόμη.
+    """
+    return {name: res.load_seconds for name, res in _registry.items()}
+
+
+def load_report() -> list[dict]:
+    """
+    Αναλυτική εικόνα κάθε πόρου, για εμφάνιση στο UI ή logging.
+    """
+    return [
+        {
+            "resource": name,
+            "loaded": res.loaded,
+            "load_ms": None if res.load_seconds is None else round(res.load_seconds * 1000, 1),
+            "error": None if res.error is None else repr(res.error),
+        }
+        for name, res in _registry.items()
+    ]
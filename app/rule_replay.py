@@ -0,0 +1,193 @@
+# app/rule_replay.py
+"""
+Batch «replay» του rule engine πάνω στο ιστορικό (πίνακας checkins της
+βάσης, ή ένα CSV με τις ίδιες στήλες, π.χ. το παλιό user_data.csv).
+
+Εφαρμόζει σε ολόκληρο DataFrame ό,τι κάνει το Chat ανά μήνυμα:
+extract_emotional_tags, exercise_suggestion και τον έλεγχο κρίσης.
+
+- Κάθε διαφορετικό μήνυμα κανονικοποιείται μία φορά.
+- Οι έννοιες (keyword_matcher.CONCEPT_KEYWORDS) βγαίνουν με διανυσματικό
+  str.contains πάνω στο κανονικοποιημένο κείμενο.
+- Τα συναισθήματα του λεξικού με analyze_lexicon_emotions_batch.
+- Ο crisis detector τρέχει μόνο σε μηνύματα που περιέχουν token
+  που μπορεί να ξεκινά φράση κρίσης ή κάποια από τις EXACT_RED_FLAGS.
+- Οι ίδιες οι συναρτήσεις κανόνων καλούνται μία φορά ανά διαφορετικό
+  συνδυασμό εισόδων (διάθεση, ύπνος, νερό, έννοιες, tags λεξικού),
+  οπότε τα αποτελέσματα είναι ίδια με του Chat χωρίς αντιγραφή λογικής.
+
+Χρήση:
+    python app/rule_replay.py [user_data.csv]     # χωρίς όρισμα: από τη βάση
+"""
+import os
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+
+from crisis_detector import CrisisDetector
+from emotional_map import LEXICON_EMOTION_TAGS, LEXICON_EMOTION_THRESHOLD, extract_emotional_tags
+from keyword_matcher import CONCEPT_KEYWORDS
+from lexicon_sentiment import analyze_lexicon_emotions_batch
+from rules import exercise_suggestion
+from text_normalization import normalize_phrase, normalize_token, tokenize
+
+DERIVED_COLUMNS = ["tags", "exercise", "emergency"]
+# Έξοδος όταν το ιστορικό διαβάζεται από τη βάση
+DERIVED_DEFAULT_PATH = "user_data_derived.csv"
+
+
+def derived_path(path: str) -> str:
+    """
+    Το αρχείο με τις παραγόμενες στήλες, δίπλα στο log:
+    user_data.csv → user_data_derived.csv
+    """
+    root, ext = os.path.splitext(path)
+    return f"{root}_derived{ext}"
+
+
+def concept_frame(normalized: pd.Series) -> pd.DataFrame:
+    """
+    Μία boolean στήλη ανά έννοια, για ήδη κανονικοποιημένα μηνύματα.
+    Ίδια σημασιολογία με το match_concepts (substring των κανονικοποιημένων stems).
+    """
+    return pd.DataFrame(
+        {
+            concept: normalized.str.contains(
+                "|".join(re.escape(normalize_phrase(p)) for p in patterns), regex=True
+            )
+            for concept, patterns in CONCEPT_KEYWORDS.items()
+        },
+        index=normalized.index,
+    )
+
+
+def _lexicon_tags(emotions: pd.DataFrame) -> list[tuple]:
+    """
+    Tags του λεξικού ανά μήνυμα, όπως το emotional_map.lexicon_emotion_tags.
+    """
+    names = list(LEXICON_EMOTION_TAGS)
+    values = emotions[names].to_numpy()
+    strong = values >= LEXICON_EMOTION_THRESHOLD
+    out: list[tuple] = [()] * len(values)
+    # Μόνο οι γραμμές με τουλάχιστον ένα έντονο συναίσθημα χρειάζονται ταξινόμηση
+    for r in np.flatnonzero(strong.any(axis=1)):
+        ranked = sorted(
+            ((values[r, i], names[i]) for i in np.flatnonzero(strong[r])), reverse=True
+        )
+        out[r] = tuple(LEXICON_EMOTION_TAGS[name] for _, name in ranked)
+    return out
+
+
+def _emergency_flags(messages: list[str], token_lists: list[list[str]]) -> np.ndarray:
+    """
+    Έλεγχος κρίσης μόνο για όσα μηνύματα έχουν πιθανό «σημείο εκκίνησης».
+    Το replay δεν γράφει στο audit log (αφορά μόνο ζωντανές συνομιλίες).
+    """
+    detector = CrisisDetector(budget_ms=float("inf"), audit_path=None)
+    triggers = {tok for tok in set().union(*token_lists) if detector.can_start(tok)}
+
+    flags = np.zeros(len(messages), dtype=bool)
+    for i, (message, tokens) in enumerate(zip(messages, token_lists)):
+        if triggers.intersection(tokens) or detector.exact_flag(message):
+            flags[i] = detector.detect(message).is_crisis
+    return flags
+
+
+def replay_rules(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Τρέχει τους κανόνες σε DataFrame με στήλες mood, sleep, water, message
+    (όπως το user_data.csv). Επιστρέφει DataFrame με το ίδιο index και
+    στήλες tags (ετικέτες χωρισμένες με «, »), exercise (τίτλος άσκησης)
+    και emergency (bool).
+    """
+    messages = df["message"].fillna("").astype(str)
+
+    # Κάθε διαφορετικό μήνυμα επεξεργάζεται μία φορά
+    codes, uniques = pd.factorize(messages)
+    uniques = list(uniques)
+    token_lists = [tokenize(m) for m in uniques]
+    normalized = pd.Series(
+        [" ".join(normalize_token(t) for t in tokens) for tokens in token_lists],
+        dtype=object,
+    )
+
+    concepts = concept_frame(normalized)
+    # Κάθε συνδυασμός εννοιών κωδικοποιείται ως bitmask → frozenset
+    names = list(concepts.columns)
+    bits = concepts.to_numpy().astype(np.int64) @ (1 << np.arange(len(names), dtype=np.int64))
+    concept_sets = {
+        mask: frozenset(n for b, n in enumerate(names) if mask >> b & 1)
+        for mask in np.unique(bits)
+    }
+
+    lexicon_tags = _lexicon_tags(analyze_lexicon_emotions_batch(uniques))
+    emergency = _emergency_flags(uniques, token_lists)
+
+    moods = pd.to_numeric(df["mood"], errors="coerce").fillna(50).astype(int).to_numpy()
+    sleeps = df["sleep"].astype(str).to_numpy()
+    waters = df["water"].astype(str).to_numpy()
+
+    # Οι κανόνες καλούνται μία φορά ανά διαφορετικό συνδυασμό εισόδων
+    tag_cache: dict[tuple, str] = {}
+    exercise_cache: dict[tuple, str] = {}
+    tags_col = []
+    exercise_col = []
+    for mood, sleep, water, code in zip(moods, sleeps, waters, codes):
+        found = concept_sets[bits[code]]
+        key = (mood, sleep, water, found, lexicon_tags[code])
+        tags = tag_cache.get(key)
+        if tags is None:
+            tags = ", ".join(
+                label
+                for _, label in extract_emotional_tags(
+                    mood, sleep, water, "", concepts=found, lexicon_tags=list(lexicon_tags[code])
+                )
+            )
+            tag_cache[key] = tags
+        tags_col.append(tags)
+
+        key = key[:4]
+        exercise = exercise_cache.get(key)
+        if exercise is None:
+            exercise = exercise_suggestion(mood, sleep, water, "", concepts=found)
+            exercise = exercise.split("\n", 1)[0].rstrip(":")
+            exercise_cache[key] = exercise
+        exercise_col.append(exercise)
+
+    return pd.DataFrame(
+        {
+            "tags": tags_col,
+            "exercise": exercise_col,
+            "emergency": emergency[codes],
+        },
+        index=df.index,
+    )
+
+
+def replay_log(path: str | None = None, out_path: str | None = None) -> pd.DataFrame:
+    """
+    Διαβάζει το log (CSV στο path, ή τα check-ins της βάσης αν path=None),
+    τρέχει τους κανόνες και γράφει το log μαζί με τις παραγόμενες στήλες
+    στο out_path (προεπιλογή: <log>_derived.csv / user_data_derived.csv).
+    Το ίδιο το log δεν αλλάζει.
+    """
+    if path is None:
+        from storage import get_storage
+
+        df = get_storage().checkins()
+        out_path = out_path or DERIVED_DEFAULT_PATH
+    else:
+        df = pd.read_csv(path)
+        out_path = out_path or derived_path(path)
+    result = pd.concat([df, replay_rules(df)], axis=1)
+    result.to_csv(out_path, index=False, encoding="utf-8")
+    return result
+
+
+if __name__ == "__main__":
+    log_path = sys.argv[1] if len(sys.argv) > 1 else None
+    out = replay_log(log_path)
+    print(f"{len(out)} γραμμές → {derived_path(log_path) if log_path else DERIVED_DEFAULT_PATH}")
+    print(out[["timestamp", *DERIVED_COLUMNS]].to_string(index=False))
@@ -1,3 +1,8 @@
+from crisis_detector import detect_crisis
+from keyword_matcher import match_concepts
+from text_normalization import normalize_phrase, normalize_text
+
+
 def personal_reply(mood: int, sleep: str, water: str) -> str:
     reply = ""
 
@@ -29,8 +34,11 @@ def personal_reply(mood: int, sleep: str, water: str) -> str:
     return reply
 
 
-def fallback_therapeutic_reply(mood: int, sleep: str, water: str, user_text: str) -> str:
-    txt = user_text.lower()
+def fallback_therapeutic_reply(
+    mood: int, sleep: str, water: str, user_text: str, concepts: frozenset[str] | None = None
+) -> str:
+    if concepts is None:
+        concepts = match_concepts(user_text)
     parts: list[str] = []
 
     if mood < 30:
@@ -49,22 +57,22 @@ def fallback_therapeutic_reply(mood: int, sleep: str, water: str, user_text: str
             "και πώς μπορείς να το κρατήσεις στη ζωή σου."
         )
 
-    if "άγχ" in txt or "αγχος" in txt:
+    if "anxiety" in concepts:
         parts.append(
             "Το άγχος συχνά συνδέεται με πολλές απαιτήσεις και προσδοκίες, από εσένα ή από τους άλλους."
         )
 
-    if "πίεσ" in txt or "πιεζ" in txt:
+    if "pressure" in concepts:
         parts.append(
             "Η αίσθηση πίεσης συνδέεται συχνά με το ότι έχεις φορτωθεί περισσότερα απ’ όσα αντέχεις πραγματικά."
         )
 
-    if "θλίψ" in txt or "στεναχ" in txt or "λύπη" in txt:
+    if "sadness" in concepts:
         parts.append(
             "Η θλίψη και η στεναχώρια συνήθως κρύβουν πίσω τους απογοητεύσεις ή απώλειες που δεν έχουν πάρει χώρο."
         )
 
-    if "μοναξ" in txt:
+    if "loneliness" in concepts:
         parts.append(
             "Η μοναξιά μπορεί να είναι έντονη ακόμη κι αν υπάρχουν άνθρωποι γύρω σου· "
             "έχει σημασία να δούμε πού νιώθεις περισσότερο μόνος/η."
@@ -89,24 +97,27 @@ def fallback_therapeutic_reply(mood: int, sleep: str, water: str, user_text: str
     return " ".join(parts)
 
 
-def exercise_suggestion(mood: int, sleep: str, water: str, user_text: str) -> str:
-    txt = user_text.lower()
+def exercise_suggestion(
+    mood: int, sleep: str, water: str, user_text: str, concepts: frozenset[str] | None = None
+) -> str:
+    if concepts is None:
+        concepts = match_concepts(user_text)
 
-    if "άγχ" in txt or "αγχος" in txt or "φοβ" in txt:
+    if "anxiety" in concepts or "fear" in concepts:
         return (
             "🧘 Άσκηση αναπνοής 4–2–6:\n"
             "Εισπνοή από τη μύτη για 4'', κράτημα για 2'', εκπνοή από το στόμα για 6''. "
             "Επανάλαβε 5 φορές και παρατήρησε τι αλλάζει στο σώμα σου."
         )
 
-    if "πίεσ" in txt or "πιεζ" in txt or "πολλά" in txt or "πολλα" in txt:
+    if "pressure" in concepts or "many" in concepts:
         return (
             "📌 Μικρή άσκηση αποφόρτισης:\n"
             "Γράψε μία πρόταση που αρχίζει με: «Αυτό που με βαραίνει περισσότερο είναι…» "
             "χωρίς να τη φιλτράρεις. Το πρώτο πράγμα που θα βγει, αξίζει προσοχής."
         )
 
-    if "θλίψ" in txt or "στεναχ" in txt or "λύπη" in txt or "μοναξ" in txt:
+    if "sadness" in concepts or "loneliness" in concepts:
         return (
             "🤍 Άσκηση ηρεμίας 20'':\n"
             "Βάλε το χέρι στο στήθος, πάρε μία αργή ανάσα και πες από μέσα σου: "
@@ -140,24 +151,9 @@ def exercise_suggestion(mood: int, sleep: str, water: str, user_text: str) -> st
 
 
 def is_emergency(text: str) -> bool:
-    t = text.lower()
-    red_flags = [
-        "αυτοκτον",
-        "να αυτοκτον",
-        "να τελειώσω",
-        "να τελειωσω",
-        "δεν θέλω να ζω",
-        "δεν θελω να ζω",
-        "να βλάψω τον εαυτό μου",
-        "να βλαψω τον εαυτο μου",
-        "να χτυπήσω τον εαυτό μου",
-        "να χτυπησω τον εαυτο μου",
-        "δεν αντέχω άλλο",
-        "δεν αντεχω αλλο",
-        "να πεθάνω",
-        "να πεθανω",
-    ]
-    return any(flag in t for flag in red_flags)
+    # Οι φράσεις «red flags» και το fuzzy ταίριασμα βρίσκονται στο crisis_detector.
+    # Κάθε θετικό αποτέλεσμα καταγράφεται στο δικό του audit log.
+    return detect_crisis(text).is_crisis
 
 
 def emergency_message() -> str:
@@ -178,38 +174,41 @@ def targeted_question_from_profile(profile: dict, user_text: str) -> str | None:
     if not profile:
         return None
 
-    main_issue = profile.get("main_issue", "").lower()
-    role = profile.get("role", "").lower()
-    focus = profile.get("focus", "").lower()
+    main_issue = normalize_text(profile.get("main_issue", "")).text
+    role = normalize_text(profile.get("role", "")).text
+    focus = normalize_text(profile.get("focus", "")).text
+
+    def mentions(field: str, *stems: str) -> bool:
+        return any(normalize_phrase(s) in field for s in stems)
 
     base = "Με βάση όσα μου έχεις γράψει στο ιστορικό σου, θα ήθελα να σε ρωτήσω κάτι πιο συγκεκριμένο. "
 
-    if "σπουδ" in main_issue or "σπουδ" in focus or "φοιτη" in role:
+    if mentions(main_issue, "σπουδ") or mentions(focus, "σπουδ") or mentions(role, "φοιτη"):
         return (
             base
             + "Ποιες είναι οι στιγμές που νιώθεις το μεγαλύτερο άγχος σε σχέση με τις σπουδές; "
               "Όταν διαβάζεις, όταν δίνεις εξετάσεις ή όταν σκέφτεσαι το μέλλον;"
         )
 
-    if "αυτοεκτίμη" in main_issue or "αυτοπεπ" in main_issue or "αυτοεκτιμ" in focus:
+    if mentions(main_issue, "αυτοεκτίμη", "αυτοπεπ") or mentions(focus, "αυτοεκτιμ"):
         return (
             base
             + "Αν σκεφτείς την εικόνα που έχεις για τον εαυτό σου, ποια σκέψη νιώθεις ότι σε πληγώνει περισσότερο αυτή την περίοδο;"
         )
 
-    if "οικογέν" in main_issue or "γονε" in focus:
+    if mentions(main_issue, "οικογέν") or mentions(focus, "γονε"):
         return (
             base
             + "Πώς θα περιέγραφες την ατμόσφαιρα στο σπίτι; Υπάρχει κάποια σχέση στην οικογένεια που σε δυσκολεύει περισσότερο;"
         )
 
-    if "σχέσ" in main_issue or "σχεσ" in focus:
+    if mentions(main_issue, "σχέσ") or mentions(focus, "σχέσ"):
         return (
             base
             + "Όταν σκέφτεσαι τις σχέσεις σου με τους άλλους, τι σε δυσκολεύει περισσότερο: η εμπιστοσύνη, η απόρριψη, οι συγκρούσεις ή κάτι άλλο;"
         )
 
-    if "διάθεση" in main_issue or "θλίψ" in main_issue or "κατάθλιψ" in focus:
+    if mentions(main_issue, "διάθεση", "θλίψ") or mentions(focus, "κατάθλιψ"):
         return (
             base
             + "Υπάρχουν στιγμές μέσα στη μέρα που νιώθεις ότι η διάθεσή σου πέφτει περισσότερο; Ποιες είναι αυτές;"
@@ -0,0 +1,186 @@
+# app/semantic_cache.py
+"""
+Τοπική «σημασιολογική» cache απαντήσεων του LLM, χωρίς δίκτυο.
+
+Η cache ακριβούς ταιριάσματος (llm_cache) χάνει σχεδόν ίδια check-ins, π.χ.
+«έχω άγχος για τις εξετάσεις» / «έχω πολύ άγχος με τις εξετάσεις».
+Εδώ κάθε μήνυμα γίνεται hashed διάνυσμα από character 3-grams των
+κανονικοποιημένων tokens (άρα και Greeklish → ελληνικά), με L2 κανονικοποίηση.
+Μια απάντηση ξαναχρησιμοποιείται όταν:
+
+- η ομοιότητα συνημιτόνου με αποθηκευμένο μήνυμα είναι ≥ threshold, και
+- ταιριάζει το «κλειδί καταστάσεως»: ίδια ζώνη διάθεσης (όπως στους κανόνες:
+  <30, <70, αλλιώς), ίδιος ύπνος, νερό και προφίλ, ίδια πολικότητα λεξικού
+  και ίδια άρνηση («δεν», «μην» …), ώστε «δεν έχω άγχος» να μην παίρνει
+  την απάντηση του «έχω άγχος».
+
+Τα διανύσματα ζουν σε έναν προδεσμευμένο πίνακα float32 (max_entries × dim),
+οπότε η μνήμη είναι φραγμένη· όταν γεμίσει, αντικαθίσταται η εγγραφή που
+χρησιμοποιήθηκε λιγότερο πρόσφατα.
+
+Χρήση:
+    cache = resources.get("semantic_cache")
+    reply = cache.get(text, mood, sleep, water, profile)
+"""
+import hashlib
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from lexicon_sentiment import analyze_lexicon_sentiment
+from text_normalization import NEGATIONS, normalize_text
+
+SEMANTIC_CACHE_DIM = 1024
+SEMANTIC_CACHE_THRESHOLD = 0.8
+SEMANTIC_CACHE_MAX_ENTRIES = 2_000
+NGRAM = 3
+
+def mood_band(mood: int) -> str:
+    if mood < 30:
+        return "low"
+    if mood < 70:
+        return "mid"
+    return "high"
+
+
+def text_vector(text: str, dim: int = SEMANTIC_CACHE_DIM) -> np.ndarray:
+    """
+    Hashed διάνυσμα από character n-grams (με κενό στα όρια κάθε λέξης),
+    βάρος 1 + log(tf), L2-κανονικοποιημένο. Μηδενικό για κενό κείμενο.
+    """
+    counts: dict[int, int] = {}
+    for tok in normalize_text(text).tokens:
+        padded = f" {tok} "
+        for i in range(len(padded) - NGRAM + 1):
+            h = zlib.crc32(padded[i:i + NGRAM].encode("utf-8")) % dim
+            counts[h] = counts.get(h, 0) + 1
+
+    vec = np.zeros(dim, dtype=np.float32)
+    if counts:
+        idx = np.fromiter(counts, dtype=np.int64, count=len(counts))
+        tf = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+        vec[idx] = 1.0 + np.log(tf)
+        vec /= np.linalg.norm(vec)
+    return vec
+
+
+def state_key(text: str, mood: int, sleep: str, water: str, profile: dict | None) -> str:
+    """
+    Ό,τι πρέπει να είναι ίδιο για να ξαναχρησιμοποιηθεί μια απάντηση.
+    """
+    profile_part = ""
+    if profile:
+        profile_part = "|".join(
+            str(profile.get(k, "-")) for k in ("role", "main_issue", "focus")
+        )
+    negated = bool(NEGATIONS.intersection(normalize_text(text).tokens))
+    polarity = analyze_lexicon_sentiment(text)["label"]
+    raw = "\x00".join([mood_band(mood), sleep, water, profile_part, polarity, str(negated)])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class SemanticCache:
+    def __init__(
+        self,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES,
+        dim: int = SEMANTIC_CACHE_DIM,
+    ):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.dim = dim
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._vectors = np.zeros((max_entries, dim), dtype=np.float32)
+        self._keys = np.full(max_entries, -1, dtype=np.int64)     # id κλειδιού καταστάσεως
+        self._last_access = np.zeros(max_entries, dtype=np.float64)
+        self._replies: list[str | None] = [None] * max_entries
+        self._key_ids: dict[str, int] = {}
+        self._next_key_id = 0
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def _nearest(self, vec: np.ndarray, key_id: int) -> tuple[int, float]:
+        rows = np.flatnonzero(self._keys[: self._size] == key_id)
+        if rows.size == 0:
+            return -1, 0.0
+        sims = self._vectors[rows] @ vec
+        best = int(np.argmax(sims))
+        return int(rows[best]), float(sims[best])
+
+    def lookup(self, text: str, mood: int, sleep: str, water: str,
+               profile: dict | None = None) -> tuple[str | None, float]:
+        """
+        (απάντηση ή None, ομοιότητα του πλησιέστερου μηνύματος).
+        """
+        vec = text_vector(text, self.dim)
+        key = state_key(text, mood, sleep, water, profile)
+        with self._lock:
+            key_id = self._key_ids.get(key)
+            row, sim = (-1, 0.0) if key_id is None or not vec.any() else self._nearest(vec, key_id)
+            if row < 0 or sim < self.threshold:
+                self.misses += 1
+                return None, sim
+            self._last_access[row] = time.monotonic()
+            self.hits += 1
+            return self._replies[row], sim
+
+    def get(self, text: str, mood: int, sleep: str, water: str,
+            profile: dict | None = None) -> str | None:
+        return self.lookup(text, mood, sleep, water, profile)[0]
+
+    def put(self, text: str, mood: int, sleep: str, water: str,
+            profile: dict | None, reply: str) -> None:
+        vec = text_vector(text, self.dim)
+        if not vec.any():
+            return
+        key = state_key(text, mood, sleep, water, profile)
+        with self._lock:
+            key_id = self._key_ids.get(key)
+            if key_id is None:
+                key_id = self._key_ids[key] = self._next_key_id
+                self._next_key_id += 1
+            # Σχεδόν ίδιο μήνυμα υπάρχει ήδη → ανανεώνεται η ίδια εγγραφή
+            row, sim = self._nearest(vec, key_id)
+            if row < 0 or sim < 0.999:
+                if self._size < self.max_entries:
+                    row = self._size
+                    self._size += 1
+                else:
+                    row = int(np.argmin(self._last_access))
+                    self.evictions += 1
+            self._vectors[row] = vec
+            self._keys[row] = key_id
+            self._last_access[row] = time.monotonic()
+            self._replies[row] = reply
+
+            # Τα ids κλειδιών που δεν χρησιμοποιούνται πια ξεχνιούνται
+            if len(self._key_ids) > 2 * self.max_entries:
+                live = set(self._keys[: self._size].tolist())
+                self._key_ids = {k: i for k, i in self._key_ids.items() if i in live}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._keys[:] = -1
+            self._replies = [None] * self.max_entries
+            self._key_ids.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "evictions": self.evictions,
+            "threshold": self.threshold,
+            "memory_bytes": self._vectors.nbytes + self._keys.nbytes + self._last_access.nbytes,
+        }
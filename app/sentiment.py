@@ -1,17 +1,244 @@
-from transformers import pipeline
+import math
+import os
+import re
+
+import resources
+from model_worker import ModelWorkerClient
+from sentiment_backends import create_pipeline
+from sentiment_batcher import SentimentBatcher
+
+# "local" : το μοντέλο φορτώνεται μέσα στη διεργασία (προεπιλογή)
+# "worker": το μοντέλο ζει στον κοινό model_worker (μία φορά για όλες τις
+#           διεργασίες)· ρητή επιλογή όταν τρέχουν πολλές διεργασίες Streamlit
+SENTIMENT_MODE = os.environ.get("SENTIMENT_MODE", "local")
+
+# Long-text mode: παράθυρα από ολόκληρες προτάσεις, αρκετά μικρά ώστε να μην
+# κόβονται στα 512 tokens του μοντέλου (510 + [CLS]/[SEP]) και το attention
+# να μένει φθηνό. Τα tokens μετριούνται με estimate_tokens (ο tokenizer του
+# μοντέλου, αν είναι φορτωμένο, αλλιώς εκτίμηση ανά σύστημα γραφής).
+SENTIMENT_WINDOW_TOKENS = int(os.environ.get("SENTIMENT_WINDOW_TOKENS", "510"))
+SENTIMENT_WINDOW_OVERLAP = 1                    # κοινές προτάσεις διαδοχικών παραθύρων
+# Σκληρό όριο εισόδου: ό,τι περισσεύει δεν αναλύεται (το αποτέλεσμα έχει truncated=True)
+SENTIMENT_MAX_INPUT_CHARS = int(os.environ.get("SENTIMENT_MAX_INPUT_CHARS", "20000"))
+
+# Χαρακτήρες ανά WordPiece token σε λατινικές λέξεις (αγγλικά ~4, Greeklish
+# λιγότεροι, αφού οι λέξεις του λείπουν από το λεξιλόγιο του μοντέλου)
+LATIN_CHARS_PER_TOKEN = 3.0
+_LATIN_RUN_RE = re.compile(r"[A-Za-z]+")
+_WORD_RE = re.compile(r"\S+")
+
+# Πρόταση = κείμενο μέχρι . ! ? ; (ελληνικό ερωτηματικό) … ή αλλαγή γραμμής
+_SENTENCE_RE = re.compile(r"[^.!?;…\n]+(?:[.!?;…]+|$)", re.MULTILINE)
+
+
+def _create_pipeline():
+    # Το transformers (και το torch/onnxruntime) φορτώνονται μόνο όταν χρειαστεί
+    # το μοντέλο· το backend ορίζεται από το SENTIMENT_BACKEND
+    return create_pipeline()
+
+
+def _create_batcher():
+    # Το pipeline φορτώνεται στο πρώτο batch, μέσα στον worker
+    return SentimentBatcher(lambda: resources.get("sentiment_pipeline"))
+
+
+resources.register("sentiment_pipeline", _create_pipeline)
+resources.register("sentiment_batcher", _create_batcher)
+resources.register("sentiment_worker", ModelWorkerClient)
+
+
+def _format(result: dict) -> dict:
+    return {
+        "label": result["label"],
+        "score": round(result["score"], 2),
+    }
 
-sentiment_pipeline = pipeline("sentiment-analysis")
 
 def analyze_sentiment(text):
     """
     Παίρνει μια πρόταση (string) και επιστρέφει:
     - Το συναίσθημα (label: POSITIVE ή NEGATIVE)
     - Το σκορ εμπιστοσύνης του μοντέλου
+    Ταυτόχρονες κλήσεις (π.χ. από διαφορετικά sessions) ενώνονται σε ένα
+    batch από τον SentimentBatcher — στον κοινό model worker ή τοπικά,
+    ανάλογα με το SENTIMENT_MODE.
+    Το μοντέλο είναι μόνο αγγλικό· για μηνύματα χρηστών σε οποιαδήποτε
+    γλώσσα βλ. language_router.route_sentiment.
+    """
+
+    if SENTIMENT_MODE == "worker":
+        result = resources.get("sentiment_worker").analyze([text])[0]
+    else:
+        result = resources.get("sentiment_batcher").submit(text).result()
+    return _format(result)
+
+
+def analyze_sentiment_batch(texts, batch_size=32):
+    """
+    Όπως το analyze_sentiment, για λίστα κειμένων που είναι ήδη διαθέσιμη
+    (π.χ. offline ανάλυση). Τοπικά πάει κατευθείαν στο pipeline, σε batches
+    των batch_size· στον worker τα batches τα σχηματίζει ο ίδιος.
+    """
+    if SENTIMENT_MODE == "worker":
+        results = resources.get("sentiment_worker").analyze(list(texts))
+    else:
+        sentiment_pipeline = resources.get("sentiment_pipeline")
+        results = sentiment_pipeline(list(texts), batch_size=batch_size, truncation=True)
+    return [_format(result) for result in results]
+
+
+def sentiment_health() -> dict:
+    """
+    Κατάσταση του model worker (status, threads, χρόνος φόρτωσης, batches),
+    ή του τοπικού batcher σε SENTIMENT_MODE=local.
+    """
+    if SENTIMENT_MODE == "worker":
+        return resources.get("sentiment_worker").health()
+    loaded = resources.is_loaded("sentiment_pipeline")
+    return {"status": "ready" if loaded else "idle", "pid": os.getpid(),
+            **resources.get("sentiment_batcher").stats()}
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Tokens του κειμένου για το μοντέλο (χωρίς [CLS]/[SEP]). Αν το pipeline
+    είναι φορτωμένο σε αυτή τη διεργασία, μετράει ο tokenizer του.
+    Αλλιώς εκτίμηση ανά σύστημα γραφής: οι λατινικές λέξεις με
+    LATIN_CHARS_PER_TOKEN, και κάθε άλλος μη κενός χαρακτήρας (ελληνικά
+    γράμματα, στίξη, ψηφία) ως ένα token — για τα ελληνικά αυτό είναι άνω
+    όριο, αφού το λεξιλόγιο του μοντέλου έχει ένα token ανά γράμμα.
     """
+    if resources.is_loaded("sentiment_pipeline"):
+        tokenizer = getattr(resources.get("sentiment_pipeline"), "tokenizer", None)
+        if tokenizer is not None:
+            return len(tokenizer.tokenize(text))
+
+    latin = _LATIN_RUN_RE.findall(text)
+    other = len(text) - sum(c.isspace() for c in text) - sum(map(len, latin))
+    return other + sum(math.ceil(len(run) / LATIN_CHARS_PER_TOKEN) for run in latin)
+
+
+def _token_cut(sentence: str) -> int:
+    """
+    Θέση κοπής ώστε το πρώτο κομμάτι να χωρά στα SENTIMENT_WINDOW_TOKENS,
+    στην αρχή της λέξης που ξεπερνά το όριο (ή μέσα στην πρώτη λέξη, αν
+    ξεπερνά μόνη της το όριο: κάθε token καλύπτει τουλάχιστον έναν χαρακτήρα).
+    """
+    count = 0
+    for i, word in enumerate(_WORD_RE.finditer(sentence)):
+        count += estimate_tokens(word.group())
+        if count > SENTIMENT_WINDOW_TOKENS:
+            return word.start() if i else word.start() + SENTIMENT_WINDOW_TOKENS
+    return len(sentence)
+
+
+def split_sentences(text: str) -> list[tuple[int, str]]:
+    """
+    (θέση αρχής, πρόταση) για κάθε μη κενή πρόταση του κειμένου. Προτάσεις
+    μεγαλύτερες από SENTIMENT_WINDOW_TOKENS σπάνε σε όρια λέξεων.
+    """
+    sentences = []
+    for match in _SENTENCE_RE.finditer(text):
+        start, sentence = match.start(), match.group()
+        while estimate_tokens(sentence) > SENTIMENT_WINDOW_TOKENS:
+            cut = _token_cut(sentence)
+            sentences.append((start, sentence[:cut]))
+            start, sentence = start + cut, sentence[cut:]
+        sentences.append((start, sentence))
+
+    # Θέση της πρώτης μη κενής θέσης κάθε πρότασης, χωρίς τα κενά γύρω της
+    return [
+        (start + len(sentence) - len(sentence.lstrip()), sentence.strip())
+        for start, sentence in sentences if sentence.strip()
+    ]
+
+
+def sentence_windows(sentences: list[str]) -> list[range]:
+    """
+    Sliding windows πάνω στις προτάσεις: διαδοχικές προτάσεις μέχρι
+    SENTIMENT_WINDOW_TOKENS (εκτιμώμενα) tokens, με SENTIMENT_WINDOW_OVERLAP κοινές
+    προτάσεις ανάμεσα σε γειτονικά παράθυρα. Επιστρέφει τα εύρη δεικτών.
+    """
+    windows = []
+    start = 0
+    while start < len(sentences):
+        end, size = start, 0
+        while end < len(sentences):
+            size += estimate_tokens(sentences[end])
+            if end > start and size > SENTIMENT_WINDOW_TOKENS:
+                break
+            end += 1
+        windows.append(range(start, end))
+        if end == len(sentences):
+            break
+        start = max(start + 1, end - SENTIMENT_WINDOW_OVERLAP)
+    return windows
+
+
+def _long_result(p_positive: float) -> tuple[str, float]:
+    """
+    Ετικέτα και εμπιστοσύνη (0.5–1, όπως το analyze_sentiment) από την
+    πιθανότητα θετικού· 0.5 (στα 3 δεκαδικά) σημαίνει ισοπαλία → NEUTRAL.
+    """
+    p_positive = round(p_positive, 3)
+    if p_positive > 0.5:
+        return "POSITIVE", round(p_positive, 2)
+    if p_positive < 0.5:
+        return "NEGATIVE", round(1 - p_positive, 2)
+    return "NEUTRAL", 0.5
+
+
+def analyze_sentiment_long(text):
+    """
+    Long-text mode για μεγάλα κείμενα (π.χ. ημερολόγιο). Αντί να κοπεί το
+    κείμενο στα 512 tokens, χωρίζεται σε παράθυρα προτάσεων που περνούν από
+    το μοντέλο σε ένα batch. Κάθε πρόταση παίρνει τον μέσο όρο των
+    παραθύρων που την περιέχουν, και το μήνυμα τον μέσο όρο των παραθύρων
+    σταθμισμένο με το μήκος τους. Ο μέσος όρος είναι πάνω στην πιθανότητα
+    θετικού κάθε παραθύρου.
+
+    Επιστρέφει:
+    - label / score: όπως το analyze_sentiment, για όλο το κείμενο· το score
+      είναι η εμπιστοσύνη (0.5–1) της ετικέτας. Ισοπαλία (π.χ. ένα θετικό κι
+      ένα αρνητικό μισό) ή κενό κείμενο → NEUTRAL με score 0.5
+    - polarity: από -1 (αρνητικό) έως 1 (θετικό)
+    - timeline: [{"start", "sentence", "label", "score"}] ανά πρόταση
+    - windows: πόσα παράθυρα πέρασαν από το μοντέλο
+    - truncated: True αν το κείμενο ξεπέρασε το SENTIMENT_MAX_INPUT_CHARS
+    """
+    truncated = len(text) > SENTIMENT_MAX_INPUT_CHARS
+    sentences = split_sentences(text[:SENTIMENT_MAX_INPUT_CHARS])
+    if not sentences:
+        return {"label": "NEUTRAL", "score": 0.5, "polarity": 0.0,
+                "timeline": [], "windows": 0, "truncated": truncated}
+
+    texts = [sentence for _, sentence in sentences]
+    windows = sentence_windows(texts)
+    results = analyze_sentiment_batch([" ".join(texts[i] for i in window) for window in windows])
+    # Πιθανότητα θετικού ανά παράθυρο (το μοντέλο δίνει την εμπιστοσύνη της ετικέτας του)
+    positive = [r["score"] if r["label"] == "POSITIVE" else 1 - r["score"] for r in results]
+
+    sentence_scores: list[list[float]] = [[] for _ in sentences]
+    weighted, total_chars = 0.0, 0
+    for window, p_positive in zip(windows, positive):
+        chars = sum(len(texts[i]) for i in window)
+        weighted += p_positive * chars
+        total_chars += chars
+        for i in window:
+            sentence_scores[i].append(p_positive)
+
+    timeline = []
+    for (start, sentence), scores in zip(sentences, sentence_scores):
+        label, score = _long_result(sum(scores) / len(scores))
+        timeline.append({"start": start, "sentence": sentence, "label": label, "score": score})
 
-    result = sentiment_pipeline(text)[0]
+    p_positive = weighted / total_chars
+    label, score = _long_result(p_positive)
     return {
-        "label" : result["label"],
-        "score" : round(result["score"], 2)
-                    }
-                    
\ No newline at end of file
+        "label": label,
+        "score": score,
+        "polarity": round(2 * p_positive - 1, 3),
+        "timeline": timeline,
+        "windows": len(windows),
+        "truncated": truncated,
+    }
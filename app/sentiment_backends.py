@@ -0,0 +1,174 @@
+# app/sentiment_backends.py
+"""
+Backends για το transformer sentiment μοντέλο (DistilBERT SST-2) στην CPU.
+
+Όλα επιστρέφουν ένα HF pipeline("sentiment-analysis"), οπότε το
+analyze_sentiment και ο SentimentBatcher δεν αλλάζουν:
+
+- "torch"       : fp32 PyTorch (η αρχική συμπεριφορά)
+- "torch-int8"  : dynamic int8 quantization των nn.Linear (μόνο torch)
+- "onnx"        : export σε ONNX, εκτέλεση με ONNX Runtime (optimum[onnxruntime])
+- "onnx-int8"   : το ONNX μοντέλο με dynamic int8 quantization
+- "tiny"        : distilled γραμμικό μοντέλο (tiny_sentiment), μόνο NumPy·
+                  χτίζεται offline με python app/distill_sentiment.py
+
+Το backend επιλέγεται με τη μεταβλητή SENTIMENT_BACKEND. Τα μετατρεμμένα
+μοντέλα αποθηκεύονται στο models/, σε φάκελο με τις εκδόσεις των
+βιβλιοθηκών που τα έφτιαξαν, και ξαναχρησιμοποιούνται, οπότε η μετατροπή
+γίνεται μία φορά ανά έκδοση. Κάθε φάκελος χτίζεται σε προσωρινό φάκελο και
+μετονομάζεται ατομικά, ώστε μια διακοπή ή δύο διεργασίες μαζί να μην
+αφήνουν μισό μοντέλο. Το int8 PyTorch αποθηκεύεται ως state_dict (φορτώνεται
+με weights_only=True) και το quantization ξαναγίνεται στο φόρτωμα.
+
+Χρήση:
+    pipe = create_pipeline("onnx-int8")
+    pipe("I am happy")   # [{"label": "POSITIVE", "score": 0.99}]
+"""
+import os
+import platform
+import shutil
+import tempfile
+from importlib import metadata
+
+SENTIMENT_MODEL = "distilbert-base-uncased-finetuned-sst-2-english"
+SENTIMENT_BACKEND = os.environ.get("SENTIMENT_BACKEND", "torch")
+BACKENDS = ("torch", "torch-int8", "onnx", "onnx-int8", "tiny")
+
+BASE_DIR = os.path.dirname(__file__)
+MODEL_CACHE_DIR = os.path.join(BASE_DIR, "..", "models")
+
+
+def _cache_path(backend: str, *modules) -> str:
+    """
+    Φάκελος cache του backend, με τις εκδόσεις των modules στο όνομα
+    (π.χ. ...-torch-int8-torch2.3.1-transformers4.44.0): μετά από αναβάθμιση
+    το μοντέλο ξαναμετατρέπεται αντί να φορτωθεί ασύμβατο.
+    """
+    versions = "-".join(
+        f"{m.__name__}{getattr(m, '__version__', None) or metadata.version(m.__name__)}"
+        for m in modules
+    )
+    return os.path.join(MODEL_CACHE_DIR, f"{SENTIMENT_MODEL}-{backend}-{versions}")
+
+
+def _build_cached(path: str, build) -> None:
+    """
+    build(φάκελος) γράφει το μετατρεμμένο μοντέλο σε προσωρινό φάκελο, που
+    μετονομάζεται ατομικά σε path. Αν άλλη διεργασία πρόλαβε, κρατιέται το δικό της.
+    """
+    os.makedirs(MODEL_CACHE_DIR, exist_ok=True)
+    tmp = tempfile.mkdtemp(prefix=".tmp-", dir=MODEL_CACHE_DIR)
+    try:
+        build(tmp)
+        os.rename(tmp, path)
+    except OSError:
+        if not os.path.isdir(path):
+            raise
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _quantize(model):
+    import torch
+
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _torch_int8_model():
+    import torch
+    import transformers
+    from transformers import AutoConfig, AutoModelForSequenceClassification
+
+    cache_dir = _cache_path("torch-int8", torch, transformers)
+    if not os.path.isdir(cache_dir):
+        def build(tmp):
+            model = AutoModelForSequenceClassification.from_pretrained(SENTIMENT_MODEL).eval()
+            model.config.save_pretrained(tmp)
+            torch.save(_quantize(model).state_dict(), os.path.join(tmp, "model_int8.pt"))
+
+        _build_cached(cache_dir, build)
+
+    # Μόνο tensors (όχι pickled κώδικας): ίδια αρχιτεκτονική από το config,
+    # quantization της δομής, και φόρτωμα των int8 βαρών από πάνω
+    config = AutoConfig.from_pretrained(cache_dir)
+    model = _quantize(AutoModelForSequenceClassification.from_config(config).eval())
+    state = torch.load(os.path.join(cache_dir, "model_int8.pt"), weights_only=True)
+    model.load_state_dict(state)
+    return model
+
+
+def _session_options(threads: int | None):
+    if threads is None:
+        return None
+    import onnxruntime
+
+    options = onnxruntime.SessionOptions()
+    options.intra_op_num_threads = threads
+    options.inter_op_num_threads = 1
+    return options
+
+
+def _onnx_model(quantize: bool, threads: int | None = None):
+    import onnxruntime
+    import optimum
+    import torch
+    import transformers
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+
+    modules = (torch, transformers, optimum, onnxruntime)
+    onnx_dir = _cache_path("onnx", *modules)
+    if not os.path.isdir(onnx_dir):
+        def export(tmp):
+            model = ORTModelForSequenceClassification.from_pretrained(SENTIMENT_MODEL, export=True)
+            model.save_pretrained(tmp)
+
+        _build_cached(onnx_dir, export)
+    options = _session_options(threads)
+    if not quantize:
+        return ORTModelForSequenceClassification.from_pretrained(onnx_dir, session_options=options)
+
+    int8_dir = _cache_path("onnx-int8", *modules)
+    if not os.path.isdir(int8_dir):
+        from optimum.onnxruntime import ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+        def quantize_onnx(tmp):
+            quantizer = ORTQuantizer.from_pretrained(onnx_dir)
+            if platform.machine().lower() in ("arm64", "aarch64"):
+                qconfig = AutoQuantizationConfig.arm64(is_static=False, per_channel=False)
+            else:
+                qconfig = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+            quantizer.quantize(save_dir=tmp, quantization_config=qconfig)
+
+        _build_cached(int8_dir, quantize_onnx)
+    return ORTModelForSequenceClassification.from_pretrained(
+        int8_dir, file_name="model_quantized.onnx", session_options=options
+    )
+
+
+def create_pipeline(backend: str = SENTIMENT_BACKEND, threads: int | None = None):
+    """
+    HF sentiment pipeline για το ζητούμενο backend (βλ. BACKENDS).
+    threads: intra-op threads του ONNX Runtime (για το torch βλ.
+    model_worker.configure_threads).
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Άγνωστο SENTIMENT_BACKEND: {backend!r} (επιλογές: {', '.join(BACKENDS)})")
+
+    if backend == "tiny":
+        # Χωρίς transformers/torch: το TinySentimentModel δέχεται τις ίδιες κλήσεις
+        from tiny_sentiment import load_model
+
+        return load_model()
+
+    from transformers import AutoTokenizer, pipeline
+
+    if backend == "torch":
+        return pipeline("sentiment-analysis", model=SENTIMENT_MODEL)
+
+    if backend == "torch-int8":
+        model = _torch_int8_model()
+    else:
+        model = _onnx_model(quantize=backend == "onnx-int8", threads=threads)
+    tokenizer = AutoTokenizer.from_pretrained(SENTIMENT_MODEL)
+    return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer)
@@ -0,0 +1,91 @@
+# app/sentiment_batcher.py
+"""
+Micro-batching μπροστά από το HF sentiment pipeline.
+
+Ένα forward pass για ένα μόνο κείμενο αφήνει αχρησιμοποίητο το μεγαλύτερο
+μέρος της CPU (οι πολλαπλασιασμοί πινάκων κλιμακώνονται πολύ καλύτερα σε
+batch). Εδώ οι ταυτόχρονοι callers βάζουν τα κείμενά τους σε ουρά και ένας
+worker τα μαζεύει:
+
+- μέχρι max_batch_size κείμενα, ή
+- μέχρι να περάσουν max_wait_ms από το πρώτο κείμενο του batch,
+
+τρέχει ένα padded forward pass για όλα και επιστρέφει κάθε αποτέλεσμα στο
+Future του caller. Σφάλμα του pipeline περνά σε όλα τα Futures του batch.
+
+Χρήση:
+    batcher = SentimentBatcher(lambda: resources.get("sentiment_pipeline"))
+    result = batcher.submit("I am happy").result()   # {"label": ..., "score": ...}
+"""
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable
+
+SENTIMENT_MAX_BATCH_SIZE = int(os.environ.get("SENTIMENT_MAX_BATCH_SIZE", "32"))
+SENTIMENT_MAX_WAIT_MS = float(os.environ.get("SENTIMENT_MAX_WAIT_MS", "5"))
+
+
+class SentimentBatcher:
+    def __init__(
+        self,
+        get_pipeline: Callable[[], Any],
+        max_batch_size: int = SENTIMENT_MAX_BATCH_SIZE,
+        max_wait_ms: float = SENTIMENT_MAX_WAIT_MS,
+    ):
+        self.get_pipeline = get_pipeline
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_ms / 1000
+        self.batches = 0
+        self.items = 0
+
+        self._queue: queue.Queue[tuple[str, Future]] = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="sentiment-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, text: str) -> Future:
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def _collect(self) -> list[tuple[str, Future]]:
+        # Μπλοκάρει μέχρι το πρώτο κείμενο, μετά μαζεύει έως το όριο ή το deadline
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait_s
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0
+                             else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            batch = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            texts = [text for text, _ in batch]
+            try:
+                results = self.get_pipeline()(texts, batch_size=len(texts), truncation=True)
+            except Exception as exc:
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+
+            self.batches += 1
+            self.items += len(batch)
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": round(self.items / self.batches, 2) if self.batches else None,
+            "queued": self._queue.qsize(),
+        }
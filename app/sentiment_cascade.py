@@ -0,0 +1,138 @@
+# app/sentiment_cascade.py
+"""
+Cascade ταξινόμησης συναισθήματος: πρώτα το λεξικό, transformer μόνο αν χρειαστεί.
+
+Το analyze_lexicon_sentiment κοστίζει μικροδευτερόλεπτα, ενώ ένα forward
+pass του transformer δεκάδες ms. Για τα περισσότερα μηνύματα το λεξικό
+δίνει ήδη καθαρό σήμα, οπότε ο transformer τρέχει μόνο όταν το λεξικό:
+
+- "neutral"      : ίσος αριθμός θετικών/αρνητικών όρων (ή κανένας),
+- "low_coverage" : λίγοι όροι του μηνύματος υπάρχουν στο λεξικό,
+- "ambiguous"    : θετικοί και αρνητικοί όροι χωρίς καθαρή υπεροχή,
+- "negation"     : άρνηση στο μήνυμα (το λεξικό δεν αντιστρέφει πολικότητα).
+
+Κάθε απάντηση κρατά ποιο επίπεδο ("lexicon" / "transformer") την έδωσε και
+γιατί· τα stats() δίνουν τα ποσοστά ανά επίπεδο και αιτία.
+
+Τα όρια ρυθμίζονται με μεταβλητές περιβάλλοντος (CASCADE_*) ή στον constructor.
+
+Χρήση:
+    cascade = resources.get("sentiment_cascade")
+    cascade.classify("Είμαι πολύ χαρούμενη σήμερα")
+    # {"label": "POSITIVE", "score": 1.0, "tier": "lexicon", "reason": "confident"}
+"""
+import os
+import threading
+import time
+from collections import Counter
+from typing import Callable
+
+import resources
+from lexicon_sentiment import analyze_lexicon_sentiment, polarity_margin
+from sentiment import analyze_sentiment
+from text_normalization import NEGATIONS, normalize_text
+
+# Ελάχιστο περιθώριο |θετικοί − αρνητικοί| / (θετικοί + αρνητικοί)
+CASCADE_MIN_MARGIN = float(os.environ.get("CASCADE_MIN_MARGIN", "0.5"))
+# Ελάχιστο ποσοστό tokens του μηνύματος με πολικότητα στο λεξικό
+CASCADE_MIN_COVERAGE = float(os.environ.get("CASCADE_MIN_COVERAGE", "0.1"))
+# Ελάχιστος αριθμός όρων με πολικότητα
+CASCADE_MIN_MATCHED = int(os.environ.get("CASCADE_MIN_MATCHED", "1"))
+CASCADE_ESCALATE_NEGATION = os.environ.get("CASCADE_ESCALATE_NEGATION", "1") == "1"
+
+TIER_LEXICON = "lexicon"
+TIER_TRANSFORMER = "transformer"
+
+
+def lexicon_decision(
+    text: str,
+    min_margin: float = CASCADE_MIN_MARGIN,
+    min_coverage: float = CASCADE_MIN_COVERAGE,
+    min_matched: int = CASCADE_MIN_MATCHED,
+    escalate_negation: bool = CASCADE_ESCALATE_NEGATION,
+) -> tuple[dict | None, str]:
+    """
+    (αποτέλεσμα, αιτία): αποτέλεσμα σε μορφή analyze_sentiment αν το λεξικό
+    αρκεί (αιτία "confident"), αλλιώς None και η αιτία κλιμάκωσης.
+    """
+    lexicon = analyze_lexicon_sentiment(text)
+    tokens = normalize_text(text).tokens
+    matched = lexicon["positive"] + lexicon["negative"]
+
+    if lexicon["label"] == "neutral":
+        return None, "neutral"
+    if matched < min_matched or matched / len(tokens) < min_coverage:
+        return None, "low_coverage"
+    margin = polarity_margin(lexicon)
+    if margin < min_margin:
+        return None, "ambiguous"
+    if escalate_negation and NEGATIONS.intersection(tokens):
+        return None, "negation"
+
+    # Σκορ στο [0.5, 1]: 1 όταν όλοι οι όροι έχουν την ίδια πολικότητα
+    return {"label": lexicon["label"].upper(), "score": round(0.5 + margin / 2, 2)}, "confident"
+
+
+class SentimentCascade:
+    def __init__(
+        self,
+        transformer: Callable[[str], dict] = analyze_sentiment,
+        min_margin: float = CASCADE_MIN_MARGIN,
+        min_coverage: float = CASCADE_MIN_COVERAGE,
+        min_matched: int = CASCADE_MIN_MATCHED,
+        escalate_negation: bool = CASCADE_ESCALATE_NEGATION,
+    ):
+        self.transformer = transformer
+        self.min_margin = min_margin
+        self.min_coverage = min_coverage
+        self.min_matched = min_matched
+        self.escalate_negation = escalate_negation
+
+        self._tiers: Counter[str] = Counter()
+        self._reasons: Counter[str] = Counter()
+        self._seconds: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    def classify(self, text: str) -> dict:
+        """
+        Όπως το analyze_sentiment, με δύο επιπλέον πεδία: "tier" και "reason".
+        """
+        start = time.perf_counter()
+        result, reason = lexicon_decision(
+            text, self.min_margin, self.min_coverage, self.min_matched, self.escalate_negation
+        )
+        tier = TIER_LEXICON
+        if result is None:
+            tier = TIER_TRANSFORMER
+            result = self.transformer(text)
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self._tiers[tier] += 1
+            self._reasons[reason] += 1
+            self._seconds[tier] += elapsed
+        return {**result, "tier": tier, "reason": reason}
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = sum(self._tiers.values())
+            return {
+                "messages": total,
+                "lexicon_share": round(self._tiers[TIER_LEXICON] / total, 3) if total else None,
+                "tiers": dict(self._tiers),
+                "reasons": dict(self._reasons),
+                "mean_ms": {
+                    tier: round(self._seconds[tier] / count * 1000, 2)
+                    for tier, count in self._tiers.items()
+                },
+            }
+
+
+resources.register("sentiment_cascade", SentimentCascade)
+
+
+def analyze_sentiment_cascade(text: str) -> dict:
+    """
+    Συναίσθημα μηνύματος μέσω του κοινού cascade (βλ. SentimentCascade.classify).
+    """
+    return resources.get("sentiment_cascade").classify(text)
@@ -0,0 +1,359 @@
+# app/storage.py
+"""
+Αποθήκευση όλων των δεδομένων της εφαρμογής σε μία SQLite βάση (WAL).
+
+Πριν, κάθε store ήταν ξεχωριστό αρχείο (user_data.csv, support_phrases.csv,
+exercises_log.csv, user_history.json, user_profile.json): κάποιες εγγραφές
+ξαναέγραφαν όλο το αρχείο, κάθε ανάγνωση φόρτωνε τα πάντα και ταυτόχρονα
+sessions μπορούσαν να το χαλάσουν. Εδώ:
+
+- WAL: οι αναγνώσεις δεν μπλοκάρουν την εγγραφή (και αντίστροφα), και
+  busy_timeout για ταυτόχρονες εγγραφές από πολλές διεργασίες,
+- κάθε εγγραφή είναι ένα INSERT (όχι ξαναγράψιμο αρχείου),
+- οι πίνακες έχουν ευρετήριο (user_id, timestamp), οπότε «τα τελευταία N»
+  ή «το διάστημα Χ–Υ» ενός χρήστη διαβάζουν μόνο αυτές τις γραμμές,
+- προφίλ και ιστορικό ευεξίας: JSON έγγραφα ανά (user_id, kind).
+
+Όλη η πρόσβαση περνά από τον Storage (repository). Τα παλιά αρχεία
+μεταφέρονται μία φορά με migrate_legacy_files() (αυτόματα στην πρώτη
+φόρτωση του πόρου "storage", ή χειροκίνητα).
+
+Χρήση:
+    python app/storage.py migrate          # μεταφορά των παλιών CSV/JSON
+    storage = get_storage()
+    storage.add_checkin(70, "6–8", "4–6", "Καλή μέρα")
+    storage.checkins(limit=5)              # DataFrame, παλαιότερη → νεότερη
+"""
+import json
+import os
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+import resources
+
+BASE_DIR = os.path.dirname(__file__)
+ROOT_DIR = os.path.join(BASE_DIR, "..")
+WELLNESS_DB_PATH = os.environ.get("WELLNESS_DB_PATH", os.path.join(ROOT_DIR, "wellness.sqlite3"))
+# Η εφαρμογή είναι (προς το παρόν) ενός χρήστη· όλα τα δεδομένα έχουν όμως user_id
+DEFAULT_USER_ID = os.environ.get("WELLNESS_USER_ID", "local")
+BUSY_TIMEOUT_MS = 5_000
+
+DOC_PROFILE = "profile"
+DOC_WELLNESS_HISTORY = "wellness_history"
+
+# Πίνακας → στήλες δεδομένων (εκτός id / user_id), με τη σειρά των παλιών CSV
+TABLES = {
+    "checkins": ("timestamp", "mood", "sleep", "water", "message"),
+    "support_phrases": ("timestamp", "source", "text"),
+    "exercises": ("timestamp", "exercise_id", "label"),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkins (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    mood NUMERIC,              -- αριθμός 0–100 ή "EMERGENCY"
+    sleep TEXT,
+    water TEXT,
+    message TEXT
+);
+CREATE INDEX IF NOT EXISTS checkins_user_ts ON checkins(user_id, timestamp);
+
+CREATE TABLE IF NOT EXISTS support_phrases (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    source TEXT NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS support_phrases_user_ts ON support_phrases(user_id, timestamp);
+
+CREATE TABLE IF NOT EXISTS exercises (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    exercise_id TEXT NOT NULL,
+    label TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS exercises_user_ts ON exercises(user_id, timestamp);
+
+CREATE TABLE IF NOT EXISTS documents (
+    user_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    data TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (user_id, kind)
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def _now(sep: str = "T") -> str:
+    return datetime.now().isoformat(sep=sep, timespec="seconds")
+
+
+class Storage:
+    def __init__(self, path: str = WELLNESS_DB_PATH):
+        self.path = path
+        # Μία σύνδεση ανά διεργασία (τα reruns του Streamlit τρέχουν σε
+        # διαφορετικά threads), με lock γύρω από κάθε πράξη (RLock, ώστε οι
+        # μέθοδοι να καλούνται και μέσα σε transaction())· ταυτόχρονες
+        # διεργασίες συντονίζονται από την ίδια την SQLite (WAL + busy_timeout).
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        self._conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Όλες οι πράξεις του block σε μία συναλλαγή (BEGIN IMMEDIATE: το lock
+        εγγραφής της βάσης παίρνεται στην αρχή). Σε σφάλμα γίνεται ROLLBACK.
+        Μέσα σε άλλη συναλλαγή απλώς συμμετέχει σε αυτήν.
+        """
+        with self._lock:
+            if self._conn.in_transaction:
+                yield
+                return
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    # ------------------------- εγγραφές -------------------------
+
+    def _insert(self, table: str, user_id: str, values: tuple) -> None:
+        columns = TABLES[table]
+        placeholders = ", ".join("?" * (len(columns) + 1))
+        with self._lock:
+            self._conn.execute(
+                f"INSERT INTO {table} (user_id, {', '.join(columns)}) VALUES ({placeholders})",
+                (user_id, *values),
+            )
+
+    def insert_many(self, table: str, rows, user_id: str = DEFAULT_USER_ID) -> int:
+        """
+        Μαζική εισαγωγή (migration / benchmarks) σε μία συναλλαγή.
+        rows: tuples με τις στήλες του TABLES[table]. Επιστρέφει το πλήθος.
+        """
+        columns = TABLES[table]
+        placeholders = ", ".join("?" * (len(columns) + 1))
+        sql = f"INSERT INTO {table} (user_id, {', '.join(columns)}) VALUES ({placeholders})"
+        with self.transaction():
+            cur = self._conn.executemany(sql, ((user_id, *row) for row in rows))
+        return cur.rowcount
+
+    def add_checkin(self, mood, sleep, water, message, user_id: str = DEFAULT_USER_ID,
+                    timestamp: str | None = None) -> None:
+        # Ίδια μορφή χρόνου με το παλιό user_data.csv
+        self._insert("checkins", user_id, (timestamp or _now(" "), mood, sleep, water, message))
+
+    def add_support_phrase(self, text: str, source: str = "bot", user_id: str = DEFAULT_USER_ID,
+                           timestamp: str | None = None) -> None:
+        self._insert("support_phrases", user_id, (timestamp or _now(), source, text))
+
+    def add_exercise(self, exercise_id: str, label: str, user_id: str = DEFAULT_USER_ID,
+                     timestamp: str | None = None) -> None:
+        self._insert("exercises", user_id, (timestamp or _now(), exercise_id, label))
+
+    # ------------------------- αναγνώσεις -------------------------
+
+    def _query(self, table: str, user_id: str, since: str | None, until: str | None,
+               limit: int | None):
+        """
+        DataFrame με τις στήλες του TABLES[table], σε χρονολογική σειρά.
+        limit: μόνο οι limit πιο πρόσφατες γραμμές.
+        """
+        import pandas as pd  # μόνο εδώ, για να μη βαραίνει το import του module
+
+        columns = TABLES[table]
+        sql = f"SELECT {', '.join(columns)} FROM {table} WHERE user_id = ?"
+        params: list = [user_id]
+        if since is not None:
+            sql += " AND timestamp >= ?"
+            params.append(since)
+        if until is not None:
+            sql += " AND timestamp < ?"
+            params.append(until)
+        # Με limit διαβάζουμε ανάποδα το ευρετήριο και αντιστρέφουμε στο τέλος
+        sql += " ORDER BY timestamp DESC, id DESC" if limit is not None else " ORDER BY timestamp, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        if limit is not None:
+            rows.reverse()
+        return pd.DataFrame(rows, columns=list(columns))
+
+    def checkins(self, user_id: str = DEFAULT_USER_ID, since: str | None = None,
+                 until: str | None = None, limit: int | None = None):
+        return self._query("checkins", user_id, since, until, limit)
+
+    def support_phrases(self, user_id: str = DEFAULT_USER_ID, limit: int | None = None):
+        return self._query("support_phrases", user_id, None, None, limit)
+
+    def exercises(self, user_id: str = DEFAULT_USER_ID, limit: int | None = None):
+        return self._query("exercises", user_id, None, None, limit)
+
+    def exercise_counts(self, user_id: str = DEFAULT_USER_ID) -> dict[str, int]:
+        """
+        Ολοκληρώσεις ανά άσκηση (label → πλήθος), από τις περισσότερες.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT label, COUNT(*) AS n FROM exercises WHERE user_id = ? "
+                "GROUP BY label ORDER BY n DESC",
+                (user_id,),
+            ).fetchall()
+        return dict(rows)
+
+    def count(self, table: str, user_id: str | None = None) -> int:
+        sql = f"SELECT COUNT(*) FROM {table}"
+        params: tuple = ()
+        if user_id is not None:
+            sql += " WHERE user_id = ?"
+            params = (user_id,)
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()[0]
+
+    # ------------------------- έγγραφα (JSON) -------------------------
+
+    def get_document(self, kind: str, user_id: str = DEFAULT_USER_ID) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM documents WHERE user_id = ? AND kind = ?", (user_id, kind)
+            ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def put_document(self, kind: str, data: dict, user_id: str = DEFAULT_USER_ID) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?)",
+                (user_id, kind, json.dumps(data, ensure_ascii=False), _now()),
+            )
+
+    # ------------------------- meta -------------------------
+
+    def get_meta(self, key: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return None if row is None else row[0]
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def get_storage() -> Storage:
+    return resources.get("storage")
+
+
+# ============================================================
+#           MIGRATION ΑΠΟ ΤΑ ΠΑΛΙΑ CSV / JSON
+# ============================================================
+
+LEGACY_CSV = {
+    "checkins": "user_data.csv",
+    "support_phrases": "support_phrases.csv",
+    "exercises": "exercises_log.csv",
+}
+LEGACY_JSON = {
+    DOC_WELLNESS_HISTORY: "user_history.json",
+    DOC_PROFILE: "user_profile.json",
+}
+MIGRATION_KEY = "migrated_legacy_files"
+
+
+def migrate_legacy_files(storage: Storage, root: str = ROOT_DIR,
+                         user_id: str = DEFAULT_USER_ID) -> dict[str, int]:
+    """
+    Μεταφέρει μία φορά τα παλιά αρχεία στη βάση (τα αρχεία μένουν ως έχουν).
+    Ξανατρέχοντας δεν κάνει τίποτα (σημείωση στον πίνακα meta).
+    Επιστρέφει πόσες εγγραφές μεταφέρθηκαν ανά πίνακα / έγγραφο.
+
+    Ο έλεγχος της σημείωσης, όλες οι εισαγωγές και η σημείωση γίνονται σε
+    μία συναλλαγή: ταυτόχρονες διεργασίες δεν διπλασιάζουν τα δεδομένα και
+    μια διακοπή στη μέση δεν αφήνει μισή μεταφορά.
+    """
+    if storage.get_meta(MIGRATION_KEY) is not None:
+        return {}
+
+    import pandas as pd
+
+    # Τα αρχεία διαβάζονται πριν πάρουμε το lock εγγραφής της βάσης
+    rows: dict[str, list[tuple]] = {}
+    for table, filename in LEGACY_CSV.items():
+        path = os.path.join(root, filename)
+        if not os.path.isfile(path):
+            continue
+        df = pd.read_csv(path, dtype=str, keep_default_na=False)
+        columns = TABLES[table]
+        for column in columns:
+            if column not in df.columns:
+                df[column] = ""
+        # Η SQLite (NUMERIC) κρατά τα "90" ως αριθμούς και το "EMERGENCY" ως κείμενο
+        rows[table] = list(df[list(columns)].itertuples(index=False, name=None))
+
+    documents: dict[str, dict] = {}
+    for kind, filename in LEGACY_JSON.items():
+        path = os.path.join(root, filename)
+        if not os.path.isfile(path):
+            continue
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                documents[kind] = json.load(f)
+        except (OSError, ValueError):
+            continue
+
+    migrated: dict[str, int] = {}
+    with storage.transaction():
+        # Ξανά, τώρα που κρατάμε το lock: ίσως την έκανε ήδη άλλη διεργασία
+        if storage.get_meta(MIGRATION_KEY) is not None:
+            return {}
+        for table, table_rows in rows.items():
+            migrated[table] = storage.insert_many(table, table_rows, user_id=user_id)
+        for kind, data in documents.items():
+            storage.put_document(kind, data, user_id=user_id)
+            migrated[kind] = 1
+        storage.set_meta(MIGRATION_KEY, _now())
+    return migrated
+
+
+def _create_storage() -> Storage:
+    # Την πρώτη φορά (σε υπάρχουσα εγκατάσταση) φέρνει και τα παλιά αρχεία
+    storage = Storage()
+    migrate_legacy_files(storage)
+    return storage
+
+
+resources.register("storage", _create_storage)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["migrate"]:
+        sys.exit("Χρήση: python app/storage.py migrate")
+    result = migrate_legacy_files(Storage())
+    if not result:
+        print("Τίποτα για μεταφορά (ήδη έγινε ή δεν υπάρχουν παλιά αρχεία).")
+    for name, n in result.items():
+        print(f"{name}: {n}")
+    print(f"Βάση: {os.path.normpath(WELLNESS_DB_PATH)}")
@@ -0,0 +1,151 @@
+# app/text_normalization.py
+"""
+Κοινή κανονικοποίηση ελληνικού κειμένου για κανόνες, συναισθηματικό χάρτη
+και λεξικό, ώστε κάθε λίστα λέξεων-κλειδιών να γράφεται με μία μόνο μορφή:
+
+- πεζά + αφαίρεση τόνων/διαλυτικών (Unicode NFD)
+- τελικό ς → σ
+- Greeklish → ελληνικά (π.χ. «agxos» → «αγχοσ»)
+- ελαφρύ stemming καταλήξεων (μόνο για αναζήτηση στο λεξικό)
+
+Τα αποτελέσματα ανά token κρατιούνται σε φραγμένη LRU cache,
+και ανά μήνυμα σε μια μικρότερη, ώστε κάθε μήνυμα να κανονικοποιείται μία φορά.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+from typing import NamedTuple
+
+TOKEN_CACHE_SIZE = 50_000
+MESSAGE_CACHE_SIZE = 256
+
+# Λέξεις = συνεχόμενα γράμματα (ελληνικά ή λατινικά), χωρίς σημεία στίξης/αριθμούς
+_TOKEN_RE = re.compile(r"[^\W\d_]+")
+_LATIN_RE = re.compile(r"[a-z]+")
+
+# Greeklish → ελληνικά. Τα δίψηφα ελέγχονται πριν τα μονά γράμματα.
+_GREEKLISH_DIGRAPHS = {
+    "th": "θ", "ps": "ψ", "ks": "ξ", "ch": "χ", "kh": "χ",
+}
+_GREEKLISH_LETTERS = {
+    "a": "α", "b": "β", "c": "κ", "d": "δ", "e": "ε", "f": "φ", "g": "γ",
+    "h": "η", "i": "ι", "j": "τζ", "k": "κ", "l": "λ", "m": "μ", "n": "ν",
+    "o": "ο", "p": "π", "q": "κ", "r": "ρ", "s": "σ", "t": "τ", "u": "υ",
+    "v": "β", "w": "ω", "x": "χ", "y": "υ", "z": "ζ",
+}
+
+# Καταλήξεις (ήδη κανονικοποιημένες), από τις μεγαλύτερες στις μικρότερες
+_SUFFIXES = sorted(
+    [
+        "ουμαστε", "ομαστε", "ουσατε", "ουσαμε", "ησατε", "ησαμε",
+        "ουνται", "ονται", "ιεσαι", "ιεται", "ομουν", "ουμαι", "ιεμαι",
+        "ωντασ", "οντασ", "ηκαν", "ουμε", "ουσα", "ουσε", "εσαι", "εται",
+        "ομαι", "ησα", "ησε", "ησω", "ηκα", "ηκε", "ασα", "ασε", "ασω",
+        "ισα", "ισε", "ισω", "εισ", "ουσ", "ουν", "οσ", "ησ", "εσ", "ασ",
+        "ισ", "υσ", "ων", "ου", "οι", "ει", "αν", "ια", "ιο", "ιε",
+        "α", "η", "ο", "ε", "ι", "υ", "ω",
+    ],
+    key=len,
+    reverse=True,
+)
+MIN_STEM_LENGTH = 3
+
+
+def fold(text: str) -> str:
+    """
+    Πεζά (casefold, που κάνει και το τελικό ς → σ) και αφαίρεση τόνων/διαλυτικών.
+    """
+    decomposed = unicodedata.normalize("NFD", text.casefold())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def transliterate_greeklish(token: str) -> str:
+    """
+    Μετατρέπει τα λατινικά γράμματα ενός (ήδη folded) token σε ελληνικά.
+    Τα ελληνικά γράμματα μένουν ως έχουν, οπότε δουλεύει και σε μικτά tokens.
+    """
+    def _convert(match: re.Match) -> str:
+        latin = match.group(0)
+        out = []
+        i = 0
+        while i < len(latin):
+            pair = latin[i:i + 2]
+            if pair in _GREEKLISH_DIGRAPHS:
+                out.append(_GREEKLISH_DIGRAPHS[pair])
+                i += 2
+            else:
+                out.append(_GREEKLISH_LETTERS[latin[i]])
+                i += 1
+        return "".join(out)
+
+    return _LATIN_RE.sub(_convert, token)
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Γρήγορος tokenizer για ελληνικό κείμενο: κρατά μόνο τις λέξεις,
+    ώστε το «σήμερα.» να γίνεται «σήμερα».
+    """
+    return _TOKEN_RE.findall(text)
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def normalize_token(token: str) -> str:
+    """
+    Κανονική μορφή ενός token: fold + Greeklish → ελληνικά.
+    """
+    folded = fold(token)
+    if _LATIN_RE.search(folded):
+        folded = transliterate_greeklish(folded)
+    return folded
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def stem(token: str) -> str:
+    """
+    Ελαφρύ stemming: αφαιρεί τη μεγαλύτερη γνωστή κατάληξη,
+    αφήνοντας τουλάχιστον MIN_STEM_LENGTH γράμματα.
+    Περιμένει token ήδη περασμένο από normalize_token.
+    """
+    for suffix in _SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM_LENGTH:
+            return token[: -len(suffix)]
+    return token
+
+
+class NormalizedText(NamedTuple):
+    tokens: tuple[str, ...]   # κανονικοποιημένα tokens
+    text: str                 # τα tokens ενωμένα με ένα κενό (για φράσεις)
+
+
+@lru_cache(maxsize=MESSAGE_CACHE_SIZE)
+def normalize_text(text: str) -> NormalizedText:
+    """
+    Κανονικοποιεί ένα ολόκληρο μήνυμα. Κρατιέται σε cache, οπότε όλοι οι
+    κανόνες που ζητούν το ίδιο μήνυμα μοιράζονται ένα αποτέλεσμα.
+    """
+    tokens = tuple(normalize_token(tok) for tok in tokenize(text))
+    return NormalizedText(tokens, " ".join(tokens))
+
+
+def normalize_phrase(phrase: str) -> str:
+    """
+    Κανονική μορφή μιας λέξης-κλειδιού ή φράσης (για λίστες κανόνων).
+    """
+    return " ".join(normalize_token(tok) for tok in tokenize(phrase))
+
+
+# Λέξεις άρνησης: όπως γράφονται, και σε κανονική μορφή για σύγκριση με tokens
+NEGATION_WORDS = ("δεν", "δε", "μην", "μη", "ούτε", "καθόλου", "ποτέ")
+NEGATIONS = frozenset(normalize_phrase(w) for w in NEGATION_WORDS)
+
+
+def cache_info() -> dict:
+    """
+    Στατιστικά των caches (hits / misses / μέγεθος).
+    """
+    return {
+        "normalize_token": normalize_token.cache_info()._asdict(),
+        "stem": stem.cache_info()._asdict(),
+        "normalize_text": normalize_text.cache_info()._asdict(),
+    }
@@ -0,0 +1,158 @@
+# app/tiny_sentiment.py
+"""
+Μικρό γραμμικό μοντέλο συναισθήματος (hashed n-grams + logistic regression),
+για check-ins μεγάλου όγκου όπου το DistilBERT κοστίζει πολύ.
+
+Χαρακτηριστικά ανά μήνυμα (πάνω στα tokens του normalize_text, οπότε τα
+Greeklish μετρούν ως ελληνικά):
+- λέξεις ("w:χαρα") και ζεύγη διαδοχικών λέξεων ("b:δεν χαρα", πιάνει την άρνηση),
+- τριγράμματα χαρακτήρων κάθε λέξης ("c:^χα"), για τις καταλήξεις,
+
+που κατακερματίζονται (crc32) σε TINY_DIM θέσεις. Η πρόβλεψη είναι ένα
+gather + sum των βαρών και μια σιγμοειδής, μόνο με NumPy. Τα βάρη
+αποθηκεύονται σε ένα μικρό .npz (float16).
+
+Το μοντέλο εκπαιδεύεται offline από τις ετικέτες λεξικού + transformer
+(βλ. distill_sentiment.py) και μπαίνει πίσω από το analyze_sentiment ως
+backend "tiny" (SENTIMENT_BACKEND=tiny), με την ίδια μορφή κλήσης με το
+HF pipeline.
+
+Χρήση:
+    python app/distill_sentiment.py            # εκπαίδευση → models/tiny_sentiment.npz
+    model = load_model()
+    model(["Νιώθω υπέροχα"])                   # [{"label": "POSITIVE", "score": 0.93}]
+"""
+import os
+import zlib
+from functools import lru_cache
+
+import numpy as np
+
+from text_normalization import normalize_text
+
+TINY_DIM = 2 ** 16
+TINY_MODEL_PATH = os.path.join(os.path.dirname(__file__), "..", "models", "tiny_sentiment.npz")
+CHAR_NGRAM = 3
+
+TINY_EPOCHS = 8
+TINY_LEARNING_RATE = 0.5
+TINY_L2 = 1e-6
+TINY_BATCH_SIZE = 64
+
+
+def _hash(feature: str) -> int:
+    return zlib.crc32(feature.encode("utf-8")) % TINY_DIM
+
+
+@lru_cache(maxsize=50_000)
+def _token_ids(token: str) -> tuple[int, ...]:
+    padded = f"^{token}$"
+    grams = {padded[i:i + CHAR_NGRAM] for i in range(max(1, len(padded) - CHAR_NGRAM + 1))}
+    return (_hash("w:" + token),) + tuple(_hash("c:" + g) for g in grams)
+
+
+def feature_ids(text: str) -> np.ndarray:
+    """
+    Μοναδικοί δείκτες χαρακτηριστικών του μηνύματος (int64).
+    """
+    tokens = normalize_text(text).tokens
+    ids = [i for tok in tokens for i in _token_ids(tok)]
+    ids += [_hash(f"b:{a} {b}") for a, b in zip(tokens, tokens[1:])]
+    return np.unique(np.asarray(ids, dtype=np.int64))
+
+
+def _flatten(per_text: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (δείκτες όλων των μηνυμάτων στη σειρά, owner κάθε δείκτη, τιμή κάθε δείκτη).
+    Κάθε μήνυμα έχει διάνυσμα μοναδιαίου μήκους (1/√n ανά χαρακτηριστικό).
+    """
+    lengths = np.fromiter(map(len, per_text), dtype=np.int64, count=len(per_text))
+    flat = np.concatenate(per_text) if per_text else np.zeros(0, dtype=np.int64)
+    owner = np.repeat(np.arange(len(per_text)), lengths)
+    values = 1.0 / np.sqrt(np.maximum(lengths, 1))[owner]
+    return flat, owner, values
+
+
+class TinySentimentModel:
+    def __init__(self, weights: np.ndarray, bias: float = 0.0):
+        self.weights = weights.astype(np.float32)
+        self.bias = float(bias)
+
+    def predict_proba(self, texts) -> np.ndarray:
+        """
+        P(POSITIVE) για κάθε κείμενο.
+        """
+        flat, owner, values = _flatten([feature_ids(t) for t in texts])
+        logits = np.bincount(owner, weights=self.weights[flat] * values, minlength=len(texts))
+        return 1.0 / (1.0 + np.exp(-(logits + self.bias)))
+
+    def __call__(self, texts, batch_size=None, truncation=True) -> list[dict]:
+        """
+        Ίδια μορφή με το HF pipeline (ένα string ή λίστα), ώστε να μπαίνει
+        στη θέση του στο analyze_sentiment / SentimentBatcher.
+        """
+        if isinstance(texts, str):
+            texts = [texts]
+        return [
+            {"label": "POSITIVE", "score": float(p)} if p >= 0.5
+            else {"label": "NEGATIVE", "score": float(1 - p)}
+            for p in self.predict_proba(texts)
+        ]
+
+    def save(self, path: str = TINY_MODEL_PATH) -> str:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.savez_compressed(path, weights=self.weights.astype(np.float16), bias=np.float32(self.bias))
+        return path
+
+
+def load_model(path: str = TINY_MODEL_PATH) -> TinySentimentModel:
+    if not os.path.isfile(path):
+        raise FileNotFoundError(
+            f"Δεν βρέθηκε το {path}· εκπαίδευσέ το με: python app/distill_sentiment.py"
+        )
+    with np.load(path) as data:
+        return TinySentimentModel(data["weights"], float(data["bias"]))
+
+
+def train(
+    texts: list[str],
+    targets,
+    epochs: int = TINY_EPOCHS,
+    learning_rate: float = TINY_LEARNING_RATE,
+    l2: float = TINY_L2,
+    batch_size: int = TINY_BATCH_SIZE,
+    seed: int = 0,
+) -> TinySentimentModel:
+    """
+    Logistic regression με mini-batch SGD (Adagrad) πάνω στα hashed
+    χαρακτηριστικά. targets: P(POSITIVE) του teacher ανά κείμενο (soft
+    labels, ώστε να περνά και η βεβαιότητά του, όχι μόνο η ετικέτα).
+    """
+    rng = np.random.default_rng(seed)
+    targets = np.asarray(targets, dtype=np.float64)
+    features = [feature_ids(t) for t in texts]
+    weights = np.zeros(TINY_DIM, dtype=np.float64)
+    squared = np.full(TINY_DIM, 1e-8)
+    bias, bias_squared = 0.0, 1e-8
+
+    for _ in range(epochs):
+        order = rng.permutation(len(texts))
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            flat, owner, values = _flatten([features[i] for i in batch])
+
+            logits = np.bincount(owner, weights=weights[flat] * values, minlength=len(batch)) + bias
+            errors = 1.0 / (1.0 + np.exp(-logits)) - targets[batch]
+
+            grad = np.zeros(TINY_DIM)
+            np.add.at(grad, flat, errors[owner] * values)
+            touched = np.unique(flat)
+            grad_touched = grad[touched] / len(batch) + l2 * weights[touched]
+            squared[touched] += grad_touched ** 2
+            weights[touched] -= learning_rate * grad_touched / np.sqrt(squared[touched])
+
+            bias_grad = errors.mean()
+            bias_squared += bias_grad ** 2
+            bias -= learning_rate * bias_grad / np.sqrt(bias_squared)
+
+    return TinySentimentModel(weights, bias)
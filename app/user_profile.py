@@ -1,8 +1,5 @@
 # app/user_profile.py
-import os
-import json
-
-PROFILE_PATH = os.path.join(os.path.dirname(__file__), "..", "user_profile.json")
+from storage import DEFAULT_USER_ID, DOC_PROFILE, get_storage
 
 DEFAULT_PROFILE = {
     "name": "",
@@ -13,12 +10,11 @@ DEFAULT_PROFILE = {
     "helpful_things": "", # τι σε βοηθά συνήθως
 }
 
-def load_profile():
-    if os.path.exists(PROFILE_PATH):
-        with open(PROFILE_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
+def load_profile(user_id: str = DEFAULT_USER_ID):
+    profile = get_storage().get_document(DOC_PROFILE, user_id)
+    if profile is not None:
+        return profile
     return DEFAULT_PROFILE.copy()
 
-def save_profile(profile: dict):
-    with open(PROFILE_PATH, "w", encoding="utf-8") as f:
-        json.dump(profile, f, ensure_ascii=False, indent=2)
+def save_profile(profile: dict, user_id: str = DEFAULT_USER_ID):
+    get_storage().put_document(DOC_PROFILE, profile, user_id)
@@ -0,0 +1,71 @@
+"""
+Benchmark: καθυστέρηση του crisis_detector σε μηνύματα αυξανόμενου μήκους,
+με τη φράση κρίσης στο τέλος και με στίξη ανάμεσα στις λέξεις, ώστε να
+μην την πιάνει η λίστα υποσυμβολοσειρών και να τρέχουν όλα τα στάδια
+(χειρότερη περίπτωση), σε σύγκριση με τα παλιά `in` checks του is_emergency.
+
+«cold» = πρώτη κλήση με άδειες caches (νέος detector για κάθε μήκος).
+«fuzzy» = ποσοστό κλήσεων όπου η φράση πιάστηκε μέσα στο budget
+(αλλιώς την έπιασε το ακριβές regex, σε αρχή και τέλος του κειμένου).
+
+Τρέξιμο από το root του project:
+    python benchmarks/bench_crisis_detector.py
+"""
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, os.path.join(ROOT, "app"))
+
+from crisis_detector import EXACT_RED_FLAGS, CrisisDetector  # noqa: E402
+
+WORDS = (
+    "σήμερα νιώθω πολύ λίγο κουρασμένη αλλά έχω και άγχος για τη σχολή "
+    "και τις εξετάσεις δεν κοιμήθηκα καλά χθες το βράδυ ελπίζω αύριο"
+).split()
+
+def legacy_is_emergency(text: str) -> bool:
+    t = text.lower()
+    return any(flag in t for flag in EXACT_RED_FLAGS)
+
+
+def percentiles(samples: list[float]) -> tuple[float, float, float]:
+    samples = sorted(samples)
+    return (
+        statistics.median(samples),
+        samples[int(len(samples) * 0.99) - 1],
+        samples[-1],
+    )
+
+
+if __name__ == "__main__":
+    rng = random.Random(8)
+    reps = 200
+
+    print(f"{'χαρακτήρες':>10} {'legacy in (µs)':>15} {'cold (ms)':>10} {'p50 (ms)':>9} "
+          f"{'p99 (ms)':>9} {'max (ms)':>9} {'fuzzy':>6}")
+    for n_words in (10, 50, 200, 1000, 1500, 5000, 20000):
+        text = " ".join(rng.choice(WORDS) for _ in range(n_words)) + " δεν θέλω, να ζω"
+
+        start = time.perf_counter()
+        for _ in range(reps):
+            legacy_is_emergency(text)
+        t_legacy = (time.perf_counter() - start) / reps
+
+        detector = CrisisDetector(audit_path=None)
+        cold = detector.detect(text).elapsed_ms
+
+        samples = []
+        fuzzy = 0
+        for _ in range(reps):
+            start = time.perf_counter()
+            result = detector.detect(text)
+            samples.append((time.perf_counter() - start) * 1000)
+            assert result.is_crisis
+            fuzzy += not result.budget_exhausted
+        p50, p99, worst = percentiles(samples)
+        print(f"{len(text):>10} {t_legacy * 1e6:>15.1f} {cold:>10.3f} {p50:>9.3f} "
+              f"{p99:>9.3f} {worst:>9.3f} {fuzzy / reps:>6.0%}")
@@ -0,0 +1,118 @@
+"""
+Benchmark: ο κοινός matcher (κανονικοποίηση + σάρωση με substrings ή με το
+αυτόματο Aho–Corasick) vs. τα επαναλαμβανόμενα `in` checks όλων των
+κανόνων, για μηνύματα αυξανόμενου μήκους· και οι δύο τρόποι σάρωσης για
+αυξανόμενο πλήθος patterns, που ορίζει το KEYWORD_AUTOMATON_MIN_PATTERNS.
+
+Τρέξιμο από το root του project:
+    python benchmarks/bench_keyword_matcher.py
+"""
+import os
+import random
+import sys
+import timeit
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, os.path.join(ROOT, "app"))
+
+from keyword_matcher import (  # noqa: E402
+    KEYWORD_AUTOMATON_MIN_PATTERNS,
+    MATCHER,
+    KeywordMatcher,
+    match_concepts,
+)
+from text_normalization import normalize_text  # noqa: E402
+
+
+def normalize(text: str) -> str:
+    """Κανονικοποίηση χωρίς την cache ανά μήνυμα (στην εφαρμογή γίνεται
+    μία φορά ανά μήνυμα και τη μοιράζονται matcher και λεξικό)."""
+    return normalize_text.__wrapped__(text).text
+
+WORDS = (
+    "σήμερα νιώθω πολύ λίγο κουρασμένη αλλά έχω και άγχος για τη σχολή "
+    "και τις εξετάσεις δεν κοιμήθηκα καλά χθες το βράδυ ελπίζω αύριο"
+).split()
+
+
+# Οι λίστες όπως ήταν πριν τον κοινό matcher (με τόνους και χωρίς)
+LEGACY_KEYWORDS = {
+    "anxiety": ["άγχ", "αγχος"],
+    "fear": ["φοβ"],
+    "pressure": ["πίεσ", "πιεζ"],
+    "many": ["πολλά", "πολλα"],
+    "sadness": ["θλίψ", "στεναχ", "λύπη"],
+    "loneliness": ["μοναξ"],
+    "tiredness": ["κουρασ", "κουράσ", "εξαντ"],
+    "hope": ["ελπί", "ελπι"],
+    "stress": ["στρες"],
+    "study": [
+        "σπουδ", "σχολή", "σχολη", "πανεπιστ", "πανεπηστ", "εξετάσ", "εξετασ",
+        "εργασία", "εργασια", "εργασι", "μάθημα", "μαθημα", "διάβασμα", "διαβασμα",
+    ],
+    "sleep": [
+        "ύπν", "υπν", "ξενύχτ", "ξενυχτ", "αϋπν", "αυπν", "δεν κοιμήθηκα",
+        "δεν κοιμηθηκα", "δυσκολεύομαι να κοιμηθώ", "δυσκολευομαι να κοιμηθω",
+    ],
+}
+
+# Οι έννοιες που έλεγχε η κάθε συνάρτηση πριν τον κοινό matcher
+RULE_CHECKS = {
+    "fallback_therapeutic_reply": ["anxiety", "pressure", "sadness", "loneliness"],
+    "exercise_suggestion": ["anxiety", "fear", "pressure", "many", "sadness", "loneliness"],
+    "extract_emotional_tags": ["anxiety", "pressure", "many", "tiredness", "hope", "loneliness"],
+    "detect_study_anxiety": ["anxiety", "stress", "study"],
+    "detect_sleep_difficulty": ["sleep"],
+}
+
+
+def substring_checks(text: str) -> frozenset[str]:
+    """Όπως πριν: κάθε συνάρτηση κάνει lower() και ελέγχει τα δικά της stems."""
+    found = set()
+    for concepts in RULE_CHECKS.values():
+        t = text.lower()
+        for concept in concepts:
+            if any(p in t for p in LEGACY_KEYWORDS[concept]):
+                found.add(concept)
+    return frozenset(found)
+
+
+def pattern_sweep(rng: random.Random, text: str) -> None:
+    """
+    Συνθετικά patterns (3–6 γράμματα) σε ήδη κανονικοποιημένο κείμενο:
+    τα `in` checks ακριβαίνουν με το πλήθος τους, το αυτόματο όχι.
+    """
+    letters = "αβγδεζηθικλμνξοπρστυφχψω"
+    print(f"\n{'patterns':>8} {'substrings (µs)':>16} {'αυτόματο (µs)':>14}   ({len(text)} χαρακτήρες)")
+    for n_patterns in (25, 50, 100, 150, 200, 400):
+        keywords = {
+            f"c{i}": ["".join(rng.choices(letters, k=rng.randint(3, 6)))] for i in range(n_patterns)
+        }
+        matcher = KeywordMatcher(keywords)
+        assert matcher.scan_substrings(text) == matcher.scan_automaton(text)
+        t_sub = timeit.timeit(lambda: matcher.scan_substrings(text), number=200) / 200
+        t_ac = timeit.timeit(lambda: matcher.scan_automaton(text), number=200) / 200
+        chosen = "αυτόματο" if matcher.use_automaton else "substrings"
+        print(f"{n_patterns:>8} {t_sub * 1e6:>16.1f} {t_ac * 1e6:>14.1f}   → {chosen}")
+
+
+if __name__ == "__main__":
+    rng = random.Random(5)
+    n_patterns = sum(len(p) for p in LEGACY_KEYWORDS.values())
+    print(f"Έννοιες: {len(LEGACY_KEYWORDS)}, patterns: {n_patterns} (παλιές λίστες), "
+          f"{len(MATCHER._patterns)} (κανονικοποιημένα)· "
+          f"αυτόματο από {KEYWORD_AUTOMATON_MIN_PATTERNS} patterns")
+    print(f"{'χαρακτήρες':>10} {'in checks':>10} {'κανονικοποίηση':>15} {'substrings':>11} {'αυτόματο':>9}  (µs)")
+    for n_words in (3, 10, 50, 200, 1000):
+        text = " ".join(rng.choice(WORDS) for _ in range(n_words))
+        normalized = normalize(text)
+        assert substring_checks(text) <= match_concepts(text)
+        assert MATCHER.scan_substrings(normalized) == MATCHER.scan_automaton(normalized)
+        reps = max(50, 20000 // n_words)
+        t_in = timeit.timeit(lambda: substring_checks(text), number=reps) / reps
+        t_norm = timeit.timeit(lambda: normalize(text), number=reps) / reps
+        t_sub = timeit.timeit(lambda: MATCHER.scan_substrings(normalized), number=reps) / reps
+        t_ac = timeit.timeit(lambda: MATCHER.scan_automaton(normalized), number=reps) / reps
+        print(f"{len(text):>10} {t_in * 1e6:>10.1f} {t_norm * 1e6:>15.1f} {t_sub * 1e6:>11.1f} {t_ac * 1e6:>9.1f}")
+
+    pattern_sweep(rng, normalize_text(" ".join(rng.choice(WORDS) for _ in range(200))).text)
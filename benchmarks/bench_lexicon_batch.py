@@ -0,0 +1,57 @@
+"""
+Benchmark: analyze_lexicon_sentiment_batch vs. μία κλήση ανά μήνυμα,
+σε 100k συνθετικά ελληνικά μηνύματα.
+
+Τρέξιμο από το root του project:
+    python benchmarks/bench_lexicon_batch.py [πλήθος_μηνυμάτων]
+"""
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, os.path.join(ROOT, "app"))
+
+import pandas as pd  # noqa: E402
+
+import lexicon_sentiment as ls  # noqa: E402
+
+FILLER = [
+    "σήμερα", "νιώθω", "πολύ", "λίγο", "αλλά", "και", "είμαι", "η", "μέρα",
+    "σχολή", "εξετάσεις", "ύπνος", "φίλους", "δουλειά", "σπίτι", "χθες",
+]
+
+
+def synthetic_messages(n: int, seed: int = 11) -> pd.Series:
+    rng = random.Random(seed)
+    lexicon = ls.get_lexicon()
+    terms = [lexicon.term(i) for i in range(len(lexicon))]
+    messages = []
+    for _ in range(n):
+        words = rng.choices(FILLER, k=rng.randint(4, 14)) + rng.choices(terms, k=rng.randint(0, 3))
+        rng.shuffle(words)
+        messages.append(" ".join(words) + rng.choice([".", "!", "…", ""]))
+    return pd.Series(messages)
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    texts = synthetic_messages(n)
+
+    start = time.perf_counter()
+    rows = [ls.analyze_lexicon_sentiment(t) for t in texts]
+    t_loop = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = ls.analyze_lexicon_sentiment_batch(texts)
+    t_batch = time.perf_counter() - start
+
+    loop_df = pd.DataFrame(rows, index=texts.index)
+    identical = loop_df.equals(batch[loop_df.columns])
+
+    print(f"Μηνύματα            : {n}")
+    print(f"Κλήση ανά μήνυμα    : {t_loop:7.2f} s ({t_loop / n * 1e6:6.1f} µs/μήνυμα)")
+    print(f"Batch               : {t_batch:7.2f} s ({t_batch / n * 1e6:6.1f} µs/μήνυμα)")
+    print(f"Επιτάχυνση          : x{t_loop / t_batch:.1f}")
+    print(f"Ίδια αποτελέσματα   : {identical}")
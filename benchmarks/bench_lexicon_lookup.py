@@ -0,0 +1,92 @@
+"""
+Benchmark: hash-indexed αναζήτηση λεξικού vs. την παλιά σάρωση του DataFrame.
+
+Τρέξιμο από το root του project:
+    python benchmarks/bench_lexicon_lookup.py
+"""
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+os.chdir(ROOT)
+sys.path.insert(0, os.path.join(ROOT, "app"))
+
+import pandas as pd  # noqa: E402
+
+import lexicon_sentiment as ls  # noqa: E402
+
+# Το λεξικό όπως το φόρτωνε η αρχική υλοποίηση
+df = pd.read_csv("app/greek_sentiment_lexicon.tsv", sep="\t")
+df = df[["Term", "Polarity1"]].dropna()
+df.columns = ["word", "polarity"]
+TSV_LABELS = {"POS": "positive", "NEG": "negative"}
+
+
+def legacy_analyze(text: str) -> dict:
+    """Η αρχική υλοποίηση: split() και boolean σάρωση του DataFrame ανά λέξη."""
+    words = text.lower().split()
+    pos, neg, hits = 0, 0, 0
+    for word in words:
+        match = df[df["word"] == word]
+        if not match.empty:
+            hits += 1
+            polarity = match["polarity"].values[0]
+            if polarity.lower() == "positive":
+                pos += 1
+            elif polarity.lower() == "negative":
+                neg += 1
+    label = "positive" if pos > neg else "negative" if neg > pos else "neutral"
+    return {"label": label, "hits": hits, "tokens": len(words)}
+
+
+def indexed_analyze(text: str) -> dict:
+    tokens = ls.tokenize(text)
+    labels = ls.lookup_tokens(tokens)
+    result = ls.analyze_lexicon_sentiment(text)
+    result["hits"] = sum(lab is not None for lab in labels)
+    result["tokens"] = len(tokens)
+    return result
+
+
+def build_corpus(n: int = 300, seed: int = 7) -> list[str]:
+    """Συνθετικά μηνύματα: λέξεις λεξικού (με στίξη/κεφαλαία) + συνηθισμένες λέξεις."""
+    rng = random.Random(seed)
+    lexicon_words = [w.split()[0] for w in df["word"] if w.strip()]
+    filler = ["σήμερα", "νιώθω", "πολύ", "λίγο", "αλλά", "και", "είμαι", "η", "μέρα"]
+    corpus = []
+    for _ in range(n):
+        words = rng.sample(filler, 4) + rng.sample(lexicon_words, 3)
+        rng.shuffle(words)
+        words = [w.capitalize() if rng.random() < 0.2 else w for w in words]
+        corpus.append(" ".join(words) + rng.choice([".", "!", "...", ""]))
+    return corpus
+
+
+def run(fn, corpus):
+    start = time.perf_counter()
+    results = [fn(text) for text in corpus]
+    elapsed = time.perf_counter() - start
+    hits = sum(r["hits"] for r in results)
+    tokens = sum(r["tokens"] for r in results)
+    return results, elapsed, hits / max(tokens, 1)
+
+
+if __name__ == "__main__":
+    corpus = build_corpus()
+
+    legacy, t_legacy, hr_legacy = run(legacy_analyze, corpus)
+    indexed, t_indexed, hr_indexed = run(indexed_analyze, corpus)
+
+    # Συμφωνία ετικετών για λέξεις που υπάρχουν αυτούσιες στο λεξικό
+    exact = {w for w in df["word"] if " " not in w.strip() and not w.strip().endswith("-")}
+    expected = {w: TSV_LABELS.get(p, "neutral") for w, p in zip(df["word"], df["polarity"]) if w in exact}
+    agree = sum(ls.analyze_lexicon_sentiment(w)["label"] == lab for w, lab in expected.items())
+
+    n = len(corpus)
+    print(f"Μηνύματα: {n}")
+    print(f"Παλιά σάρωση : {t_legacy / n * 1e6:9.1f} µs/μήνυμα, hit-rate {hr_legacy:.1%}")
+    print(f"Hash index   : {t_indexed / n * 1e6:9.1f} µs/μήνυμα, hit-rate {hr_indexed:.1%}")
+    print(f"Επιτάχυνση   : x{t_legacy / t_indexed:.0f}")
+    print(f"Συμφωνία ετικετών σε όρους λεξικού: {agree}/{len(expected)}")
@@ -0,0 +1,39 @@
+"""
+Benchmark: χρόνος φόρτωσης λεξικού — pandas parse του TSV vs. mmap του artifact.
+
+Τρέξιμο από το root του project:
+    python benchmarks/bench_lexicon_startup.py
+"""
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, os.path.join(ROOT, "app"))
+
+import lexicon_artifact as la  # noqa: E402
+
+
+def timed(fn, repeat: int = 20) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def pandas_load():
+    import pandas as pd
+
+    df = pd.read_csv(la.LEXICON_TSV, sep="\t")
+    return df[["Term", "Polarity1"]].dropna()
+
+
+if __name__ == "__main__":
+    la.build_artifact()
+
+    print(f"pandas read_csv (TSV)    : {timed(pandas_load) * 1e3:8.2f} ms")
+    print(f"compile TSV → artifact   : {timed(la.compile_lexicon, 3) * 1e3:8.2f} ms")
+    print(f"load_artifact (mmap+hash): {timed(la.load_artifact) * 1e3:8.2f} ms")
+    print(f"Μέγεθος artifact         : {os.path.getsize(la.LEXICON_ARTIFACT) / 1024:8.1f} KiB")
@@ -0,0 +1,77 @@
+"""
+Benchmark: καθυστέρηση της cache απαντήσεων LLM (hit / miss + put)
+και κλήσεις API που γλιτώνονται σε φορτίο με επαναλαμβανόμενα check-ins.
+Το API προσομοιώνεται με σταθερή καθυστέρηση (δεν γίνεται δικτυακή κλήση).
+
+Τρέξιμο από το root του project:
+    python benchmarks/bench_llm_cache.py
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, os.path.join(ROOT, "app"))
+
+from llm_cache import ResponseCache, cache_key  # noqa: E402
+
+FAKE_API_SECONDS = 0.8
+MOODS = range(0, 101, 10)
+SLEEP = ["0–2", "3–5", "6–8", "9+"]
+WATER = ["0", "1–3", "4–6", "7+"]
+TEXTS = [
+    "Έχω άγχος για τις εξετάσεις",
+    "Νιώθω μοναξιά τα βράδια",
+    "Είμαι κουρασμένη και δεν κοιμήθηκα",
+    "Σήμερα ήταν καλή μέρα",
+]
+
+
+def prompt(mood, sleep, water, text) -> str:
+    return f"Διάθεση: {mood}\nΎπνος: {sleep}\nΝερό: {water}\nΚείμενο: {text}"
+
+
+if __name__ == "__main__":
+    rng = random.Random(10)
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(os.path.join(tmp, "bench.sqlite3"), max_entries=1_000)
+
+        keys = [cache_key("gpt-4o-mini", "system", f"prompt {i}") for i in range(2_000)]
+        start = time.perf_counter()
+        for key in keys:
+            cache.get(key)
+            cache.put(key, "gpt-4o-mini", "απάντηση " * 80)
+        t_miss = (time.perf_counter() - start) / len(keys)
+
+        hot = keys[-500:]
+        start = time.perf_counter()
+        for key in hot * 4:
+            cache.get(key)
+        t_hit = (time.perf_counter() - start) / (len(hot) * 4)
+
+        print(f"miss + put          : {t_miss * 1e6:8.1f} µs")
+        print(f"hit                 : {t_hit * 1e6:8.1f} µs")
+        print(f"εγγραφές / evictions: {len(cache)} / {cache.evictions}")
+
+        # Φορτίο: 2.000 υποβολές, ~15% διπλά κλικ, τα υπόλοιπα τυχαία check-ins
+        cache.clear()
+        api_calls = 0
+        submissions = []
+        for _ in range(2_000):
+            if submissions and rng.random() < 0.15:
+                submissions.append(submissions[-1])
+            else:
+                submissions.append((rng.choice(MOODS), rng.choice(SLEEP), rng.choice(WATER), rng.choice(TEXTS)))
+        for sub in submissions:
+            key = cache_key("gpt-4o-mini", "system", prompt(*sub))
+            if cache.get(key) is None:
+                api_calls += 1
+                cache.put(key, "gpt-4o-mini", "απάντηση")
+
+        print(f"Υποβολές            : {len(submissions)}")
+        print(f"Κλήσεις API         : {api_calls} (χωρίς cache: {len(submissions)})")
+        print(f"Χρόνος API (προσομ.): {api_calls * FAKE_API_SECONDS:.0f} s αντί για "
+              f"{len(submissions) * FAKE_API_SECONDS:.0f} s")
+        print("Stats               :", cache.stats())
@@ -0,0 +1,94 @@
+"""
+Benchmark: σημασιολογική cache απαντήσεων LLM — ποσοστό hits (και πόσα
+από αυτά είναι «σωστά», δηλ. ίδιο θέμα) έναντι καθυστέρησης αναζήτησης,
+για διάφορα thresholds και μεγέθη cache.
+
+Το φορτίο είναι συνθετικά check-ins: θέματα × παραλλαγές διατύπωσης
+(επιτατικά, προθέσεις, Greeklish, τυπογραφικά), με τυχαία διάθεση/ύπνο/νερό.
+
+Τρέξιμο από το root του project:
+    python benchmarks/bench_semantic_cache.py
+"""
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, os.path.join(ROOT, "app"))
+
+from semantic_cache import SemanticCache  # noqa: E402
+
+MOODS = range(0, 101, 10)
+SLEEP = ["0–2", "3–5", "6–8", "9+"]
+WATER = ["0", "1–3", "4–6", "7+"]
+
+TOPICS = {
+    "exams": ["έχω άγχος για τις εξετάσεις", "έχω πολύ άγχος με τις εξετάσεις",
+              "exw agxos gia tis eksetaseis", "αγχώνομαι για τις εξετάσεις μου"],
+    "loneliness": ["νιώθω μοναξιά τα βράδια", "νιώθω πολύ μοναξιά το βράδυ",
+                   "niotho monaxia ta vradia", "νιώθω μόνη μου τα βράδια"],
+    "work": ["έχω άγχος για τη δουλειά", "η δουλειά μου με αγχώνει πολύ",
+             "exw agxos gia ti douleia", "έχω πολύ άγχος στη δουλειά"],
+    "sleep": ["δεν κοιμήθηκα καλά και είμαι κουρασμένη", "δεν κοιμήθηκα καθόλου, είμαι πτώμα",
+              "den koimithika kala", "είμαι κουρασμένος γιατί δεν κοιμήθηκα"],
+    "good_day": ["σήμερα ήταν καλή μέρα", "σήμερα ήταν πολύ καλή μέρα",
+                 "simera itan kali mera", "είχα μια καλή μέρα σήμερα"],
+    "family": ["τσακώθηκα με τους γονείς μου", "τσακωθήκαμε πάλι με τη μητέρα μου",
+               "tsakothika me tous goneis mou", "μάλωσα με τους γονείς μου"],
+}
+FILLERS = ["", " σήμερα", " πάλι", " λίγο", "!!", "..."]
+
+
+def workload(rng: random.Random, n: int, n_states: int) -> list[tuple]:
+    # Περιορισμένος αριθμός καταστάσεων, όπως οι πραγματικοί χρήστες (ρουτίνα)
+    states = [(rng.choice(MOODS), rng.choice(SLEEP), rng.choice(WATER)) for _ in range(n_states)]
+    out = []
+    for _ in range(n):
+        topic = rng.choice(list(TOPICS))
+        text = rng.choice(TOPICS[topic]) + rng.choice(FILLERS)
+        mood, sleep, water = rng.choice(states)
+        out.append((topic, text, mood, sleep, water))
+    return out
+
+
+def run(threshold: float, max_entries: int, requests: list[tuple]) -> dict:
+    cache = SemanticCache(threshold=threshold, max_entries=max_entries)
+    topics: dict[str, str] = {}
+    latencies = []
+    hits = correct = 0
+    for topic, text, mood, sleep, water in requests:
+        start = time.perf_counter()
+        reply, _ = cache.lookup(text, mood, sleep, water)
+        latencies.append(time.perf_counter() - start)
+        if reply is None:
+            reply = f"reply-{len(topics)}"
+            topics[reply] = topic
+            cache.put(text, mood, sleep, water, None, reply)
+        else:
+            hits += 1
+            correct += topics[reply] == topic
+    lat = np.array(latencies) * 1e6
+    return {
+        "hit_rate": hits / len(requests),
+        "precision": correct / hits if hits else float("nan"),
+        "p50_us": float(np.percentile(lat, 50)),
+        "p95_us": float(np.percentile(lat, 95)),
+        "memory_mb": cache.stats()["memory_bytes"] / 1e6,
+    }
+
+
+if __name__ == "__main__":
+    rng = random.Random(15)
+    requests = workload(rng, 5_000, n_states=40)
+
+    print(f"{'threshold':>9} {'entries':>7} {'hit rate':>8} {'σωστά':>6} "
+          f"{'p50 µs':>7} {'p95 µs':>7} {'MB':>6}")
+    for max_entries in (500, 2_000, 8_000):
+        for threshold in (0.7, 0.75, 0.8, 0.85, 0.9, 0.95, 0.999):
+            r = run(threshold, max_entries, requests)
+            print(f"{threshold:>9} {max_entries:>7} {r['hit_rate']:>8.1%} {r['precision']:>6.1%} "
+                  f"{r['p50_us']:>7.1f} {r['p95_us']:>7.1f} {r['memory_mb']:>6.1f}")
+        print()
@@ -0,0 +1,141 @@
+"""
+Benchmark: backends του sentiment μοντέλου (fp32 PyTorch, int8 PyTorch,
+ONNX Runtime, ONNX int8) στην CPU — συμφωνία ετικετών με το fp32,
+καθυστέρηση ανά κείμενο (p50/p95), throughput σε batch και μέγιστο RSS.
+
+Τυπώνει δύο πίνακες: τις απόλυτες τιμές κάθε backend και τη σύγκριση με
+το fp32 ("torch", τρέχει πάντα ως αναφορά): συμφωνία ετικετών, μέγιστη
+διαφορά στο score της ετικέτας POSITIVE, επιτάχυνση p50/batch και RSS.
+Στο τέλος, τα κείμενα όπου κάποιο backend διαφωνεί με το fp32.
+
+Κάθε backend τρέχει σε δική του διεργασία, ώστε το RSS να αφορά μόνο
+αυτό. Η πρώτη εκτέλεση κάνει και τη μετατροπή (αποθηκεύεται στο models/),
+οπότε ο χρόνος φόρτωσης μετράει σωστά από τη δεύτερη φορά.
+
+Χρειάζεται transformers + torch, και optimum[onnxruntime] για τα ONNX backends.
+
+Τρέξιμο από το root του project:
+    python benchmarks/bench_sentiment_backends.py [backend ...]
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT, "app"))
+
+from sentiment_backends import BACKENDS  # noqa: E402
+
+BATCH_SIZE = 32
+REFERENCE = "torch"
+TEXTS = [
+    "I am very happy today!",
+    "This is the worst day ever.",
+    "I'm feeling a bit anxious and confused.",
+    "Life is beautiful.",
+    "Nothing makes sense anymore...",
+    "I'm feeling a bit tired but also really proud of what I achieved today.",
+    "My exams went okay, not great, not terrible.",
+    "I miss my family and the evenings feel very lonely.",
+    "Finally slept eight hours, I feel like a new person.",
+    "Everyone keeps asking for more and I can't keep up.",
+    "The walk by the sea calmed me down a lot.",
+    "I don't know why, but I just feel empty.",
+]
+
+
+def measure(backend: str) -> dict:
+    """
+    Τρέχει μέσα στη διεργασία-παιδί.
+    """
+    import resource
+
+    import numpy as np
+
+    from sentiment_backends import create_pipeline
+
+    start = time.perf_counter()
+    pipe = create_pipeline(backend)
+    load_s = time.perf_counter() - start
+
+    pipe(TEXTS[:2])   # warm-up
+    texts = TEXTS * 8
+    latencies = []
+    outputs = []
+    for text in texts:
+        t0 = time.perf_counter()
+        outputs.append(pipe(text)[0])
+        latencies.append((time.perf_counter() - t0) * 1000)
+
+    t0 = time.perf_counter()
+    pipe(texts, batch_size=BATCH_SIZE)
+    batch_s = time.perf_counter() - t0
+
+    return {
+        "backend": backend,
+        "load_s": load_s,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "batch_per_s": len(texts) / batch_s,
+        "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "labels": [o["label"] for o in outputs[: len(TEXTS)]],
+        # Πιθανότητα της θετικής ετικέτας, συγκρίσιμη ανάμεσα στα backends
+        "positive": [
+            o["score"] if o["label"] == "POSITIVE" else 1 - o["score"] for o in outputs[: len(TEXTS)]
+        ],
+    }
+
+
+def run_child(backend: str) -> dict | None:
+    proc = subprocess.run(
+        [sys.executable, __file__, "--child", backend],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+    )
+    if proc.returncode != 0:
+        print(f"{backend}: απέτυχε\n{proc.stderr.strip().splitlines()[-1] if proc.stderr else ''}")
+        return None
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--child":
+        print(json.dumps(measure(sys.argv[2])))
+        sys.exit(0)
+
+    backends = sys.argv[1:] or list(BACKENDS)
+    backends = [REFERENCE] + [b for b in backends if b != REFERENCE]
+    results = {b: r for b in backends if (r := run_child(b)) is not None}
+
+    print(f"{'backend':<11} {'load s':>7} {'p50 ms':>7} {'p95 ms':>7} {'batch/s':>8} {'RSS MB':>7}")
+    for backend, r in results.items():
+        print(f"{backend:<11} {r['load_s']:>7.1f} {r['p50_ms']:>7.1f} {r['p95_ms']:>7.1f} "
+              f"{r['batch_per_s']:>8.1f} {r['rss_mb']:>7.0f}")
+
+    reference = results.get(REFERENCE)
+    if reference is None:
+        print(f"\nΧωρίς το fp32 ({REFERENCE}) δεν γίνεται σύγκριση.")
+        sys.exit(1)
+
+    print(f"\nΣε σχέση με το fp32 ({REFERENCE}, {len(TEXTS)} κείμενα):")
+    print(f"{'backend':<11} {'συμφωνία':>9} {'max Δscore':>10} {'p50':>7} {'batch':>7} {'RSS':>7}")
+    disagreements = []
+    for backend, r in results.items():
+        if backend == REFERENCE:
+            continue
+        same = sum(a == b for a, b in zip(r["labels"], reference["labels"]))
+        drift = max(abs(a - b) for a, b in zip(r["positive"], reference["positive"]))
+        print(f"{backend:<11} {same / len(TEXTS):>9.0%} {drift:>10.3f} "
+              f"{reference['p50_ms'] / r['p50_ms']:>6.1f}x {r['batch_per_s'] / reference['batch_per_s']:>6.1f}x "
+              f"{r['rss_mb'] - reference['rss_mb']:>+5.0f}MB")
+        disagreements += [
+            (backend, text, ref, label)
+            for text, ref, label in zip(TEXTS, reference["labels"], r["labels"])
+            if ref != label
+        ]
+
+    for backend, text, ref, label in disagreements:
+        print(f"  {backend}: {text!r} → {label} (fp32: {ref})")
@@ -0,0 +1,91 @@
+"""
+Benchmark: throughput και καθυστέρηση του transformer sentiment pipeline
+στην CPU, με batch 1, 8 και 32:
+
+- «pipeline»: μια έτοιμη λίστα κειμένων κατευθείαν στο pipeline(batch_size=b),
+- «batcher»: CONCURRENCY ταυτόχρονοι callers μέσω του SentimentBatcher
+  (max_batch_size=b), όπως τα sessions της εφαρμογής.
+
+Χρειάζεται transformers + torch (το μοντέλο κατεβαίνει την πρώτη φορά).
+
+Τρέξιμο από το root του project:
+    python benchmarks/bench_sentiment_batching.py
+"""
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, os.path.join(ROOT, "app"))
+
+import resources  # noqa: E402
+import sentiment  # noqa: E402,F401  (δηλώνει το sentiment_pipeline)
+from sentiment_batcher import SentimentBatcher  # noqa: E402
+
+BATCH_SIZES = (1, 8, 32)
+N_TEXTS = 256
+CONCURRENCY = 32
+TEXTS = [
+    "I am very happy today!",
+    "This is the worst day ever.",
+    "I'm feeling a bit anxious and confused about my exams next week.",
+    "Life is beautiful.",
+    "Nothing makes sense anymore...",
+    "I slept badly and I am exhausted, but my friends cheered me up in the evening.",
+]
+
+
+def bench_pipeline(pipe, batch_size: int) -> dict:
+    texts = [TEXTS[i % len(TEXTS)] for i in range(N_TEXTS)]
+    start = time.perf_counter()
+    pipe(texts, batch_size=batch_size, truncation=True)
+    elapsed = time.perf_counter() - start
+    return {"throughput": N_TEXTS / elapsed}
+
+
+def bench_batcher(pipe, batch_size: int) -> dict:
+    batcher = SentimentBatcher(lambda: pipe, max_batch_size=batch_size, max_wait_ms=5)
+    latencies: list[float] = []
+    lock = threading.Lock()
+    per_caller = N_TEXTS // CONCURRENCY
+
+    def caller(c: int):
+        for i in range(per_caller):
+            t0 = time.perf_counter()
+            batcher.submit(TEXTS[(c + i) % len(TEXTS)]).result()
+            with lock:
+                latencies.append(time.perf_counter() - t0)
+
+    threads = [threading.Thread(target=caller, args=(c,)) for c in range(CONCURRENCY)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    lat = np.array(latencies) * 1000
+    return {
+        "throughput": len(latencies) / elapsed,
+        "p50_ms": float(np.percentile(lat, 50)),
+        "p95_ms": float(np.percentile(lat, 95)),
+        "mean_batch": batcher.stats()["mean_batch_size"],
+    }
+
+
+if __name__ == "__main__":
+    import torch
+
+    pipe = resources.get("sentiment_pipeline")
+    pipe(TEXTS, batch_size=len(TEXTS))   # warm-up
+    print(f"torch threads: {torch.get_num_threads()}, κείμενα: {N_TEXTS}, callers: {CONCURRENCY}\n")
+
+    print(f"{'batch':>5} {'pipeline/s':>11} {'batcher/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'μέσο batch':>11}")
+    for b in BATCH_SIZES:
+        direct = bench_pipeline(pipe, b)
+        served = bench_batcher(pipe, b)
+        print(f"{b:>5} {direct['throughput']:>11.1f} {served['throughput']:>10.1f} "
+              f"{served['p50_ms']:>8.1f} {served['p95_ms']:>8.1f} {served['mean_batch']:>11}")
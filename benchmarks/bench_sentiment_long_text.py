@@ -0,0 +1,77 @@
+"""
+Benchmark: καθυστέρηση του sentiment ως προς το μήκος του κειμένου —
+ένα forward pass με truncation (ό,τι πέρα από τα 512 tokens χάνεται) vs
+το long-text mode (analyze_sentiment_long: παράθυρα προτάσεων σε batch,
+με σκληρό όριο SENTIMENT_MAX_INPUT_CHARS).
+
+Το μοντέλο φορτώνεται μέσα στη διεργασία (SENTIMENT_MODE=local), ώστε οι
+χρόνοι να μην περιλαμβάνουν το socket του model worker.
+Χρειάζεται transformers + torch (ή το backend του SENTIMENT_BACKEND).
+
+Τρέξιμο από το root του project:
+    python benchmarks/bench_sentiment_long_text.py [επαναλήψεις]
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SENTIMENT_MODE", "local")
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, os.path.join(ROOT, "app"))
+
+import numpy as np  # noqa: E402
+
+import resources  # noqa: E402
+import sentiment  # noqa: E402
+
+LENGTHS = [200, 1_000, 2_000, 5_000, 10_000, 20_000, 50_000]
+SENTENCES = [
+    "I woke up tired again and the morning felt heavy.",
+    "Coffee with my sister cheered me up a lot.",
+    "Work was stressful and my manager kept adding tasks.",
+    "I went for a long walk by the sea after lunch.",
+    "In the evening I felt lonely and a bit anxious.",
+    "I finally finished the book I was reading and loved the ending.",
+    "I could not stop thinking about the exams next week.",
+    "Dinner with friends was the best part of the day.",
+]
+
+
+def journal_entry(chars: int, seed: int = 3) -> str:
+    rng = random.Random(seed)
+    parts, size = [], 0
+    while size < chars:
+        sentence = rng.choice(SENTENCES)
+        parts.append(sentence)
+        size += len(sentence) + 1
+    return " ".join(parts)[:chars]
+
+
+def timed(fn, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return float(np.median(times))
+
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    pipe = resources.get("sentiment_pipeline")
+    pipe(SENTENCES[:2])   # warm-up
+
+    print(f"όριο εισόδου: {sentiment.SENTIMENT_MAX_INPUT_CHARS} χαρ., "
+          f"παράθυρο: {sentiment.SENTIMENT_WINDOW_TOKENS} tokens\n")
+    print(f"{'χαρακτήρες':>10} {'truncate ms':>12} {'long ms':>9} {'παράθυρα':>9} {'ms/παράθ.':>10}")
+    for chars in LENGTHS:
+        text = journal_entry(chars)
+        single_ms = timed(lambda: pipe(text, truncation=True), repeats)
+        long_ms = timed(lambda: sentiment.analyze_sentiment_long(text), repeats)
+        result = sentiment.analyze_sentiment_long(text)
+        windows = result["windows"]
+        flag = " (truncated)" if result["truncated"] else ""
+        print(f"{chars:>10} {single_ms:>12.1f} {long_ms:>9.1f} {windows:>9} "
+              f"{long_ms / windows:>10.1f}{flag}")
@@ -0,0 +1,79 @@
+"""
+Benchmark: χρόνος από το import ως το πρώτο render για τις σελίδες
+«💬 Chat» και «📊 Στατιστικά». Κάθε μέτρηση τρέχει σε καινούργια
+διεργασία (cold start), με το streamlit.testing AppTest.
+
+Τρέξιμο από το root του project:
+    python benchmarks/bench_startup.py [επαναλήψεις]
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+APP_DIR = os.path.join(ROOT, "app")
+APP_SCRIPT = os.path.join(APP_DIR, "app.py")
+
+PAGES = {
+    "chat": "💬 Chat",
+    "stats": "📊 Στατιστικά",
+}
+
+
+def measure_once(page: str) -> dict:
+    """
+    Τρέχει μέσα στη διεργασία-παιδί: import streamlit, πρώτο run της σελίδας.
+    """
+    start = time.perf_counter()
+    sys.path.insert(0, APP_DIR)
+    from streamlit.testing.v1 import AppTest
+
+    imported = time.perf_counter()
+    at = AppTest.from_file(APP_SCRIPT, default_timeout=120)
+    at.session_state["page"] = PAGES[page]
+    at.run()
+    rendered = time.perf_counter()
+
+    import resources
+
+    return {
+        "streamlit_import_ms": (imported - start) * 1000,
+        "first_render_ms": (rendered - imported) * 1000,
+        "total_ms": (rendered - start) * 1000,
+        "exceptions": [str(e.value) for e in at.exception],
+        "resources_ms": {
+            name: None if sec is None else round(sec * 1000, 1)
+            for name, sec in resources.load_times().items()
+        },
+    }
+
+
+def run_child(page: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", page],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--child":
+        print(json.dumps(measure_once(sys.argv[2]), ensure_ascii=False))
+        sys.exit(0)
+
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    for page, label in PAGES.items():
+        runs = [run_child(page) for _ in range(repeats)]
+        best = min(runs, key=lambda r: r["total_ms"])
+        print(f"{label}")
+        print(f"  import streamlit : {best['streamlit_import_ms']:8.1f} ms")
+        print(f"  πρώτο render     : {best['first_render_ms']:8.1f} ms")
+        print(f"  σύνολο (best/{repeats}) : {best['total_ms']:8.1f} ms")
+        print(f"  πόροι (ms)       : {best['resources_ms']}")
+        if best["exceptions"]:
+            print(f"  exceptions       : {best['exceptions']}")
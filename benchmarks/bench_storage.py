@@ -0,0 +1,121 @@
+"""
+Benchmark: SQLite (WAL) storage vs τα παλιά CSV, σε check-ins πολλών
+χρηστών (προεπιλογή 1M γραμμές σε 1.000 χρήστες, ένα check-in ανά ~3 ώρες).
+
+Μετράει:
+- μαζική εισαγωγή (insert_many, μία συναλλαγή) — αντίστοιχο του migration,
+- εγγραφή ενός check-in (add_checkin, ένα INSERT + commit), p50/p95,
+- τα queries της εφαρμογής ανά χρήστη: τελευταία 10, μία εβδομάδα,
+  όλο το ιστορικό, πλήθος ασκήσεων,
+- και για σύγκριση το CSV: πλήρες pd.read_csv (κάθε ανάγνωση του παλιού
+  app) και append μίας γραμμής.
+
+Η βάση και το CSV γράφονται σε προσωρινό φάκελο.
+
+Τρέξιμο από το root του project:
+    python benchmarks/bench_storage.py [γραμμές] [χρήστες]
+"""
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, os.path.join(ROOT, "app"))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from storage import Storage  # noqa: E402
+
+MESSAGES = [
+    "Σήμερα ήταν καλή μέρα",
+    "Νιώθω κουρασμένος και αγχωμένος με τις εξετάσεις",
+    "Βγήκα με φίλους, πέρασα τέλεια",
+    "Δεν κοιμήθηκα καλά",
+    "",
+]
+EXERCISES = [("breathing", "Αναπνοές 4-7-8"), ("water", "Ένα ποτήρι νερό"), ("walk", "Περίπατος")]
+START = datetime(2024, 1, 1)
+
+
+def checkin_rows(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    for i in range(n):
+        ts = START + timedelta(hours=3 * i, minutes=rng.randrange(180))
+        yield (ts.strftime("%Y-%m-%d %H:%M:%S"), rng.randint(0, 100), "6–8", "4–6",
+               rng.choice(MESSAGES))
+
+
+def timed_ms(fn, repeats: int) -> np.ndarray:
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return np.asarray(times)
+
+
+def report(name: str, times: np.ndarray) -> None:
+    print(f"{name:<40} {np.percentile(times, 50):>10.3f} {np.percentile(times, 95):>10.3f}")
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    n_users = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+    users = [f"user{u:05d}" for u in range(n_users)]
+    per_user = n_rows // n_users
+
+    tmp = tempfile.mkdtemp()
+    db_path = os.path.join(tmp, "wellness.sqlite3")
+    csv_path = os.path.join(tmp, "user_data.csv")
+    storage = Storage(db_path)
+
+    # --- μαζική εισαγωγή ---
+    t0 = time.perf_counter()
+    for u, user in enumerate(users):
+        storage.insert_many("checkins", checkin_rows(per_user, seed=u), user_id=user)
+        storage.insert_many("exercises", (
+            (f"2024-01-{1 + i % 28:02d}T10:00:00", *EXERCISES[i % len(EXERCISES)])
+            for i in range(20)
+        ), user_id=user)
+    bulk = time.perf_counter() - t0
+    total = storage.count("checkins")
+    print(f"{total} check-ins, {n_users} χρήστες")
+    print(f"Μαζική εισαγωγή: {bulk:.1f} s ({total / bulk:,.0f} γραμμές/s), "
+          f"βάση {os.path.getsize(db_path) / 1e6:.0f} MB\n")
+
+    # Το παλιό user_data.csv: ένα αρχείο με όλες τις γραμμές, που
+    # διαβαζόταν ολόκληρο σε κάθε σελίδα ιστορικού / στατιστικών
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["timestamp", "mood", "sleep", "water", "message"])
+        writer.writerows(checkin_rows(total))
+
+    rng = random.Random(1)
+    repeats = 200
+    print(f"{'πράξη':<40} {'p50 ms':>10} {'p95 ms':>10}")
+    report("add_checkin (1 INSERT)", timed_ms(
+        lambda: storage.add_checkin(50, "6–8", "4–6", "bench", user_id=rng.choice(users)), repeats))
+    report("checkins(limit=10)", timed_ms(
+        lambda: storage.checkins(user_id=rng.choice(users), limit=10), repeats))
+    report("checkins(μία εβδομάδα)", timed_ms(
+        lambda: storage.checkins(user_id=rng.choice(users), since="2024-02-01", until="2024-02-08"),
+        repeats))
+    report(f"checkins(όλο το ιστορικό, ~{per_user} γρ.)", timed_ms(
+        lambda: storage.checkins(user_id=rng.choice(users)), repeats))
+    report("exercise_counts", timed_ms(
+        lambda: storage.exercise_counts(user_id=rng.choice(users)), repeats))
+
+    def csv_append():
+        with open(csv_path, "a", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerow([datetime.now().isoformat(sep=" ", timespec="seconds"),
+                                    50, "6–8", "4–6", "bench"])
+
+    report("CSV append (1 γραμμή)", timed_ms(csv_append, repeats))
+    report(f"CSV pd.read_csv ({total} γρ.)", timed_ms(lambda: pd.read_csv(csv_path), 3))
+
+    storage.close()
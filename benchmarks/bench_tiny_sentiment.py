@@ -0,0 +1,68 @@
+"""
+Benchmark: distilled tiny_sentiment vs το τρέχον pipeline (SENTIMENT_BACKEND)
+και vs τον teacher (cascade λεξικό → pipeline) από τον οποίο μαθαίνει —
+συμφωνία ετικετών και καθυστέρηση ανά μήνυμα (p50/p95), batch 1.
+
+Σώμα κειμένων: συνθετικά μηνύματα με διαφορετικό seed από την εκπαίδευση,
+μαζί με τα μηνύματα των check-ins της βάσης.
+
+Χρειάζεται το models/tiny_sentiment.npz (python app/distill_sentiment.py)
+και transformers + torch για το pipeline.
+
+Τρέξιμο από το root του project:
+    python benchmarks/bench_tiny_sentiment.py [πλήθος_μηνυμάτων]
+"""
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, os.path.join(ROOT, "app"))
+
+import numpy as np  # noqa: E402
+
+from distill_sentiment import logged_messages, synthetic_corpus  # noqa: E402
+from sentiment_backends import SENTIMENT_BACKEND, create_pipeline  # noqa: E402
+from sentiment_cascade import SentimentCascade  # noqa: E402
+from tiny_sentiment import load_model  # noqa: E402
+
+
+def per_message(fn, texts) -> tuple[list[str], np.ndarray]:
+    labels, times = [], []
+    for text in texts:
+        t0 = time.perf_counter()
+        labels.append(fn(text)["label"])
+        times.append((time.perf_counter() - t0) * 1000)
+    return labels, np.asarray(times)
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000
+    texts = logged_messages() + synthetic_corpus(n, seed=2024)
+
+    tiny = load_model()
+    pipe = create_pipeline(SENTIMENT_BACKEND)
+    tiny(texts[:2])
+    pipe(texts[:2])   # warm-up
+
+    def run_pipeline(text):
+        return pipe(text, truncation=True)[0]
+
+    teacher = SentimentCascade(transformer=run_pipeline)
+    runs = {
+        f"pipeline ({SENTIMENT_BACKEND})": per_message(run_pipeline, texts),
+        "teacher (cascade)": per_message(teacher.classify, texts),
+        "tiny": per_message(lambda text: tiny(text)[0], texts),
+    }
+    tiny_labels = runs["tiny"][0]
+
+    print(f"{len(texts)} μηνύματα\n")
+    print(f"{'μοντέλο':<20} {'p50 ms':>8} {'p95 ms':>8} {'συμφωνία tiny':>14}")
+    for name, (labels, times) in runs.items():
+        agreement = np.mean([a == b for a, b in zip(labels, tiny_labels)])
+        print(f"{name:<20} {np.percentile(times, 50):>8.3f} {np.percentile(times, 95):>8.3f} "
+              f"{agreement:>14.1%}")
+
+    t0 = time.perf_counter()
+    tiny(texts)
+    print(f"\ntiny, ένα batch: {(time.perf_counter() - t0) / len(texts) * 1e6:.1f} µs/μήνυμα")
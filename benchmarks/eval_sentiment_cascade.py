@@ -0,0 +1,102 @@
+"""
+Offline αξιολόγηση του cascade (λεξικό → transformer) σε σχέση με τον
+transformer σε όλα τα μηνύματα:
+
+- ακρίβεια του cascade με ετικέτες αναφοράς αυτές του transformer,
+- ποσοστό μηνυμάτων που απάντησε μόνο το λεξικό και ακρίβειά τους,
+- μέσος χρόνος ανά μήνυμα (transformer vs cascade) και πόσος γλιτώνεται,
+
+για μερικούς συνδυασμούς ορίων (CASCADE_MIN_MARGIN / CASCADE_MIN_COVERAGE).
+Ο transformer τρέχει μία φορά ανά μήνυμα (batch 1, όπως στην εφαρμογή)· ο
+χρόνος του cascade = λεξικό + transformer μόνο για όσα κλιμακώθηκαν.
+
+Σώμα κειμένων: στήλη "message" ενός CSV (προεπιλογή user_data.csv) μαζί
+με ενσωματωμένα δείγματα. Χρειάζεται transformers + torch.
+
+Τρέξιμο από το root του project:
+    python benchmarks/eval_sentiment_cascade.py [αρχείο.csv]
+"""
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, os.path.join(ROOT, "app"))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from sentiment_backends import create_pipeline  # noqa: E402
+from sentiment_cascade import SentimentCascade  # noqa: E402
+
+SAMPLES = [
+    "Νιώθω φόβο και θλίψη",
+    "Σήμερα νιώθω χαρά και ελπίδα",
+    "Δεν νιώθω χαρά εδώ και μέρες",
+    "Έχω άγχος αλλά και χαρά για τις διακοπές",
+    "Πήγα στη δουλειά και γύρισα σπίτι",
+    "Είμαι πολύ κουρασμένη και μόνη",
+    "Ήταν μια υπέροχη μέρα με φίλους",
+    "Δεν ξέρω τι να κάνω, όλα είναι χάος",
+    "Κοιμήθηκα καλά και έχω ενέργεια",
+    "Νιώθω θυμό με τον εαυτό μου",
+    "I am very happy today!",
+    "This is the worst day ever.",
+]
+
+# (min_margin, min_coverage)
+GRID = [(0.0, 0.0), (0.34, 0.05), (0.5, 0.1), (0.67, 0.1), (1.0, 0.2)]
+
+
+def load_texts(path: str) -> list[str]:
+    texts = list(SAMPLES)
+    if os.path.isfile(path):
+        texts += pd.read_csv(path)["message"].dropna().astype(str).tolist()
+    return list(dict.fromkeys(texts))
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(ROOT, "user_data.csv")
+    texts = load_texts(path)
+
+    pipe = create_pipeline()
+    pipe(texts[:2])   # warm-up
+
+    reference, transformer_ms = {}, {}
+    for text in texts:
+        t0 = time.perf_counter()
+        result = pipe(text, truncation=True)[0]
+        transformer_ms[text] = (time.perf_counter() - t0) * 1000
+        reference[text] = {"label": result["label"], "score": round(result["score"], 2)}
+
+    full_ms = float(np.mean(list(transformer_ms.values())))
+    print(f"{len(texts)} μηνύματα, transformer: {full_ms:.2f} ms/μήνυμα\n")
+    print(f"{'margin':>6} {'cover':>6} {'λεξικό':>7} {'ακρίβεια':>9} {'ακρ. λεξ.':>9} "
+          f"{'ms/μήν.':>8} {'γλιτώνει':>9}")
+
+    for min_margin, min_coverage in GRID:
+        cascade = SentimentCascade(
+            transformer=reference.__getitem__, min_margin=min_margin, min_coverage=min_coverage
+        )
+        correct = lexicon_correct = lexicon_n = 0
+        cascade_ms = []
+        for text in texts:
+            t0 = time.perf_counter()
+            result = cascade.classify(text)
+            elapsed = (time.perf_counter() - t0) * 1000
+            same = result["label"] == reference[text]["label"]
+            correct += same
+            if result["tier"] == "lexicon":
+                lexicon_n += 1
+                lexicon_correct += same
+            else:
+                # Ο πραγματικός χρόνος του transformer γι' αυτό το μήνυμα
+                elapsed += transformer_ms[text]
+            cascade_ms.append(elapsed)
+
+        mean_ms = float(np.mean(cascade_ms))
+        lexicon_acc = f"{lexicon_correct / lexicon_n:.0%}" if lexicon_n else "-"
+        print(f"{min_margin:>6.2f} {min_coverage:>6.2f} {lexicon_n / len(texts):>7.0%} "
+              f"{correct / len(texts):>9.0%} {lexicon_acc:>9} {mean_ms:>8.2f} "
+              f"{1 - mean_ms / full_ms:>9.0%}")
+        print(f"{'':>14} αιτίες: {cascade.stats()['reasons']}")
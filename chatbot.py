@@ -1,7 +1,15 @@
-from transformers import pipeline
+import os
+import sys
 
-# Φόρτωση μοντέλου
-analyzer = pipeline("sentiment-analysis", model="distilbert-base-uncased-finetuned-sst-2-english")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "app"))
+
+from language_router import LanguageRouter
+from sentiment_backends import create_pipeline
+
+# Φόρτωση μοντέλου (backend: SENTIMENT_BACKEND = torch | torch-int8 | onnx | onnx-int8)
+analyzer = create_pipeline()
+# Ελληνικά/Greeklish → λεξικό, αγγλικά → το μοντέλο
+router = LanguageRouter(transformer=lambda text: analyzer(text)[0])
 
 print("👋 Γεια σου! Πες μου πώς αισθάνεσαι σήμερα. (Γράψε 'exit' για έξοδο)\n")
 
@@ -12,11 +20,11 @@ while True:
         print("👋 Καλή συνέχεια! 😊")
         break
 
-    result = analyzer(user_input)[0]
+    result = router.route(user_input)
     label = result['label']
     score = result['score']
 
-    print(f"\n📊 Ανάλυση: {label} ({score:.2f})")
+    print(f"\n📊 Ανάλυση: {label} ({score:.2f}) [{result['language']} → {result['analyzer']}]")
 
     if label == 'POSITIVE':
         print("🤖 Chatbot: Χαίρομαι που νιώθεις καλά! 😄\n")
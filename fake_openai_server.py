@@ -0,0 +1,170 @@
+"""
+Τοπικός ψεύτικος OpenAI-compatible server (POST /v1/chat/completions),
+για tests και benchmarks χωρίς δίκτυο και χωρίς κόστος API.
+
+Υποστηρίζει κανονικές και streaming (SSE) απαντήσεις, με ρυθμιζόμενη
+καθυστέρηση πριν το πρώτο token και ανάμεσα στα tokens. Τηρεί το max_tokens
+(finish_reason "length") και το stream_options.include_usage.
+
+Χρήση:
+    with FakeOpenAIServer(reply="Γεια σου!", first_token_delay=0.2) as server:
+        client = OpenAI(base_url=server.base_url, api_key="test")
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeOpenAIServer:
+    def __init__(
+        self,
+        reply: str = "Σε ακούω. Ας πάρουμε μία ανάσα μαζί.",
+        first_token_delay: float = 0.0,
+        token_delay: float = 0.0,
+        model: str = "gpt-4o-mini",
+        failures: int = 0,
+        error_status: int = 500,
+    ):
+        self.reply = reply
+        # Τα πρώτα `failures` αιτήματα απαντώνται με σφάλμα error_status
+        self.failures = failures
+        self.error_status = error_status
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+        self.model = model
+        self.requests: list[dict] = []
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/v1"
+
+    def tokens(self) -> list[str]:
+        """Η απάντηση σε «tokens» (λέξεις μαζί με το κενό που ακολουθεί)."""
+        words = self.reply.split(" ")
+        return [w + " " for w in words[:-1]] + [words[-1]]
+
+    @staticmethod
+    def usage(body: dict, completion_tokens: int) -> dict:
+        prompt_tokens = sum(len(m.get("content", "")) for m in body.get("messages", [])) // 3
+        return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens}
+
+    def generated(self, body: dict) -> tuple[list[str], str]:
+        """Τα tokens που «γεννιούνται» για το αίτημα και το finish_reason."""
+        tokens = self.tokens()
+        max_tokens = body.get("max_tokens")
+        if max_tokens is not None and max_tokens < len(tokens):
+            return tokens[:max_tokens], "length"
+        return tokens, "stop"
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                fake.requests.append(body)
+                if not self.path.endswith("/chat/completions"):
+                    self.send_error(404)
+                    return
+                if fake.failures > 0:
+                    fake.failures -= 1
+                    self._error()
+                    return
+                time.sleep(fake.first_token_delay)
+                if body.get("stream"):
+                    self._stream(body)
+                else:
+                    self._complete(body)
+
+            def _error(self):
+                payload = json.dumps({
+                    "error": {"message": "fake failure", "type": "server_error", "code": None},
+                }).encode("utf-8")
+                self.send_response(fake.error_status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _complete(self, body: dict):
+                # Χωρίς streaming η απάντηση φεύγει όταν «γεννηθεί» ολόκληρη
+                tokens, finish_reason = fake.generated(body)
+                time.sleep(fake.token_delay * (len(tokens) - 1))
+                payload = json.dumps({
+                    "id": "chatcmpl-fake",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": fake.model,
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": "".join(tokens)},
+                        "finish_reason": finish_reason,
+                    }],
+                    "usage": fake.usage(body, len(tokens)),
+                }).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _stream(self, body: dict):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Connection", "close")
+                self.end_headers()
+
+                def send(chunk: dict):
+                    chunk = {
+                        "id": "chatcmpl-fake",
+                        "object": "chat.completion.chunk",
+                        "created": int(time.time()),
+                        "model": fake.model,
+                        **chunk,
+                    }
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+
+                def event(delta: dict, finish_reason=None):
+                    send({"choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]})
+
+                tokens, finish_reason = fake.generated(body)
+                event({"role": "assistant", "content": ""})
+                for i, token in enumerate(tokens):
+                    if i:
+                        time.sleep(fake.token_delay)
+                    event({"content": token})
+                event({}, finish_reason=finish_reason)
+                if (body.get("stream_options") or {}).get("include_usage"):
+                    send({"choices": [], "usage": fake.usage(body, len(tokens))})
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+                self.close_connection = True
+
+        return Handler
+
+    def start(self) -> "FakeOpenAIServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeOpenAIServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -1,4 +1,9 @@
-from app.sentiment import analyze_sentiment
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "app"))
+
+from sentiment import analyze_sentiment
 
 # Μερικά παραδείγματα φράσεων
 texts = [
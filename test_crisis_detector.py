@@ -0,0 +1,110 @@
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "app"))
+
+from crisis_detector import EXACT_RED_FLAGS, MAX_INPUT_CHARS, CrisisDetector
+
+# Παραλλαγές των φράσεων κρίσης: τόνοι, κεφαλαία, ορθογραφικά λάθη,
+# Greeklish, κολλημένες/σπασμένες λέξεις, στίξη.
+POSITIVE = [
+    "Δεν θέλω να ζω άλλο έτσι",
+    "δεν θελω να ζω",
+    "ΔΕΝ ΘΕΛΩ ΝΑ ΖΩ",
+    "δεν θελο να ζο",
+    "δεν θέλω, να ζω...",
+    "δενθέλω να ζω",
+    "den thelo na zo",
+    "den thelw na zw pia",
+    "σκέφτομαι την αυτοκτονία",
+    "σκεφτομαι να αυτοκτονησω",
+    "αυτοκτωνία",
+    "αυτο κτονία",
+    "autoktonia",
+    "θέλω να πεθάνω",
+    "θελω να πεθανο",
+    "thelo na pethano",
+    "δεν αντέχω άλλο",
+    "δεν αντέχω άλλον έναν",
+    "δεν αντεχω αλο!!!",
+    "δεν αντέχω άλλω",
+    "den antexo allo",
+    "θέλω να βλάψω τον εαυτό μου",
+    "να βλαψω τον εαυτο μου",
+    "να βλάψω τον εαφτό μου",
+    "θέλω να χτυπήσω τον εαυτό μου",
+    "να χτιπισω τον εαυτο μου",
+    "να κτυπήσω τον εαυτό μου",
+    "θέλω απλά να τελειώσω",
+    "na teleioso",
+]
+
+NEGATIVE = [
+    "Σήμερα ήταν καλή μέρα",
+    "θέλω να πάω σινεμά με φίλους",
+    "δεν θέλω να φάω τίποτα",
+    "νιώθω άγχος για τις εξετάσεις",
+    "δεν αντέχω τον θόρυβο",
+    "θέλω να ζω πιο ήρεμα",
+    "δεν κοιμήθηκα καλά χθες",
+    "ο εαυτός μου χρειάζεται ξεκούραση",
+    # άλλο πρόσωπο ρήματος
+    "δεν θέλω να πεθάνει η γάτα μου",
+    "θέλω να τελειώσει η εξεταστική",
+    "να χτυπήσω τον εαυτό σου;",
+    # κοινό πρόθεμα «αυτο-»
+    "πήρα το αυτοκίνητο για σέρβις",
+    "κόλλησα ένα αυτοκόλλητο",
+    "το αυτόματο πότισμα χάλασε",
+]
+
+with tempfile.TemporaryDirectory() as tmp:
+    audit_path = os.path.join(tmp, "crisis_audit.jsonl")
+    detector = CrisisDetector(audit_path=audit_path)
+
+    missed = [t for t in POSITIVE if not detector.detect(t).is_crisis]
+    false_alarms = [t for t in NEGATIVE if detector.detect(t).is_crisis]
+
+    recall = 1 - len(missed) / len(POSITIVE)
+    print(f"Recall: {recall:.0%} ({len(POSITIVE) - len(missed)}/{len(POSITIVE)})")
+    print("Χάθηκαν:", missed)
+    print("Ψευδείς συναγερμοί:", false_alarms)
+
+    with open(audit_path, encoding="utf-8") as f:
+        audit_lines = f.readlines()
+    print("Εγγραφές audit log:", len(audit_lines))
+
+    assert not missed
+    assert not false_alarms
+    assert len(audit_lines) == len(POSITIVE)
+
+    # Δάπεδο: ό,τι έπιανε το παλιό is_emergency πιάνεται πάντα, και μέσα σε λέξεις
+    for flag in EXACT_RED_FLAGS:
+        assert detector.detect(f"κάτι {flag}ς κάτι").is_crisis, flag
+
+    # Μεγάλο μήνυμα: το budget εξαντλείται, η φράση στο τέλος πιάνεται από το ακριβές regex
+    filler = "Σήμερα ήταν μια δύσκολη μέρα στη σχολή. " * 100
+    result = detector.detect(filler + "Δεν  αντέχω,  άλλο.")
+    print("Μεγάλο μήνυμα:", result)
+    assert result.is_crisis and result.budget_exhausted and not result.truncated
+
+    # Πολύ μεγάλο μήνυμα: το fuzzy στάδιο βλέπει μόνο αρχή και τέλος, σε φραγμένο χρόνο
+    huge = filler * 20
+    assert len(huge) > MAX_INPUT_CHARS
+    for text in ("Δεν  αντέχω,  άλλο. " + huge, huge + "Δεν  αντέχω,  άλλο."):
+        result = detector.detect(text)
+        print("Τεράστιο μήνυμα:", len(text), result)
+        assert result.is_crisis and result.truncated
+    result = detector.detect(huge)
+    assert not result.is_crisis and result.truncated
+
+    # ...αλλά οι EXACT_RED_FLAGS ελέγχονται σε όλο το μήνυμα, και στη μέση του
+    half = len(huge) // 2
+    result = detector.detect(huge[:half] + " θέλω να πεθάνω " + huge[half:])
+    print("Φράση στη μέση τεράστιου μηνύματος:", result)
+    assert result.is_crisis and result.phrase == "να πεθάνω" and not result.truncated
+
+# Το audit log δεν γράφεται: το αποτέλεσμα επιστρέφεται κανονικά
+broken = CrisisDetector(audit_path="/nonexistent/dir/crisis_audit.jsonl")
+assert broken.detect("θέλω να πεθάνω").is_crisis
@@ -1,7 +1,12 @@
-from transformers import pipeline
+import os
+import sys
 
-# Δημιουργία sentiment pipeline με DistilBERT
-analyzer = pipeline("sentiment-analysis", model="distilbert-base-uncased-finetuned-sst-2-english")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "app"))
+
+from sentiment_backends import create_pipeline
+
+# Δημιουργία sentiment pipeline με DistilBERT (backend: SENTIMENT_BACKEND = torch | torch-int8 | onnx | onnx-int8)
+analyzer = create_pipeline()
 
 # Αγγλικό κείμενο για ανάλυση
 text = "I'm feeling a bit tired but also really proud of what I achieved today."
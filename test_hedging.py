@@ -0,0 +1,106 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "app"))
+
+import resources
+from fake_openai_server import FakeOpenAIServer
+from hedging import pop_late_replies, start_hedged_reply, turn_outcomes
+from llm_cache import ResponseCache
+from llm_client import ManagedLLMClient, create_openai_client
+
+REPLY = "Σε ακούω. Ας πάρουμε μία ανάσα μαζί."
+
+
+def use_server(server):
+    resources.replace("openai_client", ManagedLLMClient(create_openai_client("test", base_url=server.base_url)))
+
+
+# Η cache μένει στη μνήμη, ώστε κάθε γύρος να φτάνει στον server
+resources.replace("llm_cache", ResponseCache(":memory:"))
+
+# 1. Γρήγορο LLM: προλαβαίνει το deadline
+with FakeOpenAIServer(reply=REPLY, first_token_delay=0.05) as server:
+    use_server(server)
+    hedge = start_hedged_reply("s1", 50, "6–8", "4–6", "γρήγορο", None, deadline_s=1.0, log_path=None)
+    assert hedge.arrived_in_time()
+    assert "".join(hedge.chunks()) == REPLY
+    assert turn_outcomes()[-1]["outcome"] == "llm"
+    print("Γρήγορο LLM →", turn_outcomes()[-1])
+
+# 2. Αργό LLM με policy "append": fallback αμέσως, η απάντηση έρχεται αργότερα
+with FakeOpenAIServer(reply=REPLY, first_token_delay=0.6) as server:
+    use_server(server)
+    start = time.perf_counter()
+    hedge = start_hedged_reply("s2", 50, "6–8", "4–6", "αργό", None, deadline_s=0.2,
+                               late_policy="append", log_path=None)
+    assert not hedge.arrived_in_time()
+    waited = time.perf_counter() - start
+    assert waited < 0.4, waited
+    assert turn_outcomes()[-1]["outcome"] == "fallback"
+    print(f"Αργό LLM → fallback μετά από {waited * 1000:.0f} ms")
+
+    time.sleep(1.0)
+    assert pop_late_replies("s2") == [REPLY]
+    assert pop_late_replies("s2") == []
+    assert turn_outcomes()[-1]["outcome"] == "late-llm"
+    print("Καθυστερημένη απάντηση →", turn_outcomes()[-1])
+
+# 3. Αργό LLM με policy "drop": καταγράφεται, αλλά δεν προστίθεται
+with FakeOpenAIServer(reply=REPLY, first_token_delay=0.6) as server:
+    use_server(server)
+    hedge = start_hedged_reply("s3", 50, "6–8", "4–6", "αργό πάλι", None, deadline_s=0.2,
+                               late_policy="drop", log_path=None)
+    assert not hedge.arrived_in_time()
+    time.sleep(1.0)
+    assert pop_late_replies("s3") == []
+    assert turn_outcomes()[-1]["outcome"] == "late-llm"
+
+# 4. Server εκτός λειτουργίας: fallback χωρίς αναμονή μέχρι το deadline
+hedge = start_hedged_reply("s4", 50, "6–8", "4–6", "χωρίς server", None, deadline_s=5.0, log_path=None)
+start = time.perf_counter()
+assert not hedge.arrived_in_time()
+assert time.perf_counter() - start < 2.0
+print("Σφάλμα API → fallback:", turn_outcomes()[-1])
+
+# 5. Το stream «κολλά» μετά το πρώτο κομμάτι: το chunks() δεν μπλοκάρει για πάντα
+with FakeOpenAIServer(reply=REPLY, first_token_delay=0.05, token_delay=1.0) as server:
+    use_server(server)
+    hedge = start_hedged_reply("s5", 50, "6–8", "4–6", "κολλημένο", None, deadline_s=1.0,
+                               log_path=None, stall_s=0.3)
+    assert hedge.arrived_in_time()
+    start = time.perf_counter()
+    partial = "".join(hedge.chunks())
+    waited = time.perf_counter() - start
+    assert hedge.interrupted and partial and partial != REPLY and REPLY.startswith(partial)
+    assert waited < 0.6, waited
+    assert turn_outcomes()[-1]["outcome"] == "llm-stalled"
+    print(f"Κολλημένο stream → {partial!r} μετά από {waited * 1000:.0f} ms")
+
+# 6. Το stream κόβεται με σφάλμα (read timeout) μετά το πρώτο κομμάτι:
+#    το κομμάτι μένει, αλλά ο γύρος σημειώνεται ως διακομμένος
+with FakeOpenAIServer(reply=REPLY, first_token_delay=0.05, token_delay=1.0) as server:
+    resources.replace("openai_client", ManagedLLMClient(
+        create_openai_client("test", base_url=server.base_url), timeout=0.3))
+    hedge = start_hedged_reply("s6", 50, "6–8", "4–6", "κομμένο", None, deadline_s=1.0, log_path=None)
+    assert hedge.arrived_in_time()
+    partial = "".join(hedge.chunks())
+    assert hedge.interrupted and hedge.status["error"] and partial and REPLY.startswith(partial)
+    assert turn_outcomes()[-1]["outcome"] == "llm-error"
+    print(f"Κομμένο stream → {partial!r}, {hedge.status['error'][:40]}")
+
+# 7. Περισσότεροι από 4 ταυτόχρονοι αργοί γύροι (άλλα sessions): κανείς δεν
+#    περιμένει σε ουρά πίσω από τους άλλους, όλοι προλαβαίνουν το deadline
+long_reply = " ".join(["λέξη"] * 30)
+with FakeOpenAIServer(reply=long_reply, first_token_delay=0.2, token_delay=0.05) as server:
+    use_server(server)
+    hedges = [
+        start_hedged_reply(f"p{i}", 50, "6–8", "4–6", f"αργός γύρος {i}", None,
+                           deadline_s=1.0, log_path=None)
+        for i in range(8)
+    ]
+    on_time = [hedge.arrived_in_time() for hedge in hedges]
+    assert all(on_time), on_time
+    assert all("".join(hedge.chunks()).strip() for hedge in hedges)
+    print(f"{len(hedges)} ταυτόχρονοι αργοί γύροι → όλοι στην ώρα τους")
@@ -0,0 +1,51 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "app"))
+
+from language_router import LanguageRouter
+
+transformer_calls = []
+
+
+def fake_transformer(text):
+    transformer_calls.append(text)
+    return {"label": "POSITIVE", "score": 0.99}
+
+
+router = LanguageRouter(transformer=fake_transformer)
+
+cases = {
+    "el": ["Είμαι πολύ καλά σήμερα", "Νιώθω μόνη και λυπημένη", "είμαι ok", "", "123 !!!"],
+    "greeklish": [
+        "eimai poly kourasmeni simera", "exw agxos gia tis eksetaseis", "kalimera ti kaneis",
+        "nomizw oti den mporw allo", "niwthw monos", "efaga kai koimithika kala",
+    ],
+    "en": [
+        "I am very happy today", "This is the worst day ever.", "I can't sleep",
+        "Nothing makes sense anymore...", "so lonely tonight", "my friends are great",
+    ],
+}
+for language, texts in cases.items():
+    for text in texts:
+        detected = router.detect(text)
+        print(f"{text!r:40} → {detected}")
+        assert detected == language, (text, detected)
+
+# Ελληνικά / Greeklish → λεξικό, αγγλικά → transformer
+result = router.route("Νιώθω φόβο και θλίψη")
+assert result == {"label": "NEGATIVE", "score": 1.0, "language": "el", "analyzer": "lexicon"}
+result = router.route("niwthw fobo kai thlipsi")
+assert result["language"] == "greeklish" and result["analyzer"] == "lexicon"
+assert result["label"] == "NEGATIVE"
+assert router.route("Πήγα στη δουλειά")["label"] == "NEUTRAL"
+result = router.route("I feel great today")
+assert result == {"label": "POSITIVE", "score": 0.99, "language": "en", "analyzer": "transformer"}
+assert transformer_calls == ["I feel great today"]
+
+stats = router.stats()
+print("Stats:", stats)
+assert stats["routes"] == {"el": 2, "greeklish": 1, "en": 1}
+assert set(stats["analyze_ms"]) == {"el", "greeklish", "en"}
+assert stats["detect_p50_us"] is not None
+assert router.profiles.dtype.name == "float16" and router.profiles.shape == (2, 27 ** 3)
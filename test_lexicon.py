@@ -1,4 +1,9 @@
-from app.lexicon_sentiment import analyze_lexicon_sentiment
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "app"))
+
+from lexicon_sentiment import analyze_lexicon_sentiment
 
 keimeno = "Είμαι πολύ χαρούμενος σήμερα αλλά νιώθω λίγο κουρασμένος."
 apotelesma = analyze_lexicon_sentiment(keimeno)
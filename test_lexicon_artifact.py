@@ -0,0 +1,65 @@
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "app"))
+
+from lexicon_artifact import FORMAT_VERSION, LEXICON_TSV, load_artifact, tsv_hash  # noqa: E402
+from text_normalization import normalize_token  # noqa: E402
+
+tmp = tempfile.mkdtemp()
+tsv = os.path.join(tmp, "lexicon.tsv")
+glex = os.path.join(tmp, "lexicon.glex")
+shutil.copy(LEXICON_TSV, tsv)
+
+
+def version_of(path: str) -> int:
+    with open(path, "rb") as f:
+        return struct.unpack_from("<H", f.read(6), 4)[0]
+
+
+# Λείπει → χτίζεται και φορτώνεται με mmap
+first = load_artifact(tsv, glex)
+assert isinstance(first.data, mmap.mmap) and first.tsv_sha256 == tsv_hash(tsv)
+term_id = first.find(normalize_token("χαρά"))
+assert term_id >= 0
+built_at = os.stat(glex).st_mtime_ns
+print(f"Artifact: {len(first)} όροι, {os.path.getsize(glex)} bytes")
+
+# Ίδιο TSV → δεν ξαναχτίζεται
+assert load_artifact(tsv, glex).tsv_sha256 == first.tsv_sha256
+assert os.stat(glex).st_mtime_ns == built_at
+
+# Το TSV άλλαξε (το .glex «πάλιωσε») → νέο artifact με το νέο hash
+with open(tsv, "a", encoding="utf-8") as f:
+    f.write("\n")
+rebuilt = load_artifact(tsv, glex)
+assert rebuilt.tsv_sha256 == tsv_hash(tsv) != first.tsv_sha256
+assert rebuilt.find(normalize_token("χαρά")) == term_id
+print("Αλλαγμένο TSV → rebuild")
+
+# Παλιό FORMAT_VERSION → rebuild
+with open(glex, "r+b") as f:
+    f.seek(4)
+    f.write(struct.pack("<H", FORMAT_VERSION - 1))
+assert version_of(glex) == FORMAT_VERSION - 1
+assert len(load_artifact(tsv, glex)) == len(first)
+assert version_of(glex) == FORMAT_VERSION
+print("Παλιά έκδοση → rebuild σε v%d" % FORMAT_VERSION)
+
+# Κατεστραμμένο (κομμένο) αρχείο → rebuild
+with open(glex, "r+b") as f:
+    f.truncate(10)
+assert load_artifact(tsv, glex).find(normalize_token("χαρά")) == term_id
+assert os.path.getsize(glex) > 10
+print("Κατεστραμμένο αρχείο → rebuild")
+
+# Ο φάκελος δεν είναι εγγράψιμος (εδώ: δεν υπάρχει) → αντίγραφο στη μνήμη
+missing = os.path.join(tmp, "δεν-υπάρχει", "lexicon.glex")
+in_memory = load_artifact(tsv, missing)
+assert isinstance(in_memory.data, bytes) and not os.path.exists(missing)
+assert in_memory.find(normalize_token("χαρά")) == term_id
+print("OSError στο build → λεξικό στη μνήμη")
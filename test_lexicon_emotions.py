@@ -0,0 +1,53 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "app"))
+
+from emotional_map import extract_emotional_tags  # noqa: E402
+from lexicon_artifact import _consensus_polarity, _read_rows  # noqa: E402
+from lexicon_sentiment import (  # noqa: E402
+    analyze_lexicon_emotions,
+    analyze_lexicon_sentiment,
+    lookup_tokens,
+)
+from text_normalization import normalize_text  # noqa: E402
+
+
+def row(polarity, subjectivity):
+    out = {f"Polarity{i}": v for i, v in enumerate(polarity, 1)}
+    out.update({f"Subjectivity{i}": v for i, v in enumerate(subjectivity, 1)})
+    return out
+
+
+# Πολικότητα από τη συναίνεση των annotators, όχι μόνο από τον πρώτο
+assert _consensus_polarity(row(["POS", "NEG", "NEG", "N/A"], ["SUBJ+"] * 4)) == -1
+assert _consensus_polarity(row(["N/A", "POS", "BOTH", "POS"], ["OBJ", "SUBJ+", "SUBJ-", "SUBJ+"])) == 1
+assert _consensus_polarity(row(["POS", "NEG", "N/A", "N/A"], ["SUBJ+", "SUBJ-", "OBJ"])) == 0
+assert _consensus_polarity(row(["N/A"] * 4, ["SUBJ+"] * 4)) is None
+# Οι περισσότεροι τον έκριναν αντικειμενικό → εκτός λεξικού· σε ισοπαλία αποφασίζει ο πρώτος
+assert _consensus_polarity(row(["NEG", "N/A", "N/A", "N/A"], ["SUBJ-", "OBJ", "OBJ", "OBJ"])) is None
+assert _consensus_polarity(row(["NEG", "N/A", "NEG", "N/A"], ["SUBJ-", "OBJ", "SUBJ-", "OBJ"])) == -1
+assert _consensus_polarity(row(["N/A", "N/A", "BOTH", "BOTH"], ["OBJ", "OBJ", "SUBJ-", "SUBJ+"])) is None
+
+rows = list(_read_rows(os.path.join(os.path.dirname(__file__), "app", "greek_sentiment_lexicon.tsv")))
+print("Όροι λεξικού:", len(rows), "| πολικότητες:", {c: sum(r[1] == c for r in rows) for c in (-1, 0, 1)})
+assert all(0.0 <= v <= 1.0 for _, _, values in rows for v in values if v == v)
+
+# Ένταση συναισθημάτων: ο φόβος κυριαρχεί σε μήνυμα φόβου
+emotions = analyze_lexicon_emotions("φοβάμαι πολύ, νιώθω τρόμο")
+print("Συναισθήματα:", emotions)
+assert emotions["matched"] > 0
+assert max(emotions["emotions"], key=emotions["emotions"].get) == "Fear"
+
+# Τα tags του λεξικού δεν εκτοπίζουν τα βασικά (ύπνος/νερό) από τις 4 θέσεις
+tags = [label for _, label in extract_emotional_tags(50, "0–2", "0", "νιώθω θλίψη και θυμό και φόβο")]
+print("Tags χάρτη:", tags)
+assert tags[:3] == ["Αβεβαιότητα", "Ανάγκη για ξεκούραση", "Ανάγκη για φροντίδα σώματος"]
+assert len(tags) == 4
+
+# Πολικότητα από τα ids όρων == πολικότητα ανά token
+keimeno = "Είμαι πολύ χαρούμενος σήμερα αλλά νιώθω λίγο κουρασμένος."
+apotelesma = analyze_lexicon_sentiment(keimeno)
+labels = lookup_tokens(normalize_text(keimeno).tokens)
+assert apotelesma["positive"] == labels.count("positive")
+assert apotelesma["negative"] == labels.count("negative")
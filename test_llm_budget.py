@@ -0,0 +1,70 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "app"))
+
+import resources
+from fake_openai_server import FakeOpenAIServer
+from llm import PROMPT_INSTRUCTIONS, latency_plan, llm_therapeutic_reply_stream, session_usage
+from llm_budget import (
+    LLM_MAX_TOKENS, SHORT_MIN_TOKENS, TEMPLATE_FULL, TEMPLATE_SHORT,
+    LatencyController, UsageLedger, cost_usd,
+)
+from llm_cache import ResponseCache
+from llm_client import ManagedLLMClient, create_openai_client
+
+# 1. Controller: γρήγορο API → πλήρης απάντηση, αργό → σύντομο πρότυπο
+controller = LatencyController(slo_seconds=8.0)
+assert controller.plan() == (LLM_MAX_TOKENS, TEMPLATE_FULL, None)
+for _ in range(10):
+    controller.observe(ttft_s=0.3, total_s=0.3 + 200 / 60, completion_tokens=201)
+fast = controller.plan()
+print("Γρήγορο API:", controller.snapshot())
+assert fast.template == TEMPLATE_FULL and fast.max_tokens == LLM_MAX_TOKENS
+assert fast.predicted_s <= 8.0
+
+for _ in range(50):
+    controller.observe(ttft_s=3.0, total_s=3.0 + 200 / 25, completion_tokens=201)
+slow = controller.plan()
+print("Αργό API   :", controller.snapshot())
+assert slow.template == TEMPLATE_SHORT and SHORT_MIN_TOKENS <= slow.max_tokens < fast.max_tokens
+
+# 2. Λογιστική ανά session
+ledger = UsageLedger()
+ledger.record("a", 1000, 200)
+ledger.record("a", 500, 100)
+ledger.record("b", 10, 10)
+assert ledger.session("a")["prompt_tokens"] == 1500 and ledger.session("a")["calls"] == 2
+assert abs(ledger.totals()["cost_usd"] - round(cost_usd(1510, 310), 6)) < 1e-9
+assert ledger.session("άγνωστο")["calls"] == 0
+
+# 3. Από άκρη σε άκρη: αργό API → το επόμενο αίτημα ζητά λιγότερα tokens και σύντομο πρότυπο
+REPLY = " ".join(["λέξη"] * 300)
+resources.replace("llm_cache", ResponseCache(":memory:"))
+resources.replace("latency_controller", LatencyController(slo_seconds=2.0, min_samples=2))
+resources.replace("usage_ledger", UsageLedger())
+with FakeOpenAIServer(reply=REPLY, first_token_delay=0.1, token_delay=0.01) as server:
+    resources.replace("openai_client", ManagedLLMClient(create_openai_client("test", base_url=server.base_url)))
+    for i, message in enumerate(["Σήμερα δούλεψα πολύ", "Διάβασα για τις εξετάσεις", "Είδα φίλους"]):
+        text = "".join(llm_therapeutic_reply_stream(40, "3–5", "1–3", message, None, session_id="s1"))
+        body = server.requests[-1]
+        print(f"Γύρος {i + 1}: max_tokens={body['max_tokens']}, "
+              f"σύντομο={PROMPT_INSTRUCTIONS[TEMPLATE_SHORT] in body['messages'][-1]['content']}, "
+              f"λέξεις απάντησης={len(text.split())}")
+
+    first, last = server.requests[0], server.requests[-1]
+    assert first["max_tokens"] == LLM_MAX_TOKENS
+    assert PROMPT_INSTRUCTIONS[TEMPLATE_FULL] in first["messages"][-1]["content"]
+    assert last["max_tokens"] < LLM_MAX_TOKENS
+    assert PROMPT_INSTRUCTIONS[TEMPLATE_SHORT] in last["messages"][-1]["content"]
+    assert latency_plan()["template"] == TEMPLATE_SHORT
+
+    usage = session_usage("s1")
+    print("Χρήση session:", usage)
+    assert usage["calls"] == 3 and usage["completion_tokens"] == 2 * 300 + last["max_tokens"]
+    assert usage["cost_usd"] > 0
+
+    # Οι ολόκληρες απαντήσεις μπήκαν στην cache (κλειδί του session + κοινό,
+    # αφού στάλθηκαν χωρίς context)· η κομμένη από το max_tokens όχι
+    assert len(server.requests) == 3
+    assert len(resources.get("llm_cache")) == 2 * 2
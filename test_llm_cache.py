@@ -0,0 +1,57 @@
+import itertools
+import os
+import sys
+import tempfile
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "app"))
+
+import llm_cache  # noqa: E402
+from llm_cache import LLM_CACHE_MAX_ENTRIES, ResponseCache, cache_key  # noqa: E402
+
+# Ελεγχόμενο ρολόι: κάθε πράξη της cache βλέπει ένα δευτερόλεπτο αργότερα
+clock = itertools.count(1_000_000)
+llm_cache.time = types.SimpleNamespace(time=lambda: float(next(clock)))
+
+# Σταθερό κλειδί (ίδιο σε κάθε διεργασία/εκτέλεση), ανεξάρτητο από κενά και πεζά/κεφαλαία
+key = cache_key("gpt-4o-mini", "system", "Διάθεση: 30")
+assert key == "f0d69a4eca592402d7971b903b18b5d397e03ba62812714f2285bc96b94c1c0e"
+assert cache_key("gpt-4o-mini", "  SYSTEM ", "Διάθεση:\n30") == key
+assert cache_key("gpt-4o", "system", "Διάθεση: 30") != key            # άλλο μοντέλο
+assert cache_key("gpt-4o-mini", "system", "Διάθεση: 90") != key       # άλλος αριθμός
+assert cache_key("gpt-4o-mini", "system", "Διαθεση: 30") != key       # οι τόνοι μετράνε
+assert cache_key("gpt-4o-mini", "systemΔιάθεση: 30") != key           # όρια prompts
+
+# TTL: μετά από ttl_seconds η εγγραφή είναι miss και σβήνεται
+cache = ResponseCache(":memory:", ttl_seconds=10)
+cache.put(key, "gpt-4o-mini", "Σε ακούω.")
+assert cache.get(key) == "Σε ακούω."
+for _ in range(10):
+    next(clock)
+assert cache.get(key) is None and len(cache) == 0
+stats = cache.stats()
+assert stats["hits"] == 1 and stats["misses"] == 1 and stats["expired"] == 1
+print("TTL:", stats)
+
+# LRU: πάνω από 5000 εγγραφές σβήνεται η λιγότερο πρόσφατα χρησιμοποιημένη
+cache = ResponseCache(":memory:")
+assert cache.max_entries == LLM_CACHE_MAX_ENTRIES == 5_000
+keys = [cache_key("gpt-4o-mini", f"μήνυμα {i}") for i in range(5_001)]
+for k in keys[:5_000]:
+    cache.put(k, "gpt-4o-mini", k[:8])
+assert len(cache) == 5_000 and cache.evictions == 0
+assert cache.get(keys[0]) == keys[0][:8]          # η παλαιότερη γίνεται πιο πρόσφατη
+cache.put(keys[5_000], "gpt-4o-mini", "νέα")
+assert len(cache) == 5_000 and cache.evictions == 1
+assert cache.get(keys[1]) is None                 # αυτή σβήστηκε
+assert cache.get(keys[0]) is not None and cache.get(keys[5_000]) == "νέα"
+print("LRU:", cache.stats())
+
+# WAL: η βάση στο δίσκο ξανανοίγει με τα δεδομένα της
+path = os.path.join(tempfile.mkdtemp(), "llm_cache.sqlite3")
+first = ResponseCache(path)
+first.put(key, "gpt-4o-mini", "Σε ακούω.")
+reopened = ResponseCache(path)
+assert reopened._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+assert reopened.get(key) == "Σε ακούω." and len(reopened) == 1
+print("WAL reopen:", reopened.stats())
@@ -0,0 +1,83 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "app"))
+
+from fake_openai_server import FakeOpenAIServer
+from llm_client import CircuitBreaker, CircuitOpenError, ManagedLLMClient, create_openai_client
+
+MESSAGES = [{"role": "user", "content": "γεια"}]
+
+# 1. Δύο σφάλματα 500 και μετά επιτυχία: τα retries το καλύπτουν
+with FakeOpenAIServer(reply="Εντάξει.", failures=2) as server:
+    client = ManagedLLMClient(create_openai_client("test", base_url=server.base_url), max_retries=2)
+    resp = client.chat_completion(model="gpt-4o-mini", messages=MESSAGES)
+    assert resp.choices[0].message.content == "Εντάξει."
+    assert len(server.requests) == 3
+    print("Retries:", client.metrics())
+
+# 2. Timeout ανά κλήση: αργός server → σφάλμα μετά το timeout, όχι μετά από 20''
+with FakeOpenAIServer(first_token_delay=1.0) as server:
+    client = ManagedLLMClient(create_openai_client("test", base_url=server.base_url), max_retries=0)
+    start = time.perf_counter()
+    try:
+        client.chat_completion(model="gpt-4o-mini", messages=MESSAGES, timeout=0.2)
+        raise AssertionError("expected timeout")
+    except CircuitOpenError:
+        raise
+    except Exception:
+        pass
+    assert time.perf_counter() - start < 0.8
+    print(f"Timeout μετά από {(time.perf_counter() - start) * 1000:.0f} ms")
+
+# 3. Circuit breaker: συνεχή σφάλματα → ανοίγει, παρακάμπτει το API, ξαναδοκιμάζει μετά το cooldown
+with FakeOpenAIServer(reply="Πάλι εδώ.", failures=5) as server:
+    breaker = CircuitBreaker(window=10, min_calls=5, error_rate=0.5, cooldown_seconds=0.3)
+    client = ManagedLLMClient(create_openai_client("test", base_url=server.base_url),
+                              max_retries=0, breaker=breaker)
+    for _ in range(5):
+        try:
+            client.chat_completion(model="gpt-4o-mini", messages=MESSAGES)
+        except Exception:
+            pass
+    assert client.metrics()["breaker_state"] == "open"
+
+    sent = len(server.requests)
+    start = time.perf_counter()
+    try:
+        client.chat_completion(model="gpt-4o-mini", messages=MESSAGES)
+        raise AssertionError("expected CircuitOpenError")
+    except CircuitOpenError:
+        pass
+    assert len(server.requests) == sent
+    print(f"Breaker ανοιχτός: fallback σε {(time.perf_counter() - start) * 1e6:.0f} µs, "
+          f"χωρίς αίτημα στο API")
+
+    time.sleep(0.35)
+    resp = client.chat_completion(model="gpt-4o-mini", messages=MESSAGES)
+    assert resp.choices[0].message.content == "Πάλι εδώ."
+    metrics = client.metrics()
+    assert metrics["breaker_state"] == "closed"
+    print("Μετά το δοκιμαστικό αίτημα:", metrics)
+
+# 4. Δοκιμαστικό stream σε half-open που δεν διαβάζεται ποτέ: ο breaker
+#    δεν μένει half-open για πάντα, μετά το probe timeout περνά νέο δοκιμαστικό
+with FakeOpenAIServer(reply="Πάλι εδώ.", failures=5) as server:
+    breaker = CircuitBreaker(window=10, min_calls=5, error_rate=0.5, cooldown_seconds=0.1,
+                             probe_timeout_seconds=0.3)
+    client = ManagedLLMClient(create_openai_client("test", base_url=server.base_url),
+                              max_retries=0, breaker=breaker)
+    for _ in range(5):
+        try:
+            client.chat_completion(model="gpt-4o-mini", messages=MESSAGES)
+        except Exception:
+            pass
+    time.sleep(0.15)
+    abandoned = client.chat_completion(model="gpt-4o-mini", messages=MESSAGES, stream=True)
+    assert breaker.state == "half-open" and not breaker.allow()
+    time.sleep(0.35)
+    resp = client.chat_completion(model="gpt-4o-mini", messages=MESSAGES)
+    assert resp.choices[0].message.content == "Πάλι εδώ."
+    assert breaker.state == "closed"
+    print("Χαμένο δοκιμαστικό stream → νέο δοκιμαστικό μετά το timeout:", breaker.state)
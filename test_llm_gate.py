@@ -0,0 +1,110 @@
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "app"))
+
+import resources
+from fake_openai_server import FakeOpenAIServer
+from llm import flow_stats, llm_therapeutic_reply, llm_therapeutic_reply_stream
+from llm_client import ManagedLLMClient, create_openai_client
+from llm_gate import SessionRateLimiter, TokenBucket
+
+REPLY = "Είναι κατανοητό να νιώθεις πίεση. Ας κάνουμε ένα μικρό βήμα."
+
+
+def run_concurrently(fn, n):
+    results = [None] * n
+    barrier = threading.Barrier(n)
+
+    def worker(i):
+        barrier.wait()
+        results[i] = fn()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+# 1. Token bucket με ψεύτικο ρολόι
+now = [0.0]
+bucket = TokenBucket(capacity=2, refill_per_second=0.5, clock=lambda: now[0])
+assert [bucket.try_acquire() for _ in range(3)] == [True, True, False]
+now[0] = 2.0
+assert bucket.try_acquire() and not bucket.try_acquire()
+print("Token bucket: OK")
+
+with FakeOpenAIServer(reply=REPLY, first_token_delay=0.3, token_delay=0.01) as server:
+    resources.replace("openai_client", ManagedLLMClient(create_openai_client("test", base_url=server.base_url)))
+    resources.replace("llm_rate_limiter", SessionRateLimiter(burst=100))
+
+    # 2. Οκτώ ταυτόχρονα ίδια αιτήματα → ένα αίτημα στο API
+    replies = run_concurrently(
+        lambda: llm_therapeutic_reply(30, "3–5", "1–3", "Έχω πολύ άγχος", None, use_cache=False), 8
+    )
+    assert replies == [REPLY] * 8, replies
+    assert len(server.requests) == 1, len(server.requests)
+    print("Blocking: 8 ταυτόχρονα αιτήματα →", len(server.requests), "κλήση στο API")
+
+    # 3. Το ίδιο με streaming: όλοι παίρνουν όλα τα κομμάτια
+    streams = run_concurrently(
+        lambda: "".join(llm_therapeutic_reply_stream(30, "3–5", "1–3", "Έχω πολύ άγχος", None,
+                                                     use_cache=False)), 6
+    )
+    assert streams == [REPLY] * 6
+    assert len(server.requests) == 2
+    print("Stream: 6 ταυτόχρονα αιτήματα → 1 κλήση στο API")
+
+    # 4. Διαφορετικά prompts δεν συγχωνεύονται
+    run_concurrently(
+        lambda: llm_therapeutic_reply(30, "3–5", "1–3", f"Μήνυμα {threading.get_ident()}", None,
+                                      use_cache=False), 3
+    )
+    assert len(server.requests) == 5
+
+    # 5. Όριο ανά session: μετά το burst → None (fallback) χωρίς αίτημα στο API
+    resources.replace("llm_rate_limiter", SessionRateLimiter(burst=2, per_minute=1))
+    sent = len(server.requests)
+    results = [
+        llm_therapeutic_reply(30, "3–5", "1–3", f"Μήνυμα {i}", None, use_cache=False, session_id="s1")
+        for i in range(3)
+    ]
+    assert results[:2] == [REPLY, REPLY] and results[2] is None
+    assert len(server.requests) == sent + 2
+    assert list(llm_therapeutic_reply_stream(30, "3–5", "1–3", "Άλλο", None,
+                                             use_cache=False, session_id="s1")) == []
+    # Άλλο session δεν επηρεάζεται
+    assert llm_therapeutic_reply(30, "3–5", "1–3", "Μήνυμα", None, use_cache=False, session_id="s2") == REPLY
+    print("Όριο ανά session:", flow_stats())
+
+    # 6. Συγχωνευμένοι followers δεν χρεώνονται στο όριο του session τους
+    limiter = SessionRateLimiter(burst=1, per_minute=1)
+    resources.replace("llm_rate_limiter", limiter)
+    sent = len(server.requests)
+    replies = run_concurrently(
+        lambda: llm_therapeutic_reply(30, "3–5", "1–3", "Κοινό μήνυμα", None, use_cache=False,
+                                      session_id=f"f{threading.get_ident()}"), 4
+    )
+    assert replies == [REPLY] * 4 and len(server.requests) == sent + 1
+    assert limiter.stats()["rate_allowed"] == 1
+    print("Followers χωρίς χρέωση:", limiter.stats())
+
+    # 7. Ο leader σταματά το stream νωρίς: ο follower δεν το δείχνει ως ολόκληρη απάντηση
+    resources.replace("llm_rate_limiter", SessionRateLimiter(burst=100))
+    leader = llm_therapeutic_reply_stream(30, "3–5", "1–3", "Μισό stream", None, use_cache=False)
+    first = next(leader)
+    status: dict = {}
+    follower_text = []
+    follower = threading.Thread(target=lambda: follower_text.extend(llm_therapeutic_reply_stream(
+        30, "3–5", "1–3", "Μισό stream", None, use_cache=False, status=status)))
+    follower.start()
+    time.sleep(0.1)
+    leader.close()
+    follower.join(timeout=5)
+    assert "".join(follower_text).startswith(first) and "".join(follower_text) != REPLY
+    assert "FlightInterrupted" in status["error"]
+    print("Follower μισού stream:", status)
@@ -0,0 +1,53 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "app"))
+
+import resources  # noqa: E402
+from conversation_context import ConversationContext  # noqa: E402
+from fake_openai_server import FakeOpenAIServer  # noqa: E402
+from llm import llm_therapeutic_reply, llm_therapeutic_reply_stream  # noqa: E402
+from llm_cache import ResponseCache  # noqa: E402
+from llm_client import ManagedLLMClient, create_openai_client  # noqa: E402
+from semantic_cache import SemanticCache  # noqa: E402
+
+REPLY = "Ακούγεται ότι το άγχος σε βαραίνει. Ας πάρουμε μια ανάσα μαζί."
+CHECKIN = (35, "3–5", "1–3", "Έχω άγχος για τις εξετάσεις")
+
+resources.replace("llm_cache", ResponseCache(":memory:"))
+resources.replace("semantic_cache", SemanticCache())
+
+with FakeOpenAIServer(reply=REPLY, first_token_delay=0.0, token_delay=0.0) as server:
+    resources.replace("openai_client", ManagedLLMClient(create_openai_client("test", base_url=server.base_url)))
+
+    def turn(ctx: ConversationContext, session_id: str, stream: bool = False) -> str:
+        history = ctx.messages()
+        if stream:
+            reply = "".join(llm_therapeutic_reply_stream(*CHECKIN, None, session_id=session_id,
+                                                         context=history))
+        else:
+            reply = llm_therapeutic_reply(*CHECKIN, None, session_id=session_id, context=history)
+        ctx.add("user", CHECKIN[3])
+        ctx.add("assistant", reply)
+        return reply
+
+    # Πρώτος γύρος (χωρίς context) → μία κλήση στο API
+    alice = ConversationContext()
+    assert turn(alice, "alice") == REPLY and len(server.requests) == 1
+
+    # Το ίδιο check-in ξανά στο ίδιο session: οι πρόσφατοι γύροι άλλαξαν,
+    # αλλά η απάντηση έρχεται από την cache — και στους επόμενους γύρους
+    for i in range(4):
+        assert turn(alice, "alice", stream=i % 2 == 1) == REPLY
+    assert len(server.requests) == 1
+    assert alice.summary(), "τα παλιά μηνύματα πέρασαν στη σύνοψη"
+    print("Ίδιο check-in στο ίδιο session:", resources.get("llm_cache").stats())
+
+    # Άλλο session με context: η απάντηση της alice γράφτηκε για τη δική της
+    # συζήτηση, οπότε δεν της δίνεται (ούτε από τη σημασιολογική cache)
+    bob = ConversationContext()
+    bob.add("user", "Γεια")
+    bob.add("assistant", "Γεια σου!")
+    turn(bob, "bob")
+    assert len(server.requests) == 2
+    print("Άλλο session:", len(server.requests), "κλήσεις στο API")
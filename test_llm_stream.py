@@ -0,0 +1,54 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "app"))
+
+import resources
+from fake_openai_server import FakeOpenAIServer
+from llm import llm_therapeutic_reply, llm_therapeutic_reply_stream, stream_timings
+from llm_client import ManagedLLMClient, create_openai_client
+
+REPLY = (
+    "Ακούγεται ότι η μέρα σου ήταν βαριά. Είναι εντάξει να νιώθεις έτσι. "
+    "Ας σκεφτούμε ένα πολύ μικρό βήμα για απόψε."
+)
+
+with FakeOpenAIServer(reply=REPLY, first_token_delay=0.3, token_delay=0.02) as server:
+    resources.replace("openai_client", ManagedLLMClient(create_openai_client("test", base_url=server.base_url)))
+
+    # Χωρίς streaming: ο χρήστης περιμένει όλη την απάντηση
+    start = time.perf_counter()
+    blocking = llm_therapeutic_reply(40, "3–5", "1–3", "Έχω άγχος", None, use_cache=False)
+    t_blocking = time.perf_counter() - start
+
+    # Με streaming: μετράμε πότε έρχεται κάθε κομμάτι
+    start = time.perf_counter()
+    arrivals = []
+    chunks = []
+    for chunk in llm_therapeutic_reply_stream(40, "3–5", "1–3", "Έχω άγχος", None, use_cache=False):
+        arrivals.append(time.perf_counter() - start)
+        chunks.append(chunk)
+
+    timing = stream_timings()[-1]
+    print("Απάντηση (blocking):", blocking)
+    print("Απάντηση (stream)  :", "".join(chunks))
+    print(f"Blocking συνολικά  : {t_blocking * 1000:.0f} ms")
+    print(f"Stream TTFT        : {timing['ttft_ms']:.0f} ms, συνολικά {timing['total_ms']:.0f} ms, "
+          f"{timing['chunks']} κομμάτια")
+
+    assert blocking == REPLY
+    assert "".join(chunks) == REPLY
+    assert len(chunks) > 1
+    assert timing["error"] is None
+    assert timing["ttft_ms"] < timing["total_ms"]
+    # Το πρώτο κομμάτι φτάνει πολύ πριν ολοκληρωθεί η απάντηση
+    assert arrivals[0] < arrivals[-1] - 0.1
+    # Το αίτημα ζήτησε πράγματι streaming
+    assert server.requests[-1]["stream"] is True
+
+# Αν ο server δεν απαντά, το stream δεν δίνει τίποτα και καταγράφεται σφάλμα
+resources.replace("openai_client", ManagedLLMClient(create_openai_client("test", base_url=server.base_url)))
+assert list(llm_therapeutic_reply_stream(40, "3–5", "1–3", "Έχω άγχος", None, use_cache=False)) == []
+assert stream_timings()[-1]["error"] is not None
+print("Σφάλμα σύνδεσης → κενό stream (fallback)")
@@ -0,0 +1,155 @@
+import os
+import stat
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "app"))
+
+# Ιδιωτικός φάκελος και authkey σε προσωρινό XDG_RUNTIME_DIR
+os.environ["XDG_RUNTIME_DIR"] = tempfile.mkdtemp()
+os.environ.pop("MODEL_WORKER_AUTHKEY", None)
+
+from model_worker import (  # noqa: E402
+    ModelWorker,
+    ModelWorkerClient,
+    ModelWorkerError,
+    default_address,
+    load_authkey,
+    runtime_dir,
+)
+
+
+class FakePipeline:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts, batch_size=None, truncation=False):
+        self.calls.append(len(texts))
+        time.sleep(0.01)
+        return [{"label": "NEGATIVE" if "sad" in t else "POSITIVE", "score": 0.987} for t in texts]
+
+
+def slow_load():
+    time.sleep(0.2)   # σαν το φόρτωμα του μοντέλου
+    return pipe
+
+
+pipe = FakePipeline()
+address = os.path.join(tempfile.mkdtemp(), "worker.sock")
+worker = ModelWorker(slow_load, address=address, authkey=b"test", threads=2)
+worker.start()
+client = ModelWorkerClient(address=address, authkey=b"test", autostart=False)
+
+# Health απαντά αμέσως, πριν φορτωθεί το μοντέλο
+health = client.health()
+assert health["status"] == "idle" and health["threads"] == 2
+print("Πριν το warm-up:", health)
+
+health = client.warm_up()
+assert health["status"] == "ready" and health["load_ms"] >= 200
+print("Μετά το warm-up:", health)
+
+# Πολλοί ταυτόχρονοι clients (σαν διαφορετικά sessions) → batches στον worker
+results = [None] * 24
+barrier = threading.Barrier(24)
+
+
+def call(i):
+    barrier.wait()
+    results[i] = client.analyze(["sad day" if i % 2 else "nice day"])[0]
+
+
+threads = [threading.Thread(target=call, args=(i,)) for i in range(24)]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+assert [r["label"] for r in results] == ["NEGATIVE" if i % 2 else "POSITIVE" for i in range(24)]
+assert len(pipe.calls) < 24
+print(f"24 αιτήματα → {len(pipe.calls) - 1} forward passes: {pipe.calls[1:]}")
+
+assert client.analyze(["a", "sad b", "c"]) == [
+    {"label": "POSITIVE", "score": 0.987},
+    {"label": "NEGATIVE", "score": 0.987},
+    {"label": "POSITIVE", "score": 0.987},
+]
+
+# Άγνωστη εντολή → σφάλμα στον client
+try:
+    client._call({"op": "reboot"})
+    raise AssertionError("expected ModelWorkerError")
+except ModelWorkerError:
+    pass
+
+# Δεύτερος worker στην ίδια διεύθυνση δεν ξεκινά
+try:
+    ModelWorker(slow_load, address=address, authkey=b"test")._bind()
+    raise AssertionError("expected ModelWorkerError")
+except ModelWorkerError:
+    pass
+
+# Χωρίς worker και χωρίς autostart → σφάλμα σύνδεσης
+missing = ModelWorkerClient(address=address + ".missing", authkey=b"test", autostart=False)
+try:
+    missing.health()
+    raise AssertionError("expected OSError")
+except OSError:
+    pass
+print("Stats:", client.health())
+
+# Προεπιλογές: socket και τυχαίο authkey (0600) σε ιδιωτικό φάκελο (0700)
+private = runtime_dir()
+assert stat.S_IMODE(os.stat(private).st_mode) == 0o700
+assert os.path.dirname(default_address()) == private
+key = load_authkey()
+assert len(key) == 64 and load_authkey() == key
+assert stat.S_IMODE(os.stat(os.path.join(private, "authkey")).st_mode) == 0o600
+
+# Φάκελος ανοιχτός σε άλλους χρήστες → άρνηση
+os.chmod(private, 0o777)
+try:
+    runtime_dir()
+    raise AssertionError("expected ModelWorkerError")
+except ModelWorkerError:
+    pass
+os.chmod(private, 0o700)
+
+# Λάθος authkey: ο client αρνείται (δεν ξεκινά δεύτερο worker, δεν κάνει unpickle)
+intruder = ModelWorkerClient(address=address, authkey=b"wrong", autostart=True)
+try:
+    intruder.health()
+    raise AssertionError("expected ModelWorkerError")
+except ModelWorkerError:
+    pass
+
+# Το _bind σβήνει μόνο sockets, ποτέ άλλα αρχεία
+victim = os.path.join(private, "not-a-socket")
+open(victim, "w").close()
+try:
+    ModelWorker(slow_load, address=victim, authkey=b"test")._bind()
+    raise AssertionError("expected ModelWorkerError")
+except ModelWorkerError:
+    pass
+assert os.path.exists(victim)
+
+# Shutdown από τον client
+assert client.shutdown()
+time.sleep(0.2)
+assert not client.shutdown()
+try:
+    client.health()
+    raise AssertionError("expected OSError")
+except OSError:
+    pass
+
+# Τερματισμός μετά από αδράνεια· το health δεν μετρά ως δραστηριότητα
+idle_address = os.path.join(private, "idle.sock")
+idle = ModelWorker(slow_load, address=idle_address, idle_seconds=0.3)
+thread = idle.start()
+idle_client = ModelWorkerClient(address=idle_address, autostart=False)
+idle_client.health()
+thread.join(timeout=5)
+assert not thread.is_alive() and not os.path.exists(idle_address)
+print("Idle worker τερμάτισε μετά από", round(time.monotonic() - idle.last_active, 2), "s")
@@ -0,0 +1,45 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "app"))
+
+import pandas as pd  # noqa: E402
+
+import crisis_detector  # noqa: E402
+from emotional_map import extract_emotional_tags  # noqa: E402
+from rule_replay import DERIVED_COLUMNS, replay_rules  # noqa: E402
+from rules import exercise_suggestion, is_emergency  # noqa: E402
+
+# Το τεστ δεν γράφει στο audit log του crisis detector
+crisis_detector.DETECTOR.audit_path = None
+
+df = pd.read_csv(os.path.join(os.path.dirname(__file__), "user_data.csv"))
+# Μία γραμμή κρίσης (το user_data.csv δεν έχει) και ένα επαναλαμβανόμενο μήνυμα
+df = pd.concat(
+    [
+        df,
+        pd.DataFrame(
+            {
+                "timestamp": ["2025-11-24 12:00:00", "2025-11-24 12:05:00"],
+                "mood": [10, 40],
+                "sleep": ["0–2", "3–5"],
+                "water": ["0", "1–3"],
+                "message": ["Δεν αντέχω άλλο, θέλω να πεθάνω", df["message"].iloc[2]],
+            }
+        ),
+    ],
+    ignore_index=True,
+)
+
+result = replay_rules(df)
+assert list(result.columns) == DERIVED_COLUMNS and result.index.equals(df.index)
+
+for row, derived in zip(df.itertuples(), result.itertuples()):
+    tags = ", ".join(label for _, label in extract_emotional_tags(row.mood, row.sleep, row.water, row.message))
+    exercise = exercise_suggestion(row.mood, row.sleep, row.water, row.message).split("\n", 1)[0].rstrip(":")
+    print(f"{row.mood:>3} {row.message[:40]!r:44} → {derived.tags} | {derived.exercise} | {derived.emergency}")
+    assert derived.tags == tags, (row.message, derived.tags, tags)
+    assert derived.exercise == exercise, (row.message, derived.exercise, exercise)
+    assert bool(derived.emergency) == is_emergency(row.message), row.message
+
+assert result["emergency"].tolist() == [False] * (len(df) - 2) + [True, False]
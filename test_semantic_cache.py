@@ -0,0 +1,52 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "app"))
+
+from semantic_cache import SemanticCache, text_vector
+
+REPLY = "Το άγχος πριν τις εξετάσεις είναι πολύ συνηθισμένο."
+
+cache = SemanticCache()
+cache.put("έχω άγχος για τις εξετάσεις", 35, "3–5", "1–3", None, REPLY)
+
+cases = [
+    # (κείμενο, διάθεση, ύπνος, νερό, αναμενόμενο hit)
+    ("έχω πολύ άγχος με τις εξετάσεις", 40, "3–5", "1–3", True),
+    ("exw agxos gia tis eksetaseis", 50, "3–5", "1–3", True),
+    ("Έχω άγχος για τις εξετάσεις!!", 35, "3–5", "1–3", True),
+    # άλλη ζώνη διάθεσης / ύπνος / νερό
+    ("έχω πολύ άγχος με τις εξετάσεις", 80, "3–5", "1–3", False),
+    ("έχω πολύ άγχος με τις εξετάσεις", 40, "6–8", "1–3", False),
+    ("έχω πολύ άγχος με τις εξετάσεις", 40, "3–5", "4–6", False),
+    # άρνηση / άλλο θέμα
+    ("δεν έχω άγχος για τις εξετάσεις", 40, "3–5", "1–3", False),
+    ("έχω άγχος για τη δουλειά", 40, "3–5", "1–3", False),
+    ("νιώθω μοναξιά τα βράδια", 40, "3–5", "1–3", False),
+]
+for text, mood, sleep, water, expected in cases:
+    reply, sim = cache.lookup(text, mood, sleep, water)
+    print(f"{sim:.3f} {'HIT ' if reply else 'miss'} {text} ({mood}, {sleep}, {water})")
+    assert (reply == REPLY) is expected, text
+
+# Διαφορετικό προφίλ → άλλη απάντηση
+assert cache.get("έχω πολύ άγχος με τις εξετάσεις", 40, "3–5", "1–3",
+                 {"role": "Εργαζόμενος/η", "main_issue": "Άγχος", "focus": ""}) is None
+
+# Φραγμένη μνήμη: πάνω από max_entries σβήνεται η λιγότερο πρόσφατα χρησιμοποιημένη
+small = SemanticCache(max_entries=3)
+for i, text in enumerate(["άγχος εξετάσεις", "μοναξιά βράδια", "κούραση δουλειά"]):
+    small.put(text, 50, "6–8", "4–6", None, f"r{i}")
+assert small.get("άγχος εξετάσεις", 50, "6–8", "4–6") == "r0"   # γίνεται πιο πρόσφατη
+small.put("θυμός οικογένεια", 50, "6–8", "4–6", None, "r3")
+assert len(small) == 3 and small.evictions == 1
+assert small.get("μοναξιά βράδια", 50, "6–8", "4–6") is None
+assert small.get("άγχος εξετάσεις", 50, "6–8", "4–6") == "r0"
+assert small.get("θυμός οικογένεια", 50, "6–8", "4–6") == "r3"
+
+# Ίδιο μήνυμα δεύτερη φορά → ανανέωση, όχι νέα εγγραφή
+small.put("θυμός οικογένεια", 50, "6–8", "4–6", None, "r4")
+assert len(small) == 3 and small.get("θυμός οικογένεια", 50, "6–8", "4–6") == "r4"
+
+assert not text_vector("!!! 123").any()
+print("Stats:", cache.stats())
@@ -0,0 +1,64 @@
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "app"))
+
+from sentiment_batcher import SentimentBatcher
+
+
+class FakePipeline:
+    """Σταθερό κόστος ανά forward pass + μικρό κόστος ανά κείμενο, όπως στην CPU."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts, batch_size=None, truncation=False):
+        self.calls.append(len(texts))
+        time.sleep(0.02 + 0.001 * len(texts))
+        if any("boom" in t for t in texts):
+            raise RuntimeError("forward pass failed")
+        return [{"label": "NEGATIVE" if "sad" in t else "POSITIVE", "score": 0.9} for t in texts]
+
+
+pipe = FakePipeline()
+batcher = SentimentBatcher(lambda: pipe, max_batch_size=8, max_wait_ms=10)
+
+# Ένας caller: ένα batch μεγέθους 1, μετά από ~max_wait
+assert batcher.submit("happy").result()["label"] == "POSITIVE"
+assert pipe.calls == [1]
+
+# 32 ταυτόχρονοι callers → batches έως 8, σωστό αποτέλεσμα στον καθένα
+results = [None] * 32
+barrier = threading.Barrier(32)
+
+
+def worker(i):
+    barrier.wait()
+    results[i] = batcher.submit("sad" if i % 2 else "happy").result()
+
+
+start = time.perf_counter()
+threads = [threading.Thread(target=worker, args=(i,)) for i in range(32)]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+elapsed = time.perf_counter() - start
+
+assert [r["label"] for r in results] == ["NEGATIVE" if i % 2 else "POSITIVE" for i in range(32)]
+assert max(pipe.calls[1:]) <= 8 and len(pipe.calls) - 1 <= 8
+print(f"32 κείμενα σε {len(pipe.calls) - 1} forward passes ({pipe.calls[1:]}), {elapsed * 1000:.0f} ms "
+      f"(ένα-ένα: ~{32 * 21} ms)")
+
+# Σφάλμα του pipeline φτάνει σε όλους τους callers του batch
+futures = [batcher.submit(t) for t in ["boom", "happy"]]
+for f in futures:
+    try:
+        f.result()
+        raise AssertionError("expected error")
+    except RuntimeError:
+        pass
+assert batcher.submit("happy").result()["label"] == "POSITIVE"
+print("Stats:", batcher.stats())
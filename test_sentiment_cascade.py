@@ -0,0 +1,46 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "app"))
+
+from sentiment_cascade import SentimentCascade
+
+transformer_calls = []
+
+
+def fake_transformer(text):
+    transformer_calls.append(text)
+    return {"label": "NEGATIVE", "score": 0.97}
+
+
+cascade = SentimentCascade(transformer=fake_transformer)
+
+cases = {
+    "Νιώθω φόβο και θλίψη": ("lexicon", "confident", "NEGATIVE"),
+    "αγάπη": ("lexicon", "confident", "POSITIVE"),
+    "Πήγα στη δουλειά": ("transformer", "neutral", "NEGATIVE"),
+    "Έχω άγχος αλλά και χαρά και αγάπη": ("transformer", "ambiguous", "NEGATIVE"),
+    "Δεν νιώθω χαρά": ("transformer", "negation", "NEGATIVE"),
+    "Σήμερα πήγα στη δουλειά μετά στο σούπερ μάρκετ μετά μαγείρεψα και είδα λίγη τηλεόραση πριν κοιμηθώ χαρά":
+        ("transformer", "low_coverage", "NEGATIVE"),
+}
+for text, (tier, reason, label) in cases.items():
+    result = cascade.classify(text)
+    print(f"{text[:40]!r:45} → {result}")
+    assert (result["tier"], result["reason"], result["label"]) == (tier, reason, label), result
+
+assert transformer_calls == [t for t, (tier, _, _) in cases.items() if tier == "transformer"]
+assert cascade.classify("αγάπη")["score"] == 1.0
+
+stats = cascade.stats()
+print("Stats:", stats)
+assert stats["messages"] == 7
+assert stats["tiers"] == {"lexicon": 3, "transformer": 4}
+assert stats["reasons"]["confident"] == 3 and stats["reasons"]["negation"] == 1
+
+# Ρυθμιζόμενα όρια: χωρίς κλιμάκωση σε άρνηση/ασάφεια απαντά το λεξικό
+loose = SentimentCascade(transformer=fake_transformer, min_margin=0.0, escalate_negation=False)
+assert loose.classify("Δεν νιώθω χαρά")["tier"] == "lexicon"
+assert loose.classify("Έχω άγχος αλλά και χαρά και αγάπη") == {
+    "label": "POSITIVE", "score": 0.67, "tier": "lexicon", "reason": "confident",
+}
@@ -0,0 +1,94 @@
+import os
+import sys
+
+os.environ["SENTIMENT_MODE"] = "local"
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "app"))
+
+import resources
+import sentiment
+from sentiment import analyze_sentiment_long, estimate_tokens, sentence_windows, split_sentences
+
+calls = []
+
+
+def fake_pipeline(texts, batch_size=None, truncation=False):
+    calls.append(list(texts))
+    return [{"label": "NEGATIVE" if "sad" in t else "POSITIVE", "score": 0.9} for t in texts]
+
+
+resources.replace("sentiment_pipeline", fake_pipeline)
+
+text = "I woke up early. The sun was out!\nThen I felt sad; really sad… Evening was fine?"
+sentences = split_sentences(text)
+print(sentences)
+assert [s for _, s in sentences] == [
+    "I woke up early.", "The sun was out!", "Then I felt sad;", "really sad…", "Evening was fine?",
+]
+assert all(text[start:start + len(s)] == s for start, s in sentences)
+
+# Μία πρόταση πάνω από το όριο σπάει σε όρια λέξεων
+long_sentence = " ".join(["word"] * 400)
+pieces = split_sentences(long_sentence)
+assert len(pieces) > 1 and all(estimate_tokens(s) <= sentiment.SENTIMENT_WINDOW_TOKENS for _, s in pieces)
+assert estimate_tokens(pieces[0][1]) == sentiment.SENTIMENT_WINDOW_TOKENS   # γεμάτο παράθυρο
+
+# Εκτίμηση ανά σύστημα γραφής: λατινικές λέξεις ~3 γράμματα ανά token,
+# ελληνικά γράμματα και στίξη ένα token το καθένα
+assert estimate_tokens("Everyone keeps asking for more.") == 3 + 2 + 2 + 1 + 2 + 1
+assert estimate_tokens("Νιώθω μόνη.") == 5 + 4 + 1
+
+# Με φορτωμένο pipeline που έχει tokenizer μετράει ο tokenizer
+class TokenizedPipeline:
+    class tokenizer:
+        tokenize = staticmethod(str.split)
+
+    def __call__(self, texts, batch_size=None, truncation=False):
+        return fake_pipeline(texts, batch_size, truncation)
+
+
+resources.replace("sentiment_pipeline", TokenizedPipeline())
+assert estimate_tokens("Everyone keeps asking for more.") == 5
+resources.replace("sentiment_pipeline", fake_pipeline)
+
+# Τα παράθυρα καλύπτουν όλες τις προτάσεις, με μία κοινή ανάμεσα σε γειτονικά
+sentiment.SENTIMENT_WINDOW_TOKENS = 15
+windows = sentence_windows([s for _, s in sentences])
+print("Παράθυρα:", [list(w) for w in windows])
+assert windows[0][0] == 0 and windows[-1][-1] == len(sentences) - 1
+assert all(a[-1] == b[0] for a, b in zip(windows, windows[1:]))
+
+result = analyze_sentiment_long(text)
+print("Αποτέλεσμα:", {k: v for k, v in result.items() if k != "timeline"})
+for item in result["timeline"]:
+    print("   ", item)
+assert len(calls) == 1 and len(calls[0]) == result["windows"]   # ένα batch για όλα τα παράθυρα
+assert result["timeline"][0]["label"] == "POSITIVE"
+assert result["timeline"][3]["label"] == "NEGATIVE"
+assert -1 <= result["polarity"] <= 1 and not result["truncated"]
+assert result["label"] in ("POSITIVE", "NEGATIVE") and 0.5 <= result["score"] <= 1
+
+# Μισό θετικό, μισό αρνητικό → NEUTRAL, όχι «POSITIVE 0.0»
+sentiment.SENTIMENT_WINDOW_TOKENS = 7
+mixed = analyze_sentiment_long("A good day ok. A sad day, ok.")
+print("Μικτό:", {k: v for k, v in mixed.items() if k != "timeline"})
+assert mixed["label"] == "NEUTRAL" and mixed["score"] == 0.5 and mixed["polarity"] == 0
+
+# Πυκνό ελληνικό κείμενο: κάθε παράθυρο χωρά στα 512 tokens ακόμα και
+# με ένα token ανά γράμμα
+sentiment.SENTIMENT_WINDOW_TOKENS = 510
+calls.clear()
+greek = "Σήμερα ένιωσα απαίσια, εξαντλημένη και απογοητευμένη από όλους. " * 60
+analyze_sentiment_long(greek)
+assert all(len("".join(w.split())) + 2 <= 512 for w in calls[0])
+print(f"Ελληνικό κείμενο {len(greek)} χαρακτήρων → {len(calls[0])} παράθυρα ≤ 512 tokens")
+
+# Σκληρό όριο εισόδου: το κόστος δεν μεγαλώνει πέρα από SENTIMENT_MAX_INPUT_CHARS
+sentiment.SENTIMENT_MAX_INPUT_CHARS = 5_000
+huge = "Today was a good day. " * 10_000
+result = analyze_sentiment_long(huge)
+assert result["truncated"] and result["windows"] <= 5_000 // 400
+assert result["timeline"][-1]["start"] < 5_000
+print(f"Κείμενο {len(huge)} χαρακτήρων → {result['windows']} παράθυρα, truncated")
+
+empty = analyze_sentiment_long("   ")
+assert empty["windows"] == 0 and empty["label"] == "NEUTRAL" and empty["score"] == 0.5
@@ -0,0 +1,130 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "app"))
+
+from storage import DOC_PROFILE, DOC_WELLNESS_HISTORY, Storage, migrate_legacy_files
+
+tmp = tempfile.mkdtemp()
+storage = Storage(os.path.join(tmp, "wellness.sqlite3"))
+assert storage._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+# Check-ins: χρονολογική σειρά, limit = τα πιο πρόσφατα, φίλτρο χρήστη/διαστήματος
+for day in range(1, 8):
+    storage.add_checkin(10 * day, "6–8", "4–6", f"μέρα {day}", timestamp=f"2025-11-0{day} 10:00:00")
+storage.add_checkin("EMERGENCY", "-", "-", "βοήθεια", timestamp="2025-11-08 09:00:00")
+storage.add_checkin(50, "3–5", "1–3", "άλλος χρήστης", user_id="other")
+
+df = storage.checkins()
+print(df)
+assert list(df.columns) == ["timestamp", "mood", "sleep", "water", "message"]
+assert len(df) == 8 and df["message"].iloc[0] == "μέρα 1"
+assert df["mood"].iloc[0] == 10 and df["mood"].iloc[-1] == "EMERGENCY"
+assert storage.checkins(limit=2)["message"].tolist() == ["μέρα 7", "βοήθεια"]
+week = storage.checkins(since="2025-11-03", until="2025-11-05")
+assert week["message"].tolist() == ["μέρα 3", "μέρα 4"]
+assert storage.checkins(user_id="other")["message"].tolist() == ["άλλος χρήστης"]
+assert storage.count("checkins") == 9 and storage.count("checkins", "other") == 1
+
+# Το query χρησιμοποιεί το ευρετήριο (user_id, timestamp)
+plan = storage._conn.execute(
+    "EXPLAIN QUERY PLAN SELECT * FROM checkins WHERE user_id = ? AND timestamp >= ? "
+    "ORDER BY timestamp DESC LIMIT 5", ("local", "2025"),
+).fetchall()
+assert "checkins_user_ts" in str(plan), plan
+
+# Φράσεις / ασκήσεις
+storage.add_support_phrase("Είσαι αρκετός.", source="plan")
+assert storage.support_phrases()[["source", "text"]].values.tolist() == [["plan", "Είσαι αρκετός."]]
+for ex in ["breathing", "breathing", "water"]:
+    storage.add_exercise(ex, ex.title())
+assert storage.exercise_counts() == {"Breathing": 2, "Water": 1}
+assert storage.exercises(limit=1)["exercise_id"].tolist() == ["water"]
+
+# Έγγραφα
+assert storage.get_document(DOC_PROFILE) is None
+storage.put_document(DOC_PROFILE, {"name": "Άννα"})
+storage.put_document(DOC_PROFILE, {"name": "Άννα", "context": "φοιτήτρια"})
+assert storage.get_document(DOC_PROFILE) == {"name": "Άννα", "context": "φοιτήτρια"}
+
+# Ταυτόχρονες εγγραφές από threads και από δεύτερη σύνδεση (άλλη «διεργασία»)
+other = Storage(storage.path)
+
+
+def writer(db, n):
+    for i in range(n):
+        db.add_support_phrase(f"φράση {i}")
+
+
+threads = [threading.Thread(target=writer, args=(db, 200)) for db in (storage, other, storage, other)]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+assert storage.count("support_phrases") == 801
+
+# Migration από τα παλιά αρχεία: μία φορά, τα αρχεία μένουν
+legacy = tempfile.mkdtemp()
+shutil.copy(os.path.join(os.path.dirname(__file__), "user_data.csv"), legacy)
+with open(os.path.join(legacy, "support_phrases.csv"), "w", encoding="utf-8") as f:
+    f.write("timestamp,source,text\n2025-11-24T10:00:00,bot,\"Μία φράση, με κόμμα\"\n")
+with open(os.path.join(legacy, "exercises_log.csv"), "w", encoding="utf-8") as f:
+    f.write("timestamp,exercise_id,label\n2025-11-24T11:00:00,thought_dump,Αποφόρτιση\n")
+with open(os.path.join(legacy, "user_profile.json"), "w", encoding="utf-8") as f:
+    json.dump({"name": "Νίκος"}, f, ensure_ascii=False)
+with open(os.path.join(legacy, "user_history.json"), "w", encoding="utf-8") as f:
+    f.write("{ χαλασμένο json")
+
+fresh = Storage(os.path.join(legacy, "wellness.sqlite3"))
+migrated = migrate_legacy_files(fresh, root=legacy)
+print("Migration:", migrated)
+with open(os.path.join(legacy, "user_data.csv"), encoding="utf-8") as f:
+    legacy_rows = sum(1 for _ in f) - 1
+assert migrated == {"checkins": legacy_rows, "support_phrases": 1, "exercises": 1, "profile": 1}
+assert fresh.checkins()["timestamp"].iloc[0] == "2025-11-24 10:48:27"
+assert fresh.checkins()["mood"].iloc[0] == 90
+assert fresh.support_phrases()["text"].tolist() == ["Μία φράση, με κόμμα"]
+assert fresh.get_document(DOC_PROFILE) == {"name": "Νίκος"}
+assert fresh.get_document(DOC_WELLNESS_HISTORY) is None
+assert migrate_legacy_files(fresh, root=legacy) == {}
+assert fresh.count("checkins") == legacy_rows
+assert os.path.isfile(os.path.join(legacy, "user_data.csv"))
+
+# Ταυτόχρονη migration από πολλές «διεργασίες» (ξεχωριστές συνδέσεις): μία φορά
+racing_path = os.path.join(tempfile.mkdtemp(), "wellness.sqlite3")
+Storage(racing_path).close()
+racers = [Storage(racing_path) for _ in range(4)]
+barrier = threading.Barrier(len(racers))
+results = [None] * len(racers)
+
+
+def migrate(i):
+    barrier.wait()
+    results[i] = migrate_legacy_files(racers[i], root=legacy)
+
+
+threads = [threading.Thread(target=migrate, args=(i,)) for i in range(len(racers))]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+assert sum(bool(r) for r in results) == 1, results
+assert racers[0].count("checkins") == legacy_rows
+
+# Σφάλμα στη μέση: τίποτα δεν μένει μισό, η επόμενη φορά τα μεταφέρει όλα
+broken = Storage(os.path.join(tempfile.mkdtemp(), "wellness.sqlite3"))
+put_document = broken.put_document
+broken.put_document = lambda *args, **kwargs: 1 / 0
+try:
+    migrate_legacy_files(broken, root=legacy)
+    raise AssertionError("expected ZeroDivisionError")
+except ZeroDivisionError:
+    pass
+assert broken.count("checkins") == 0 and broken.get_meta("migrated_legacy_files") is None
+broken.put_document = put_document
+assert migrate_legacy_files(broken, root=legacy)["checkins"] == legacy_rows
+assert broken.count("checkins") == legacy_rows
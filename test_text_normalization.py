@@ -0,0 +1,57 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "app"))
+
+from text_normalization import (  # noqa: E402
+    NEGATION_WORDS,
+    NEGATIONS,
+    fold,
+    normalize_phrase,
+    normalize_text,
+    normalize_token,
+    stem,
+    tokenize,
+    transliterate_greeklish,
+)
+
+# Πεζά, χωρίς τόνους/διαλυτικά, τελικό ς → σ
+assert fold("Άγχος") == fold("ΑΓΧΟΣ") == fold("αγχος") == "αγχοσ"
+assert fold("πρωτεΐνη") == "πρωτεινη"
+assert normalize_token("Χαρούμενος") == "χαρουμενοσ"
+
+# Greeklish: τα δίψηφα πριν τα μονά γράμματα, και μικτά tokens
+assert transliterate_greeklish("thlipsi") == "θλιψι"
+assert transliterate_greeklish("psyxi") == "ψυχι"
+assert transliterate_greeklish("ksypnisa") == "ξυπνισα"
+assert transliterate_greeklish("kh") == transliterate_greeklish("ch") == "χ"
+assert transliterate_greeklish("agχos") == "αγχοσ"
+assert normalize_token("Agxos") == normalize_token("άγχος")
+print("Greeklish:", [normalize_token(t) for t in ("agxos", "thlipsi", "ksypnisa")])
+
+# Stemming: οι κλίσεις της ίδιας λέξης ενώνονται, διαφορετικές λέξεις όχι
+assert stem("αγχοσ") == stem("αγχουσ") == "αγχ"
+assert len({stem(normalize_token(w)) for w in ("κουρασμένος", "κουρασμένη", "κουρασμένοι")}) == 1
+assert stem(normalize_token("χαρά")) != stem(normalize_token("χαρτί"))
+# Το stem κρατά τουλάχιστον MIN_STEM_LENGTH γράμματα
+assert stem("ναι") == "ναι" and stem("ησα") == "ησα"
+# Γνωστή σύγκρουση: χωρίς τόνους «μόνη» και «μονή» γίνονται ίδια λέξη
+assert stem(normalize_token("μόνη")) == stem(normalize_token("μονή")) == stem(normalize_token("μόνος"))
+print("Stems:", {w: stem(normalize_token(w)) for w in ("άγχους", "κουρασμένοι", "χαρά", "χαρτί")})
+
+# Tokenizer: μόνο λέξεις, χωρίς στίξη και αριθμούς
+assert tokenize("Σήμερα. 3 φορές, αύριο-μεθαύριο!") == ["Σήμερα", "φορές", "αύριο", "μεθαύριο"]
+
+# Μήνυμα και φράσεις με την ίδια κανονική μορφή
+result = normalize_text("Δεν  κοιμήθηκα, καθόλου!!! 3 ώρες...")
+assert result.tokens == ("δεν", "κοιμηθηκα", "καθολου", "ωρεσ")
+assert result.text == "δεν κοιμηθηκα καθολου ωρεσ"
+assert normalize_text("Δεν  κοιμήθηκα, καθόλου!!! 3 ώρες...") is result   # cache
+assert normalize_phrase("Νιώθω ΆΓΧΟΣ") == normalize_phrase("niwthw agxos") == "νιωθω αγχοσ"
+assert normalize_phrase("άγχος") in normalize_text("Έχω πολύ άγχος σήμερα").text
+print("Κανονικοποίηση:", result)
+
+# Λέξεις άρνησης: μία λίστα για cache, cascade και distillation
+assert NEGATIONS == {normalize_phrase(w) for w in NEGATION_WORDS}
+assert {"δεν", "ουτε", "καθολου"} <= NEGATIONS
+assert NEGATIONS.intersection(normalize_text("Δεν νιώθω ΚΑΘΌΛΟΥ καλά").tokens) == {"δεν", "καθολου"}
@@ -0,0 +1,53 @@
+import os
+import sys
+import tempfile
+import time
+
+os.environ["SENTIMENT_MODE"] = "local"
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "app"))
+
+import numpy as np
+
+import resources
+from distill_sentiment import synthetic_corpus, teacher_targets
+from sentiment import analyze_sentiment, analyze_sentiment_batch
+from tiny_sentiment import TINY_DIM, feature_ids, load_model, train
+
+# Teacher: μόνο το λεξικό (χωρίς transformer)
+texts, targets = teacher_targets(synthetic_corpus(4_000, seed=1), lexicon_only=True)
+model = train(texts, targets, epochs=4)
+
+held_texts, held_targets = teacher_targets(synthetic_corpus(500, seed=99), lexicon_only=True)
+agreement = np.mean((model.predict_proba(held_texts) >= 0.5) == (held_targets >= 0.5))
+print(f"Συμφωνία με το λεξικό σε νέα μηνύματα: {agreement:.1%}")
+assert agreement > 0.9
+
+# Τα Greeklish μοιράζονται τα χαρακτηριστικά των ελληνικών
+assert np.array_equal(feature_ids("Νιώθω θλίψη"), feature_ids("niwthw thlipsh"))
+assert feature_ids("").size == 0 and feature_ids("χαρά").max() < TINY_DIM
+
+# Αποθήκευση / φόρτωση: float16 βάρη, ίδιες προβλέψεις
+path = model.save(os.path.join(tempfile.mkdtemp(), "tiny.npz"))
+loaded = load_model(path)
+print(f"Μέγεθος αρχείου: {os.path.getsize(path) / 1024:.0f} KB")
+assert np.allclose(loaded.predict_proba(held_texts[:50]), model.predict_proba(held_texts[:50]), atol=1e-2)
+
+# Ίδια μορφή με το HF pipeline → δουλεύει πίσω από το analyze_sentiment
+resources.replace("sentiment_pipeline", loaded)
+assert analyze_sentiment("Νιώθω φόβο και θλίψη")["label"] == "NEGATIVE"
+assert analyze_sentiment("αγάπη και χαρά")["label"] == "POSITIVE"
+assert [r["label"] for r in analyze_sentiment_batch(["θλίψη", "χαρά"])] == ["NEGATIVE", "POSITIVE"]
+assert loaded("χαρά") == loaded(["χαρά"])
+
+start = time.perf_counter()
+for text in held_texts[:200]:
+    loaded(text)
+per_message_us = (time.perf_counter() - start) / 200 * 1e6
+print(f"Ανά μήνυμα: {per_message_us:.0f} µs")
+assert per_message_us < 1000
+
+try:
+    load_model(os.path.join(tempfile.mkdtemp(), "missing.npz"))
+    raise AssertionError("expected FileNotFoundError")
+except FileNotFoundError:
+    pass